@@ -6,5 +6,14 @@ best practices including structured logging, Prometheus metrics, and
 proper health check endpoints for Kubernetes deployment.
 """
 
+import os
+import sys
+
 __version__ = "1.0.0"
-__author__ = "SRE Course"
\ No newline at end of file
+__author__ = "SRE Course"
+
+# Shared modules (sre_common) live in exercises/shared
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SHARED = os.path.join(os.path.dirname(_APP_DIR), 'shared')
+if os.path.isdir(_SHARED) and _SHARED not in sys.path:
+    sys.path.append(_SHARED)
@@ -19,6 +19,23 @@ class Config:
     # Logging configuration
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
     LOG_FORMAT = 'json' if FLASK_ENV == 'production' else 'console'
+
+    # JSON encoder for responses and structured logs: 'orjson' (falls back to
+    # the standard library when not installed) or 'stdlib'. orjson writes
+    # compact log lines (no space after ',' and ':'), and writes NaN and
+    # exponent-form floats differently from the stdlib
+    JSON_SERIALIZER = os.environ.get('JSON_SERIALIZER', 'orjson')
+    
+    # Readiness checks: run on a small thread pool, results cached for
+    # READINESS_CHECK_FRESHNESS seconds. The external API check is skipped
+    # when no URL is set and does not affect readiness unless marked critical.
+    READINESS_CHECK_FRESHNESS = float(os.environ.get('READINESS_CHECK_FRESHNESS', 10.0))
+    READINESS_CHECK_TIMEOUT = float(os.environ.get('READINESS_CHECK_TIMEOUT', 2.0))
+    READINESS_MAX_WORKERS = int(os.environ.get('READINESS_MAX_WORKERS', 4))
+    READINESS_EXTERNAL_API_URL = os.environ.get('READINESS_EXTERNAL_API_URL', '')
+    READINESS_EXTERNAL_API_CRITICAL = os.environ.get(
+        'READINESS_EXTERNAL_API_CRITICAL', 'false'
+    ).lower() == 'true'
     
     @classmethod
     def get_config_dict(cls) -> Dict[str, Any]:
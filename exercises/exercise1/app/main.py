@@ -4,6 +4,8 @@ import structlog
 from flask import Flask, jsonify, request
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
 from app.config import Config
+from sre_common.checks import CheckMonitor, check_url
+from sre_common.serialization import json_provider_class, structlog_serializer
 
 # Configure structured logging
 structlog.configure(
@@ -16,7 +18,8 @@ structlog.configure(
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
         structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer() if Config.LOG_FORMAT == 'json' 
+        structlog.processors.JSONRenderer(serializer=structlog_serializer(Config.JSON_SERIALIZER))
+        if Config.LOG_FORMAT == 'json' 
         else structlog.dev.ConsoleRenderer()
     ],
     context_class=dict,
@@ -30,6 +33,7 @@ logger = structlog.get_logger()
 # Initialize Flask application
 app = Flask(__name__)
 app.config.from_object(Config)
+app.json = json_provider_class(Config.JSON_SERIALIZER)(app)
 
 # Prometheus metrics for SRE monitoring
 REQUEST_COUNT = Counter(
@@ -61,6 +65,25 @@ APPLICATION_INFO = Gauge(
     ['app_name', 'version', 'environment']
 )
 
+READINESS_CHECK_DURATION = Histogram(
+    'readiness_check_duration_seconds',
+    'Readiness dependency check duration in seconds',
+    ['check'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+READINESS_CHECK_FAILURES = Counter(
+    'readiness_check_failures_total',
+    'Readiness dependency checks that failed or timed out',
+    ['check', 'reason']
+)
+
+READINESS_CHECK_UP = Gauge(
+    'readiness_check_up',
+    'Whether the last run of a readiness dependency check passed',
+    ['check']
+)
+
 # Set application info metric
 APPLICATION_INFO.labels(
     app_name=Config.APP_NAME,
@@ -178,6 +201,9 @@ def get_stores():
         processing_time=processing_time
     )
     
+    # Encoded on every request: a couple of static stores take microseconds
+    # next to the deliberate sleep above, so exercise 6's response cache
+    # (and the catalog versioning it needs) would gain nothing here
     return jsonify({
         "stores": stores,
         "total_stores": len(stores),
@@ -219,21 +245,45 @@ def health():
     logger.info("Health check performed", **health_status)
     return jsonify(health_status)
 
+def check_database():
+    """The store data is loaded and readable."""
+    if not stores:
+        raise RuntimeError("no stores loaded")
+    return 'ok'
+
+def check_external_api():
+    """Any answer below 500 from READINESS_EXTERNAL_API_URL counts as reachable."""
+    return check_url(Config.READINESS_EXTERNAL_API_URL, Config.READINESS_CHECK_TIMEOUT)
+
+# Dependency checks run on a thread pool; /ready only reads their cached results
+readiness_monitor = CheckMonitor(
+    freshness=Config.READINESS_CHECK_FRESHNESS,
+    max_workers=Config.READINESS_MAX_WORKERS,
+    duration=READINESS_CHECK_DURATION,
+    failures=READINESS_CHECK_FAILURES,
+    up=READINESS_CHECK_UP
+)
+readiness_monitor.register('database', check_database, timeout=Config.READINESS_CHECK_TIMEOUT)
+readiness_monitor.register(
+    'external_api', check_external_api, timeout=Config.READINESS_CHECK_TIMEOUT,
+    critical=Config.READINESS_EXTERNAL_API_CRITICAL
+)
+
 @app.route('/ready')
 def ready():
-    """Kubernetes readiness probe endpoint."""
+    """Kubernetes readiness probe endpoint.
     
-    # Simulate readiness checks (database connections, external services, etc.)
-    is_ready = random.random() > 0.05  # 95% ready rate
+    Answers from the cached dependency check results without waiting on
+    the checks; stale results are refreshed in the background.
+    """
+    snapshot = readiness_monitor.snapshot()
+    is_ready = snapshot['ready']
     
     readiness_status = {
         "status": "ready" if is_ready else "not ready",
         "timestamp": time.time(),
-        "checks": {
-            "database": "ok" if is_ready else "connecting",
-            "cache": "ok",
-            "external_api": "ok" if is_ready else "timeout"
-        }
+        "checks": snapshot['checks'],
+        "snapshot_age_seconds": snapshot['snapshot_age_seconds']
     }
     
     status_code = 200 if is_ready else 503
@@ -275,6 +325,9 @@ if __name__ == '__main__':
         port=Config.PORT
     )
     
+    # Run the checks now so /ready does not report them pending at first
+    readiness_monitor.refresh(force=True)
+
     # Run the Flask development server
     app.run(
         host=Config.HOST,
@@ -5,5 +5,15 @@ This package contains a Flask application designed for SRE training,
 including Prometheus metrics, health checks, and structured logging.
 """
 
+import os
+import sys
+
 __version__ = "1.0.0"
 __author__ = "SRE Academy"
+
+# Shared modules (sre_common) live in exercises/shared; container images
+# copy them next to this package instead
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SHARED = os.path.join(os.path.dirname(_APP_DIR), 'shared')
+if os.path.isdir(_SHARED) and _SHARED not in sys.path:
+    sys.path.append(_SHARED)
@@ -10,11 +10,49 @@ class Config:
     ENVIRONMENT = os.environ.get('ENVIRONMENT', 'production')
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
 
-    # Database configuration (for future exercises)
-    DATABASE_URL = os.environ.get('DATABASE_URL')
+    # Asynchronous logging: records are queued and written by a writer
+    # thread. LOG_QUEUE_POLICY decides what a full queue does: drop or block.
+    LOG_ASYNC = os.environ.get('LOG_ASYNC', 'false').lower() == 'true'
+    LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+    LOG_QUEUE_POLICY = os.environ.get('LOG_QUEUE_POLICY', 'drop')
+    LOG_BATCH_SIZE = int(os.environ.get('LOG_BATCH_SIZE', 256))
+
+    # Store repository: memory:// or sqlite:///<path>. /stores sleeps for a
+    # random 0.1-0.5 s unless SIMULATE_LATENCY is off, which it is by
+    # default when the data comes from a real database.
+    DATABASE_URL = os.environ.get('DATABASE_URL', 'memory://')
+    SIMULATE_LATENCY = os.environ.get(
+        'SIMULATE_LATENCY',
+        'true' if DATABASE_URL.startswith('memory') else 'false'
+    ).lower() == 'true'
 
     # Metrics configuration
     METRICS_PORT = int(os.environ.get('METRICS_PORT', 8080))
+    SYSTEM_METRICS_INTERVAL = float(
+        os.environ.get('SYSTEM_METRICS_INTERVAL', 5.0)
+    )
+
+    # Gunicorn settings (see app/gunicorn_config.py)
+    # WEB_CONCURRENCY=0 derives the worker count from the container CPU quota
+    WORKERS = int(os.environ.get('WEB_CONCURRENCY', 0))
+    THREADS = int(os.environ.get('GUNICORN_THREADS', 4))
+    KEEPALIVE = int(os.environ.get('GUNICORN_KEEPALIVE', 75))
+    MAX_REQUESTS = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+    MAX_REQUESTS_JITTER = int(
+        os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100)
+    )
+    PRELOAD_APP = os.environ.get(
+        'GUNICORN_PRELOAD_APP', 'true'
+    ).lower() == 'true'
+    WORKER_TIMEOUT = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+    GRACEFUL_TIMEOUT = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
 
     # Health check configuration
     HEALTH_CHECK_PATH = os.environ.get('HEALTH_CHECK_PATH', '/health')
+    HEALTH_CHECK_TIMEOUT = float(os.environ.get('HEALTH_CHECK_TIMEOUT', 2.0))
+    HEALTH_MEMORY_CHECK_INTERVAL = float(
+        os.environ.get('HEALTH_MEMORY_CHECK_INTERVAL', 5.0)
+    )
+    HEALTH_DISK_CHECK_INTERVAL = float(
+        os.environ.get('HEALTH_DISK_CHECK_INTERVAL', 30.0)
+    )
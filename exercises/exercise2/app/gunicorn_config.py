@@ -0,0 +1,66 @@
+"""
+Gunicorn configuration driven by app.config.Config.
+
+Usage:
+    gunicorn --config python:app.gunicorn_config app.main:app
+"""
+
+import math
+import os
+
+from app.config import Config
+
+
+def cpu_quota():
+    """Return the number of CPUs this container may use (cgroup v2/v1 quota)."""
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()
+        if quota != 'max':
+            return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+
+    try:
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us') as f:
+            quota = int(f.read())
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us') as f:
+            period = int(f.read())
+        if quota > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+
+    if hasattr(os, 'sched_getaffinity'):
+        return float(len(os.sched_getaffinity(0)))
+    return float(os.cpu_count() or 1)
+
+
+def default_workers():
+    """(2 x CPUs) + 1, sized by the container's CPU quota."""
+    return 2 * max(1, math.ceil(cpu_quota())) + 1
+
+
+bind = f"{Config.HOST}:{Config.PORT}"
+
+worker_class = 'gthread'
+workers = Config.WORKERS or default_workers()
+threads = Config.THREADS
+
+# Outlive the upstream proxy's idle timeout so it never reuses a closed socket
+keepalive = Config.KEEPALIVE
+
+# Recycle workers periodically; jitter avoids synchronized restarts
+max_requests = Config.MAX_REQUESTS
+max_requests_jitter = Config.MAX_REQUESTS_JITTER
+
+preload_app = Config.PRELOAD_APP
+timeout = Config.WORKER_TIMEOUT
+graceful_timeout = Config.GRACEFUL_TIMEOUT
+
+# Heartbeat files on tmpfs so a slow overlay filesystem can't trip the timeout
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+accesslog = None
+errorlog = '-'
+loglevel = Config.LOG_LEVEL.lower()
@@ -11,6 +11,10 @@ from prometheus_client import (
     CollectorRegistry, CONTENT_TYPE_LATEST
 )
 from .config import Config
+from .repository import create_repository
+from .system_metrics import CgroupThrottlingCollector, SystemMetricsSampler
+from sre_common.async_logging import AsyncLogHandler
+from sre_common.checks import DEGRADED, HEALTHY, UNHEALTHY, CheckMonitor
 
 # Configure structlog for compatibility
 structlog.configure()
@@ -20,9 +24,10 @@ app = Flask(__name__)
 app.config.from_object(Config)
 
 # Configure structured logging
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 logging.basicConfig(
     level=getattr(logging, app.config['LOG_LEVEL']),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    format=LOG_FORMAT
 )
 logger = logging.getLogger(__name__)
 
@@ -60,6 +65,57 @@ SYSTEM_MEMORY_USAGE = Gauge(
     registry=registry
 )
 
+PROCESS_CPU_USAGE = Gauge(
+    'process_cpu_usage_percent',
+    'CPU usage of this worker process in percent',
+    registry=registry
+)
+
+PROCESS_MEMORY_RSS = Gauge(
+    'process_memory_rss_bytes',
+    'Resident memory of this worker process in bytes',
+    registry=registry
+)
+
+PROCESS_THREADS = Gauge(
+    'process_threads_current',
+    'Number of threads in this worker process',
+    registry=registry
+)
+
+# app_ prefix keeps these apart from the kubelet/cAdvisor container_* series
+CGROUP_MEMORY_USAGE = Gauge(
+    'app_cgroup_memory_usage_bytes',
+    'Memory charged to the container cgroup in bytes',
+    registry=registry
+)
+
+CGROUP_MEMORY_LIMIT = Gauge(
+    'app_cgroup_memory_limit_bytes',
+    'Memory limit of the container cgroup in bytes',
+    registry=registry
+)
+
+# Cumulative throttling counters, read from the cgroup at scrape time
+registry.register(CgroupThrottlingCollector())
+
+HEALTH_CHECK_DURATION = Histogram(
+    'health_check_duration_seconds',
+    'Duration of background health checks in seconds',
+    ['check'],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0),
+    registry=registry
+)
+
+DB_QUERY_DURATION = Histogram(
+    'db_query_duration_seconds',
+    'Store repository query duration in seconds',
+    ['operation'],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+             0.05, 0.1, 0.25, 1.0),
+    registry=registry
+)
+
 APPLICATION_INFO = Gauge(
     'application_info',
     'Application information',
@@ -67,6 +123,30 @@ APPLICATION_INFO = Gauge(
     registry=registry
 )
 
+LOG_RECORDS_QUEUED = Counter(
+    'log_records_queued_total',
+    'Log records handed to the asynchronous log writer',
+    registry=registry
+)
+
+LOG_RECORDS_DROPPED = Counter(
+    'log_records_dropped_total',
+    'Log records discarded because the log queue was full',
+    registry=registry
+)
+
+if Config.LOG_ASYNC:
+    # Request threads only enqueue; a writer thread formats and writes in batches
+    log_handler = AsyncLogHandler(
+        max_queue=Config.LOG_QUEUE_SIZE,
+        policy=Config.LOG_QUEUE_POLICY,
+        batch_size=Config.LOG_BATCH_SIZE,
+        queued_counter=LOG_RECORDS_QUEUED,
+        dropped_counter=LOG_RECORDS_DROPPED
+    )
+    log_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    logging.getLogger().handlers = [log_handler]
+
 # Set application info metric
 APPLICATION_INFO.labels(
     version=app.config.get('VERSION', '1.0.0'),
@@ -74,8 +154,22 @@ APPLICATION_INFO.labels(
 ).set(1)
 
 
+class LazyJSON:
+    """Log argument that is only serialized when the record is formatted."""
+
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data
+
+    def __str__(self):
+        return json.dumps(self.data)
+
+
 def log_request_info():
     """Log structured request information."""
+    if not logger.isEnabledFor(logging.INFO):
+        return
     log_data = {
         'timestamp': datetime.utcnow().isoformat(),
         'method': request.method,
@@ -83,23 +177,29 @@ def log_request_info():
         'remote_addr': request.remote_addr,
         'user_agent': request.headers.get('User-Agent', 'Unknown')
     }
-    logger.info(f"Request: {json.dumps(log_data)}")
-
-
-def update_system_metrics():
-    """Update system-level metrics."""
-    try:
-        SYSTEM_CPU_USAGE.set(psutil.cpu_percent())
-        SYSTEM_MEMORY_USAGE.set(psutil.virtual_memory().used)
-    except Exception as e:
-        logger.warning(f"Failed to update system metrics: {e}")
+    logger.info("Request: %s", LazyJSON(log_data))
+
+
+# System metrics are sampled in the background, not on the request path
+system_metrics = SystemMetricsSampler(
+    {
+        'cpu': SYSTEM_CPU_USAGE,
+        'memory': SYSTEM_MEMORY_USAGE,
+        'process_cpu': PROCESS_CPU_USAGE,
+        'process_rss': PROCESS_MEMORY_RSS,
+        'process_threads': PROCESS_THREADS,
+        'cgroup_memory': CGROUP_MEMORY_USAGE,
+        'cgroup_memory_limit': CGROUP_MEMORY_LIMIT,
+    },
+    interval=Config.SYSTEM_METRICS_INTERVAL
+)
 
 
 @app.before_request
 def before_request():
     """Execute before each request."""
     log_request_info()
-    update_system_metrics()
+    system_metrics.ensure_started()
     request.start_time = time.time()
     ACTIVE_CONNECTIONS.inc()
 
@@ -126,14 +226,15 @@ def after_request(response):
     ).inc()
 
     # Log response info
-    log_data = {
-        'timestamp': datetime.utcnow().isoformat(),
-        'method': request.method,
-        'path': request.path,
-        'status_code': response.status_code,
-        'duration_ms': round(duration * 1000, 2)
-    }
-    logger.info(f"Response: {json.dumps(log_data)}")
+    if logger.isEnabledFor(logging.INFO):
+        log_data = {
+            'timestamp': datetime.utcnow().isoformat(),
+            'method': request.method,
+            'path': request.path,
+            'status_code': response.status_code,
+            'duration_ms': round(duration * 1000, 2)
+        }
+        logger.info("Response: %s", LazyJSON(log_data))
 
     return response
 
@@ -150,66 +251,73 @@ def index():
     })
 
 
+STORES = [
+    {
+        'id': 1,
+        'name': 'Cloud SRE Store',
+        'location': 'us-central1',
+        'items': [
+            {
+                'id': 1,
+                'name': 'Kubernetes Cluster',
+                'price': 299.99,
+                'stock': 5
+            },
+            {
+                'id': 2,
+                'name': 'Prometheus Monitoring',
+                'price': 149.99,
+                'stock': 12
+            }
+        ]
+    },
+    {
+        'id': 2,
+        'name': 'DevOps Marketplace',
+        'location': 'us-east1',
+        'items': [
+            {
+                'id': 3,
+                'name': 'CI/CD Pipeline',
+                'price': 199.99,
+                'stock': 8
+            },
+            {
+                'id': 4,
+                'name': 'Container Registry',
+                'price': 99.99,
+                'stock': 15
+            }
+        ]
+    }
+]
+
+# In-memory list or SQLite database, chosen by DATABASE_URL
+store_repository = create_repository(
+    Config.DATABASE_URL, STORES, query_duration=DB_QUERY_DURATION
+)
+
+
 @app.route('/stores')
 def get_stores():
     """Get list of stores with simulated processing time."""
     start_time = time.time()
 
     # Simulate database query with random delay
-    processing_delay = random.uniform(0.1, 0.5)
-    time.sleep(processing_delay)
-
-    stores_data = [
-        {
-            'id': 1,
-            'name': 'Cloud SRE Store',
-            'location': 'us-central1',
-            'items': [
-                {
-                    'id': 1,
-                    'name': 'Kubernetes Cluster',
-                    'price': 299.99,
-                    'stock': 5
-                },
-                {
-                    'id': 2,
-                    'name': 'Prometheus Monitoring',
-                    'price': 149.99,
-                    'stock': 12
-                }
-            ]
-        },
-        {
-            'id': 2,
-            'name': 'DevOps Marketplace',
-            'location': 'us-east1',
-            'items': [
-                {
-                    'id': 3,
-                    'name': 'CI/CD Pipeline',
-                    'price': 199.99,
-                    'stock': 8
-                },
-                {
-                    'id': 4,
-                    'name': 'Container Registry',
-                    'price': 99.99,
-                    'stock': 15
-                }
-            ]
-        }
-    ]
+    if Config.SIMULATE_LATENCY:
+        time.sleep(random.uniform(0.1, 0.5))
+
+    stores_data = store_repository.all_stores()
 
     processing_time = time.time() - start_time
 
     return jsonify({
         'stores': stores_data,
-        'total_stores': len(stores_data),
+        'total_stores': store_repository.count(),
         'processing_time': round(processing_time, 3)
     })
 
 
-@app.route('/health')
 @app.route("/ready")
 def ready_check():
     """Readiness probe endpoint for Kubernetes."""
@@ -219,50 +327,52 @@ def ready_check():
     })
 
 
+def check_memory():
+    """Report degraded when host memory usage reaches 90%."""
+    memory = psutil.virtual_memory()
+    if memory.percent < 90:
+        return HEALTHY, 'ok'
+    return DEGRADED, f'high: {memory.percent}%'
+
+
+def check_disk():
+    """Report degraded when the root filesystem reaches 90% usage."""
+    disk = psutil.disk_usage('/')
+    if disk.percent < 90:
+        return HEALTHY, 'ok'
+    return DEGRADED, f'high: {disk.percent}%'
+
+
+# Health checks run on a thread pool; /health only reads their cached results
+health_monitor = CheckMonitor(max_workers=2, duration=HEALTH_CHECK_DURATION)
+health_monitor.register(
+    'memory', check_memory,
+    interval=Config.HEALTH_MEMORY_CHECK_INTERVAL,
+    timeout=Config.HEALTH_CHECK_TIMEOUT,
+    error_status=DEGRADED
+)
+health_monitor.register(
+    'disk', check_disk,
+    interval=Config.HEALTH_DISK_CHECK_INTERVAL,
+    timeout=Config.HEALTH_CHECK_TIMEOUT,
+    error_status=DEGRADED
+)
+
+
+@app.route('/health')
 def health_check():
     """Health check endpoint for container orchestration."""
+    snapshot = health_monitor.snapshot()
+
     health_status = {
-        'status': 'healthy',
+        'status': snapshot['status'],
         'timestamp': time.time(),
         'version': '1.0.0',
-        'checks': {}
+        'snapshot_age_seconds': snapshot['snapshot_age_seconds'],
+        'checks': {'application': 'ok', **snapshot['checks']}
     }
 
-    # Check application status
-    try:
-        health_status['checks']['application'] = 'ok'
-    except Exception as e:
-        health_status['checks']['application'] = f'error: {str(e)}'
-        health_status['status'] = 'unhealthy'
-
-    # Check memory usage
-    try:
-        memory = psutil.virtual_memory()
-        if memory.percent < 90:
-            health_status['checks']['memory'] = 'ok'
-        else:
-            health_status['checks']['memory'] = f'high: {memory.percent}%'
-            health_status['status'] = 'degraded'
-    except Exception as e:
-        health_status['checks']['memory'] = f'error: {str(e)}'
-
-    # Check disk usage
-    try:
-        disk = psutil.disk_usage('/')
-        if disk.percent < 90:
-            health_status['checks']['disk'] = 'ok'
-        else:
-            health_status['checks']['disk'] = f'high: {disk.percent}%'
-            health_status['status'] = 'degraded'
-    except Exception as e:
-        health_status['checks']['disk'] = f'error: {str(e)}'
-
-    status_code = 200
-    if health_status['status'] == 'unhealthy':
-        status_code = 503
-    elif health_status['status'] == 'degraded':
-        status_code = 200
-
+    status_code = 503 if health_status['status'] == UNHEALTHY else 200
     return jsonify(health_status), status_code
 
 
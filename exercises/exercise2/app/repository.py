@@ -0,0 +1,30 @@
+from sre_common.repository import MEMORY, SQLiteStoreRepository, parse_database_url
+
+__all__ = ['MemoryStoreRepository', 'SQLiteStoreRepository', 'create_repository',
+           'parse_database_url']
+
+
+def create_repository(url, stores=(), query_duration=None):
+    """Build the store repository selected by DATABASE_URL, seeded with stores.
+
+    A SQLite database that already has stores is not re-seeded.
+    """
+    backend, target = parse_database_url(url)
+    if backend == MEMORY:
+        return MemoryStoreRepository(stores)
+    repository = SQLiteStoreRepository(target, query_duration=query_duration)
+    repository.seed(stores)
+    return repository
+
+
+class MemoryStoreRepository:
+    """Stores held in a list, in id order."""
+
+    def __init__(self, stores=()):
+        self._stores = sorted(stores, key=lambda store: store['id'])
+
+    def all_stores(self):
+        return self._stores
+
+    def count(self):
+        return len(self._stores)
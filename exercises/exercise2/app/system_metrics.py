@@ -0,0 +1,141 @@
+import logging
+import os
+import threading
+
+import psutil
+from prometheus_client.core import CounterMetricFamily
+
+logger = logging.getLogger(__name__)
+
+
+def read_cgroup_memory():
+    """Return (usage_bytes, limit_bytes) for this container's cgroup.
+
+    Supports cgroup v2 and v1. Either value is None when unavailable or,
+    for the limit, when the cgroup is unlimited.
+    """
+    candidates = [
+        ('/sys/fs/cgroup/memory.current', '/sys/fs/cgroup/memory.max'),
+        ('/sys/fs/cgroup/memory/memory.usage_in_bytes',
+         '/sys/fs/cgroup/memory/memory.limit_in_bytes'),
+    ]
+    for usage_path, limit_path in candidates:
+        try:
+            with open(usage_path) as f:
+                usage = int(f.read())
+        except (OSError, ValueError):
+            continue
+        try:
+            with open(limit_path) as f:
+                raw = f.read().strip()
+            limit = None if raw == 'max' else int(raw)
+            # cgroup v1 reports "unlimited" as a huge page-aligned number
+            if limit is not None and limit >= 1 << 60:
+                limit = None
+        except (OSError, ValueError):
+            limit = None
+        return usage, limit
+    return None, None
+
+
+def read_cgroup_cpu_throttling():
+    """Return cumulative (throttled_periods, throttled_seconds), or (None, None)."""
+    for path, usec_key in (('/sys/fs/cgroup/cpu.stat', 'throttled_usec'),
+                           ('/sys/fs/cgroup/cpu/cpu.stat', 'throttled_time')):
+        try:
+            with open(path) as f:
+                stats = dict(line.split() for line in f if line.strip())
+        except (OSError, ValueError):
+            continue
+        periods = int(stats.get('nr_throttled', 0))
+        raw = int(stats.get(usec_key, 0))
+        # v2 reports microseconds, v1 nanoseconds
+        seconds = raw / 1e6 if usec_key == 'throttled_usec' else raw / 1e9
+        return periods, seconds
+    return None, None
+
+
+class CgroupThrottlingCollector:
+    """Exposes the cgroup's cumulative CPU throttling as counters.
+
+    The kernel keeps these totals, so they are read from cpu.stat at
+    scrape time; nothing is exported outside a cgroup.
+    """
+
+    def collect(self):
+        periods, seconds = read_cgroup_cpu_throttling()
+        if periods is None:
+            return
+        yield CounterMetricFamily(
+            'app_cgroup_cpu_throttled_periods',
+            'CFS periods in which the container cgroup was throttled',
+            value=periods
+        )
+        yield CounterMetricFamily(
+            'app_cgroup_cpu_throttled_seconds',
+            'Time the container cgroup was throttled in seconds',
+            value=seconds
+        )
+
+
+class SystemMetricsSampler:
+    """Samples host, process and cgroup stats on a background thread.
+
+    Request handlers never call psutil; they only need ensure_started(),
+    which is a pid comparison once the thread is running. The thread is
+    (re)started lazily so it also runs in forked gunicorn workers.
+    """
+
+    def __init__(self, gauges, interval=5.0):
+        self.gauges = gauges
+        self.interval = interval
+        self._pid = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._process = None
+
+    def ensure_started(self):
+        """Start the sampler thread in this process if it isn't running."""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._stop = threading.Event()
+            self._process = psutil.Process()
+            self._thread = threading.Thread(
+                target=self._run, name='system-metrics-sampler', daemon=True
+            )
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def stop(self):
+        """Stop the sampler thread."""
+        self._stop.set()
+
+    def _run(self):
+        # Prime the cpu_percent counters; the first reading is always 0.0
+        psutil.cpu_percent()
+        self._process.cpu_percent()
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        """Take one sample and update the gauges."""
+        try:
+            self.gauges['cpu'].set(psutil.cpu_percent())
+            self.gauges['memory'].set(psutil.virtual_memory().used)
+
+            with self._process.oneshot():
+                self.gauges['process_cpu'].set(self._process.cpu_percent())
+                self.gauges['process_rss'].set(self._process.memory_info().rss)
+                self.gauges['process_threads'].set(self._process.num_threads())
+
+            usage, limit = read_cgroup_memory()
+            if usage is not None:
+                self.gauges['cgroup_memory'].set(usage)
+            if limit is not None:
+                self.gauges['cgroup_memory_limit'].set(limit)
+        except Exception as e:
+            logger.warning(f"Failed to update system metrics: {e}")
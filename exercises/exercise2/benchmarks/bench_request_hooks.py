@@ -0,0 +1,61 @@
+"""
+Per-request hook overhead: psutil on every request vs. background sampler.
+
+Runs Flask's before/after request hooks inside a request context and
+reports the mean cost per request. "per-request psutil" adds the calls the
+old update_system_metrics() made on every request; "background sampler"
+is the current hook, which only checks that the sampler thread is running.
+
+Usage (from exercises/exercise2):
+    python -m benchmarks.bench_request_hooks
+    python -m benchmarks.bench_request_hooks --requests 20000
+"""
+
+import argparse
+import logging
+import time
+
+import psutil
+
+from app.main import (
+    SYSTEM_CPU_USAGE, SYSTEM_MEMORY_USAGE, app, system_metrics
+)
+
+
+def legacy_update_system_metrics():
+    SYSTEM_CPU_USAGE.set(psutil.cpu_percent())
+    SYSTEM_MEMORY_USAGE.set(psutil.virtual_memory().used)
+
+
+def measure(requests, extra=None):
+    start = time.perf_counter()
+    for _ in range(requests):
+        with app.test_request_context('/'):
+            app.preprocess_request()
+            if extra is not None:
+                extra()
+            app.process_response(app.response_class())
+    return (time.perf_counter() - start) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument('--requests', type=int, default=5000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    system_metrics.ensure_started()
+
+    legacy = measure(args.requests, legacy_update_system_metrics)
+    current = measure(args.requests)
+
+    print(f"{'hooks':<22} {'us/request':>12}")
+    print(f"{'per-request psutil':<22} {legacy * 1e6:>12.1f}")
+    print(f"{'background sampler':<22} {current * 1e6:>12.1f}")
+    print(f"saved per request: {(legacy - current) * 1e6:.1f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -13,5 +13,15 @@ Version 1.2.0 adds GitOps deployment support with:
 - Blue-green deployment readiness
 """
 
+import os
+import sys
+
 __version__ = "1.2.0"
 __author__ = "SRE Course"
+
+# Shared modules (sre_common) live in exercises/shared; container images
+# copy them next to this package instead
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SHARED = os.path.join(os.path.dirname(_APP_DIR), 'shared')
+if os.path.isdir(_SHARED) and _SHARED not in sys.path:
+    sys.path.append(_SHARED)
@@ -0,0 +1,147 @@
+import os
+import threading
+import time
+from typing import Optional
+
+
+def parse_request_start(value: Optional[str]) -> Optional[float]:
+    """Return the epoch time from an X-Request-Start header, or None.
+
+    Accepts ``t=<time>`` or a bare number in seconds, milliseconds or
+    microseconds (told apart by magnitude, as proxies differ). When the
+    header was set more than once the earliest time wins, so a client
+    cannot hide the time its request spent queued.
+    """
+    if not value:
+        return None
+    times = []
+    for part in value.split(','):
+        part = part.strip()
+        if part.startswith('t='):
+            part = part[2:]
+        try:
+            t = float(part)
+        except ValueError:
+            continue
+        if t > 1e14:
+            t /= 1e6
+        elif t > 1e11:
+            t /= 1e3
+        times.append(t)
+    return min(times) if times else None
+
+
+class AdaptiveConcurrencyLimiter:
+    """Admission control with an AIMD concurrency limit driven by latency.
+
+    ``try_acquire()`` admits a request while fewer than ``limit`` are in
+    flight and sheds it otherwise; ``release(latency)`` ends an admitted
+    request and feeds its latency back. Latencies are averaged over
+    ``window`` seconds. At the end of each window the limit is cut by
+    ``backoff`` (multiplicative decrease) if the mean exceeded
+    ``target_latency``, or raised by ``increase`` (additive increase) if
+    the limit was actually reached during the window, so an idle process
+    does not grow its limit without bound. The limit stays within
+    [min_limit, max_limit].
+
+    The limit only binds where the server hands the application more
+    concurrent requests than it can serve well (gevent, ASGI). A thread
+    pool server runs at most its pool size at once and queues the rest
+    before the application sees them, so requests also carry the time
+    they spent queued: one that waited longer than ``max_queue_time`` is
+    shed whatever the limit (0 turns this off).
+
+    Optional metrics: ``limit_gauge`` and ``in_flight_gauge``,
+    ``shed_counter`` labelled by endpoint and reason (``concurrency`` or
+    ``queue_time``), and ``queue_time`` histogram.
+    """
+
+    def __init__(self, initial_limit: int = 50, min_limit: int = 4, max_limit: int = 1000,
+                 target_latency: float = 0.5, window: float = 1.0, backoff: float = 0.9,
+                 increase: float = 1.0, max_queue_time: float = 0.0, limit_gauge=None,
+                 in_flight_gauge=None, shed_counter=None, queue_time=None):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.window = window
+        self.backoff = backoff
+        self.increase = increase
+        self.max_queue_time = max_queue_time
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._window_end = time.monotonic() + window
+        self._latency_sum = 0.0
+        self._latency_count = 0
+        self._saturated = False
+        self._lock = threading.Lock()
+        self._limit_gauge = limit_gauge
+        self._in_flight_gauge = in_flight_gauge
+        self._shed_counter = shed_counter
+        self._queue_time = queue_time
+        # The limit gauge is set by each process that serves requests, not by
+        # a preloading master that only forks them
+        self._pid = None
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def try_acquire(self, endpoint: str = 'unknown', queue_time: float = 0.0) -> bool:
+        """Admit a request that waited queue_time seconds; count it as shed otherwise."""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            if self._limit_gauge is not None:
+                self._limit_gauge.set(self.limit)
+        if self._queue_time is not None:
+            self._queue_time.observe(queue_time)
+        if self.max_queue_time > 0 and queue_time > self.max_queue_time:
+            self._shed(endpoint, 'queue_time')
+            return False
+        with self._lock:
+            if self._in_flight >= int(self._limit):
+                self._saturated = True
+                admitted = False
+            else:
+                self._in_flight += 1
+                if self._in_flight >= int(self._limit):
+                    self._saturated = True
+                admitted = True
+        if not admitted:
+            self._shed(endpoint, 'concurrency')
+            return False
+        if self._in_flight_gauge is not None:
+            self._in_flight_gauge.inc()
+        return True
+
+    def _shed(self, endpoint: str, reason: str) -> None:
+        if self._shed_counter is not None:
+            self._shed_counter.labels(endpoint=endpoint, reason=reason).inc()
+
+    def release(self, latency: float) -> None:
+        """End an admitted request that took ``latency`` seconds, queueing included."""
+        now = time.monotonic()
+        with self._lock:
+            self._in_flight -= 1
+            self._latency_sum += latency
+            self._latency_count += 1
+            if now >= self._window_end:
+                self._adjust(now)
+        if self._in_flight_gauge is not None:
+            self._in_flight_gauge.dec()
+
+    def _adjust(self, now: float) -> None:
+        mean = self._latency_sum / self._latency_count
+        if mean > self.target_latency:
+            self._limit = max(float(self.min_limit), self._limit * self.backoff)
+        elif self._saturated:
+            self._limit = min(float(self.max_limit), self._limit + self.increase)
+        self._window_end = now + self.window
+        self._latency_sum = 0.0
+        self._latency_count = 0
+        self._saturated = self._in_flight >= int(self._limit)
+        if self._limit_gauge is not None:
+            self._limit_gauge.set(self.limit)
@@ -0,0 +1,303 @@
+"""
+ASGI build of the store service.
+
+Serves the same routes, JSON bodies and Prometheus metrics as the Flask
+app in app.main: both run the views in app.views, so this module only
+parses ASGI requests, routes them and sends the responses, letting the two
+builds be load tested side by side. Simulated latency is an
+``asyncio.sleep``, so a single worker holds any number of slow requests;
+SQLite queries are blocking and run in the default thread pool.
+
+Usage (from exercises/exercise6):
+    uvicorn app.asgi:app --host 0.0.0.0 --port 8080 --no-access-log
+    python -m app.asgi
+"""
+
+import asyncio
+import json
+import re
+from urllib.parse import parse_qsl
+
+import structlog
+
+from app.config import Config
+from app.metrics import request_metrics
+from app import log_setup  # noqa: F401 - configures structlog and the log handler
+from app import views
+from app.catalog import StoreCatalog
+from app.probes import readiness_monitor, shutdown
+
+logger = structlog.get_logger()
+
+# The in-memory catalog answers from dicts; other repositories block on I/O
+BLOCKING_CATALOG = not isinstance(views.catalog, StoreCatalog)
+
+
+class Request:
+    """The parts of an ASGI HTTP scope the handlers use."""
+
+    def __init__(self, scope, receive=None):
+        self.method = scope['method']
+        self.path = scope['path']
+        self.args = {}
+        for name, value in parse_qsl(scope.get('query_string', b'').decode('latin-1'),
+                                     keep_blank_values=True):
+            self.args.setdefault(name, value)  # first value wins, like request.args.get
+        self.headers = {}
+        for name, value in scope.get('headers', ()):
+            name, value = name.decode('latin-1').lower(), value.decode('latin-1')
+            self.headers[name] = f"{self.headers[name]}, {value}" if name in self.headers else value
+        client = scope.get('client')
+        self.remote_addr = client[0] if client else None
+        self.endpoint = None
+        self.admitted = False
+        self.queued_at = 0.0
+        self.start_time = 0.0
+        self.log_sampled = False
+        self._receive = receive
+
+    async def body(self):
+        """Read the whole request body."""
+        chunks = []
+        while self._receive is not None:
+            message = await self._receive()
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body'):
+                break
+        return b''.join(chunks)
+
+    async def json(self):
+        """Return the parsed JSON body, or None if it is not JSON (like get_json(silent=True))."""
+        mimetype = self.headers.get('content-type', '').split(';')[0].strip()
+        if mimetype != views.JSON and not (mimetype.startswith('application/') and mimetype.endswith('+json')):
+            return None
+        try:
+            return json.loads(await self.body())
+        except ValueError:
+            return None
+
+
+async def offload(func, *args):
+    """Call func, in the default thread pool if it may block on the repository."""
+    if BLOCKING_CATALOG:
+        return await asyncio.to_thread(func, *args)
+    return func(*args)
+
+
+async def offload_chunks(chunks):
+    """Iterate a body that reads the catalog without blocking the event loop."""
+    while True:
+        chunk = await offload(next, chunks, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+def compress_response(request, response):
+    """Compress eligible responses that were not served precompressed."""
+    if response.chunks is not None or not views.compressible(
+            response.status, response.mimetype, response.headers):
+        return response
+
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.body, encoding = views.compress_body(request, response.body)
+    if encoding is not None:
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+async def home(request):
+    return views.home()
+
+
+async def get_stores(request):
+    """Get stores; see views.list_stores for the arguments."""
+    try:
+        listing = views.listing_arguments(request)
+    except ValueError as exc:
+        return views.invalid_request('store_fetch', "Invalid store listing request", exc)
+
+    # Simulate processing time without holding a thread
+    processing_time = views.simulated_latency()
+    if processing_time:
+        await asyncio.sleep(processing_time)
+
+    response = await offload(views.list_stores, request, *listing, processing_time)
+    if response.chunks is not None:
+        response.chunks = offload_chunks(response.chunks)
+    return response
+
+
+async def get_store(request, store_id):
+    return await offload(views.get_store, request, int(store_id))
+
+
+async def get_stores_batch(request):
+    body = await request.json() if request.method == 'POST' else None
+    return await offload(views.get_stores_batch, request, body)
+
+
+async def get_store_item(request, store_id, item_id):
+    return await offload(views.get_store_item, int(store_id), int(item_id))
+
+
+async def health(request):
+    return views.health()
+
+
+async def ready(request):
+    return views.ready()
+
+
+async def metrics(request):
+    return views.metrics()
+
+
+async def slo_status(request):
+    return views.slo_status()
+
+
+async def deployment_info(request):
+    return views.deployment_info()
+
+
+ALLOWED_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# (path pattern, endpoint name, handler, allowed methods); endpoint names match the Flask view functions
+ROUTES = [
+    (re.compile(pattern), handler.__name__, handler, ALLOWED_METHODS + extra_methods)
+    for pattern, handler, extra_methods in (
+        (r'/', home, ()),
+        (r'/stores', get_stores, ()),
+        (r'/stores/batch', get_stores_batch, ('POST',)),
+        (r'/stores/(?P<store_id>\d+)', get_store, ()),
+        (r'/stores/(?P<store_id>\d+)/items/(?P<item_id>\d+)', get_store_item, ()),
+        (r'/health', health, ()),
+        (r'/ready', ready, ()),
+        (r'/metrics', metrics, ()),
+        (r'/slo', slo_status, ()),
+        (r'/deployment', deployment_info, ()),
+    )
+]
+
+
+async def dispatch(request):
+    for pattern, endpoint, handler, methods in ROUTES:
+        match = pattern.fullmatch(request.path)
+        if match is None:
+            continue
+        if request.method not in methods:
+            return views.method_not_allowed()
+        request.endpoint = endpoint
+        rejection = views.admit(request)
+        if rejection is not None:
+            return rejection
+        if request.method == 'OPTIONS':
+            return views.Response(content_type='text/html; charset=utf-8',
+                                  headers={'Allow': ', '.join(sorted(methods))})
+        return await handler(request, **match.groupdict())
+    return views.not_found(request)
+
+
+async def send_response(send, request, response):
+    # ASGI header names are lowercase
+    headers = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+               for name, value in response.headers.items()]
+    if response.chunks is None:
+        headers.append((b'content-length', str(len(response.body)).encode()))
+    await send({'type': 'http.response.start', 'status': response.status, 'headers': headers})
+
+    if request.method == 'HEAD':
+        await send({'type': 'http.response.body', 'body': b''})
+    elif response.chunks is None:
+        await send({'type': 'http.response.body', 'body': response.body})
+    else:
+        async for chunk in response.chunks:
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            logger.info(
+                "Starting GitOps-deployed application",
+                **Config.get_config_dict(),
+                server='asgi'
+            )
+            # Run the checks now so /ready does not report them pending at first
+            readiness_monitor.refresh(force=True)
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            # The server has finished its in-flight requests; record the drain and flush logs
+            await asyncio.to_thread(shutdown.finish)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    """ASGI entry point."""
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    request = Request(scope, receive)
+    views.start_request(request)
+
+    try:
+        if shutdown.accepting():
+            try:
+                response = await dispatch(request)
+            except Exception as exc:
+                response = views.internal_error(exc)
+        else:
+            response = views.refuse_request(request)
+        if Config.COMPRESSION_ENABLED:
+            # Before finish_request so the request duration includes compression
+            response = compress_response(request, response)
+        views.finish_request(request, response.status)
+        await send_response(send, request, response)
+    finally:
+        views.release_request(request.admitted, request.queued_at)
+
+
+# Resolve metric children for every route's status codes up front so the hot
+# path rarely calls labels()
+request_metrics.prepare(views.metric_series(
+    (method, endpoint)
+    for _, endpoint, _, methods in ROUTES
+    for method in methods if method not in ('HEAD', 'OPTIONS')
+))
+
+if __name__ == '__main__':
+    import signal
+
+    import uvicorn
+
+    class DrainingServer(uvicorn.Server):
+        """uvicorn server that keeps serving for the shutdown grace period after SIGTERM."""
+
+        def handle_exit(self, sig, frame):
+            if sig == signal.SIGTERM and shutdown.begin():
+                # uvicorn then stops accepting and waits for in-flight requests
+                asyncio.get_running_loop().call_later(
+                    Config.SHUTDOWN_GRACE_PERIOD, super().handle_exit, sig, frame
+                )
+                return
+            super().handle_exit(sig, frame)
+
+    options = dict(
+        host=Config.HOST,
+        port=Config.PORT,
+        log_level=Config.LOG_LEVEL.lower(),
+        access_log=False,
+        timeout_graceful_shutdown=int(Config.SHUTDOWN_DRAIN_TIMEOUT)
+    )
+    if Config.WORKERS > 1:
+        # uvicorn's supervisor handles signals itself: workers stop accepting at once
+        uvicorn.run('app.asgi:app', workers=Config.WORKERS, **options)
+    else:
+        DrainingServer(uvicorn.Config('app.asgi:app', **options)).run()
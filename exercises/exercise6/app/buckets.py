@@ -0,0 +1,85 @@
+from typing import Dict, Iterable, Sequence, Tuple
+
+from prometheus_client import Histogram
+from prometheus_client.registry import REGISTRY
+
+# Multiples of the SLO latency threshold. The 1.0 multiple puts a bucket
+# boundary exactly on the threshold that the latency SLI queries with
+# le="<threshold>" (see exercise5/slo-config.yaml and sli-definitions.yaml).
+SLO_MULTIPLES = (0.1, 0.2, 0.4, 0.6, 0.8, 1.0, 1.2, 1.6, 2.0, 4.0)
+
+# Probes are fast and only need to answer "within SLO or not"
+PROBE_MULTIPLES = (0.02, 0.1, 1.0, 4.0)
+
+
+def scaled(multiples: Iterable[float], threshold: float) -> Tuple[float, ...]:
+    return tuple(round(m * threshold, 6) for m in multiples)
+
+
+def presets(threshold: float) -> Dict[str, Tuple[float, ...]]:
+    """Named bucket layouts for a given SLO latency threshold in seconds."""
+    return {
+        'default': tuple(b for b in Histogram.DEFAULT_BUCKETS if b != float('inf')),
+        'slo': scaled(SLO_MULTIPLES, threshold),
+        'probe': scaled(PROBE_MULTIPLES, threshold),
+    }
+
+
+def resolve_buckets(spec: str, threshold: float) -> Tuple[float, ...]:
+    """Turn a preset name or a comma-separated list of bounds into buckets.
+
+    The SLO threshold is always added as a boundary so the latency SLI keeps
+    working whatever layout is configured.
+    """
+    named = presets(threshold)
+    if spec in named:
+        bounds = set(named[spec])
+    else:
+        try:
+            bounds = {float(b) for b in spec.split(',') if b.strip()}
+        except ValueError:
+            raise ValueError(f"Invalid histogram buckets {spec!r}: expected a preset "
+                             f"({', '.join(named)}) or comma-separated numbers") from None
+    bounds.add(threshold)
+    return tuple(sorted(bounds))
+
+
+class GroupedHistogram:
+    """A histogram metric whose bucket layout differs per endpoint group.
+
+    Holds one unregistered Histogram per group and exposes them as a single
+    metric family, so every series keeps the same name and labels while
+    probe endpoints, for example, carry far fewer buckets than API routes.
+    In multiprocess mode the per-group values are written under the shared
+    metric name and merged by the multiprocess collector as usual.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str],
+                 group_buckets: Dict[str, Sequence[float]], registry=REGISTRY):
+        self._histograms = {
+            group: Histogram(name, documentation, labelnames, buckets=buckets, registry=None)
+            for group, buckets in group_buckets.items()
+        }
+        if registry is not None:
+            registry.register(self)
+
+    def group(self, name: str) -> Histogram:
+        """Return the histogram backing an endpoint group."""
+        return self._histograms[name]
+
+    def labels(self, group: str, *args, **kwargs):
+        return self._histograms[group].labels(*args, **kwargs)
+
+    def collect(self):
+        merged = None
+        for histogram in self._histograms.values():
+            for family in histogram.collect():
+                if merged is None:
+                    merged = family
+                else:
+                    merged.samples.extend(family.samples)
+        if merged is not None:
+            yield merged
+
+    def describe(self):
+        return self.collect()
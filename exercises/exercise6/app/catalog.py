@@ -0,0 +1,138 @@
+import bisect
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+class StoreCatalog:
+    """In-memory store catalog with hash indexes for constant-time lookups.
+
+    Keeps the ordered store list the API returns, plus indexes by store id,
+    by item id within each store and by location, and sorted id lists
+    (overall and per location) that paginated reads seek into with bisect.
+    Reads never take the lock; writes rebuild the affected index entries
+    under it.
+    """
+
+    def __init__(self, stores: Optional[Iterable[Dict[str, Any]]] = None):
+        self._lock = threading.Lock()
+        self.version = 0
+        self._stores: List[Dict[str, Any]] = []
+        self._by_id: Dict[int, Dict[str, Any]] = {}
+        self._items_by_store: Dict[int, Dict[int, Dict[str, Any]]] = {}
+        self._by_location: Dict[str, List[Dict[str, Any]]] = {}
+        self._ids: List[int] = []
+        self._ids_by_location: Dict[str, List[int]] = {}
+
+        for store in stores or ():
+            self.add_store(store)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def add_store(self, store: Dict[str, Any]) -> None:
+        """Add a store, replacing any existing store with the same id."""
+        with self._lock:
+            existing = self._by_id.get(store['id'])
+            if existing is not None:
+                self._unindex_location(existing)
+                self._stores = [store if s is existing else s for s in self._stores]
+            else:
+                self._stores.append(store)
+                bisect.insort(self._ids, store['id'])
+
+            self._by_id[store['id']] = store
+            self._items_by_store[store['id']] = {
+                item['id']: item for item in store.get('items', ())
+            }
+            location = store.get('location')
+            self._by_location.setdefault(location, []).append(store)
+            bisect.insort(self._ids_by_location.setdefault(location, []), store['id'])
+            self.version += 1
+
+    def remove_store(self, store_id: int) -> bool:
+        """Remove a store by id. Returns False if it was not present."""
+        with self._lock:
+            store = self._by_id.pop(store_id, None)
+            if store is None:
+                return False
+            self._items_by_store.pop(store_id, None)
+            self._unindex_location(store)
+            self._stores = [s for s in self._stores if s is not store]
+            self._ids = [i for i in self._ids if i != store_id]
+            self.version += 1
+            return True
+
+    def _unindex_location(self, store: Dict[str, Any]) -> None:
+        location = store.get('location')
+        remaining = [s for s in self._by_location.get(location, ()) if s is not store]
+        if remaining:
+            self._by_location[location] = remaining
+            self._ids_by_location[location] = [
+                i for i in self._ids_by_location[location] if i != store['id']
+            ]
+        else:
+            self._by_location.pop(location, None)
+            self._ids_by_location.pop(location, None)
+
+    def all_stores(self) -> List[Dict[str, Any]]:
+        """Return every store in insertion order. Do not mutate the result."""
+        return self._stores
+
+    def get_store(self, store_id: int) -> Optional[Dict[str, Any]]:
+        """Return the store with the given id, or None."""
+        return self._by_id.get(store_id)
+
+    def get_many(self, store_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """Return the stores among the given ids that exist, keyed by id."""
+        return {store['id']: store for store in self._lookup(store_ids)}
+
+    def get_item(self, store_id: int, item_id: int) -> Optional[Dict[str, Any]]:
+        """Return an item of a store, or None if either does not exist."""
+        items = self._items_by_store.get(store_id)
+        if items is None:
+            return None
+        return items.get(item_id)
+
+    def stores_in_location(self, location: str) -> List[Dict[str, Any]]:
+        """Return the stores in a location. Do not mutate the result."""
+        return self._by_location.get(location, [])
+
+    def count(self, location: Optional[str] = None) -> int:
+        """Return the number of stores, optionally in one location."""
+        if location is None:
+            return len(self._by_id)
+        return len(self._by_location.get(location, ()))
+
+    def page(self, after: Optional[int] = None, limit: int = 100,
+             location: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return up to ``limit`` stores in id order with ids greater than ``after``.
+
+        Seeks into the sorted id index, so the cost depends on the page size
+        rather than on the position in the catalog.
+        """
+        return self._lookup(self._ids_after(after, limit, location))
+
+    def iter_stores(self, location: Optional[str] = None,
+                    chunk_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """Yield stores in id order, reading the index one chunk at a time.
+
+        Each chunk resumes after the last id seen, so concurrent writes never
+        invalidate the iteration and only ``chunk_size`` stores are held.
+        """
+        after = None
+        while True:
+            ids = self._ids_after(after, chunk_size, location)
+            yield from self._lookup(ids)
+            if len(ids) < chunk_size:
+                return
+            after = ids[-1]
+
+    def _ids_after(self, after: Optional[int], limit: int, location: Optional[str]) -> List[int]:
+        ids = self._ids if location is None else self._ids_by_location.get(location, [])
+        start = 0 if after is None else bisect.bisect_right(ids, after)
+        return ids[start:start + limit]
+
+    def _lookup(self, ids: Iterable[int]) -> List[Dict[str, Any]]:
+        # A store removed since the ids were read is skipped
+        stores = (self._by_id.get(i) for i in ids)
+        return [store for store in stores if store is not None]
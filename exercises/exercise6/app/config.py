@@ -17,15 +17,198 @@ class Config:
     HOST = os.environ.get('HOST', '0.0.0.0')
     PORT = int(os.environ.get('PORT', 8080))
 
+    # Concurrency model: 'threaded' (one OS thread per request) or 'gevent'
+    # (greenlets; blocking waits such as time.sleep yield to other requests)
+    CONCURRENCY_MODE = os.environ.get('CONCURRENCY_MODE', 'threaded')
+    WORKER_CONNECTIONS = int(os.environ.get('WORKER_CONNECTIONS', 1000))
+
+    # Gunicorn settings (see app/gunicorn_config.py); 0 workers = derive from CPU quota
+    WORKERS = int(os.environ.get('WEB_CONCURRENCY', 0))
+    THREADS = int(os.environ.get('GUNICORN_THREADS', 4))
+    KEEPALIVE = int(os.environ.get('GUNICORN_KEEPALIVE', 75))
+    MAX_REQUESTS = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+    MAX_REQUESTS_JITTER = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+    PRELOAD_APP = os.environ.get('GUNICORN_PRELOAD_APP', 'true').lower() == 'true'
+    WORKER_TIMEOUT = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+    GRACEFUL_TIMEOUT = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+
+    # Prometheus multiprocess mode: workers write metric values to shared
+    # mmap files in METRICS_MULTIPROC_DIR and /metrics merges them
+    METRICS_MULTIPROCESS = os.environ.get('METRICS_MULTIPROCESS', 'false').lower() == 'true'
+    METRICS_MULTIPROC_DIR = os.environ.get('PROMETHEUS_MULTIPROC_DIR', '/tmp/prometheus_multiproc')
+
     # Logging configuration
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
     LOG_FORMAT = 'json' if FLASK_ENV == 'production' else 'console'
 
+    # Asynchronous logging: records are queued and written by a writer thread.
+    # LOG_QUEUE_POLICY decides what a full queue does: 'drop' or 'block'.
+    LOG_ASYNC = os.environ.get('LOG_ASYNC', 'false').lower() == 'true'
+    LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+    LOG_QUEUE_POLICY = os.environ.get('LOG_QUEUE_POLICY', 'drop')
+    LOG_BATCH_SIZE = int(os.environ.get('LOG_BATCH_SIZE', 256))
+
+    # Request log sampling: fraction of fast, successful requests whose
+    # start/completion lines are logged. Errors and requests slower than the
+    # threshold (the 500 ms latency SLO by default) are always logged.
+    LOG_SAMPLE_RATE = float(os.environ.get('LOG_SAMPLE_RATE', 1.0))
+    LOG_SLOW_REQUEST_THRESHOLD = float(os.environ.get('LOG_SLOW_REQUEST_THRESHOLD', 0.5))
+
     # GitOps specific configuration
     DEPLOYMENT_METHOD = os.environ.get('DEPLOYMENT_METHOD', 'gitops')
     GIT_COMMIT = os.environ.get('GIT_COMMIT', 'unknown')
     DEPLOYMENT_ID = os.environ.get('DEPLOYMENT_ID', 'manual')
 
+    # JSON encoder for responses and structured logs: 'orjson' (falls back to
+    # the standard library when not installed) or 'stdlib'. orjson writes
+    # compact log lines (no space after ',' and ':'), and writes NaN and
+    # exponent-form floats differently from the stdlib
+    JSON_SERIALIZER = os.environ.get('JSON_SERIALIZER', 'orjson')
+
+    # Latency SLO threshold in seconds (exercise5/slo-config.yaml: 95% under 500ms)
+    SLO_LATENCY_THRESHOLD = float(os.environ.get('SLO_LATENCY_THRESHOLD', 0.5))
+
+    # SLO targets evaluated in-process for /slo
+    SLO_AVAILABILITY_TARGET = float(os.environ.get('SLO_AVAILABILITY_TARGET', 0.995))
+    SLO_LATENCY_TARGET = float(os.environ.get('SLO_LATENCY_TARGET', 0.95))
+    SLO_QUALITY_TARGET = float(os.environ.get('SLO_QUALITY_TARGET', 0.99))
+    # Rolling periods in seconds over which each error budget is measured
+    # (rollingPeriod in exercise5/slo-config.yaml)
+    SLO_AVAILABILITY_PERIOD = int(os.environ.get('SLO_AVAILABILITY_PERIOD', 2592000))
+    SLO_LATENCY_PERIOD = int(os.environ.get('SLO_LATENCY_PERIOD', 2592000))
+    SLO_QUALITY_PERIOD = int(os.environ.get('SLO_QUALITY_PERIOD', 604800))
+
+    # Histogram buckets for http_request_duration_seconds per endpoint group:
+    # a preset ('slo', 'probe', 'default') or comma-separated upper bounds.
+    # Every layout also gets a boundary at SLO_LATENCY_THRESHOLD.
+    REQUEST_DURATION_BUCKETS = {
+        'api': os.environ.get('REQUEST_DURATION_BUCKETS_API', 'slo'),
+        'probe': os.environ.get('REQUEST_DURATION_BUCKETS_PROBE', 'probe'),
+    }
+    PROBE_ENDPOINTS = ('health', 'ready', 'metrics', 'slo')
+
+    # Request metric label cardinality limits; values beyond them become "other".
+    # Children for the codes among these that each route can return are created at startup.
+    METRICS_MAX_ENDPOINTS = int(os.environ.get('METRICS_MAX_ENDPOINTS', 64))
+    METRICS_MAX_METHODS = int(os.environ.get('METRICS_MAX_METHODS', 10))
+    METRICS_MAX_STATUS_CODES = int(os.environ.get('METRICS_MAX_STATUS_CODES', 20))
+    METRICS_STATUS_CODES = [
+        int(code) for code in
+        os.environ.get('METRICS_STATUS_CODES', '200,400,404,429,500,503').split(',')
+    ]
+
+    # Store repository: memory:// (in-process catalog) or sqlite:///<path>.
+    # /stores sleeps for a random 0.1-0.8 s unless SIMULATE_LATENCY is off,
+    # which it is by default when the data comes from a real database.
+    # Each process keeps at most DATABASE_POOL_SIZE SQLite connections open;
+    # requests beyond that wait for one to be returned.
+    DATABASE_URL = os.environ.get('DATABASE_URL', 'memory://')
+    DATABASE_POOL_SIZE = int(os.environ.get('DATABASE_POOL_SIZE', 8))
+    SIMULATE_LATENCY = os.environ.get(
+        'SIMULATE_LATENCY', 'true' if DATABASE_URL.startswith('memory') else 'false'
+    ).lower() == 'true'
+
+    # Read-through cache in front of the store repository, on by default for
+    # real databases. Entries expire after DATA_CACHE_TTL seconds (not-found
+    # lookups after DATA_CACHE_NEGATIVE_TTL), which bounds how stale another
+    # worker's writes can look.
+    DATA_CACHE_ENABLED = os.environ.get(
+        'DATA_CACHE_ENABLED', 'false' if DATABASE_URL.startswith('memory') else 'true'
+    ).lower() == 'true'
+    DATA_CACHE_MAX_ENTRIES = int(os.environ.get('DATA_CACHE_MAX_ENTRIES', 10000))
+    DATA_CACHE_TTL = float(os.environ.get('DATA_CACHE_TTL', 30.0))
+    DATA_CACHE_NEGATIVE_TTL = float(os.environ.get('DATA_CACHE_NEGATIVE_TTL', 5.0))
+
+    # Response cache for pre-encoded catalog views; the byte budget covers
+    # keys and per-entry bookkeeping as well as the encoded bodies
+    RESPONSE_CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+    RESPONSE_CACHE_MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+
+    # /stores pagination and NDJSON streaming
+    STORES_PAGE_SIZE_DEFAULT = int(os.environ.get('STORES_PAGE_SIZE_DEFAULT', 100))
+    STORES_PAGE_SIZE_MAX = int(os.environ.get('STORES_PAGE_SIZE_MAX', 1000))
+    STORES_STREAM_CHUNK_SIZE = int(os.environ.get('STORES_STREAM_CHUNK_SIZE', 100))
+    # Most store ids one /stores/batch request may ask for
+    STORES_BATCH_MAX_SIZE = int(os.environ.get('STORES_BATCH_MAX_SIZE', 100))
+
+    # Response compression (gzip, plus brotli when the brotli package is installed)
+    COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))
+    COMPRESSION_LEVEL = int(os.environ.get('COMPRESSION_LEVEL', 6))
+    COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 4))
+    COMPRESSION_MIMETYPES = ('application/json', 'text/plain', 'text/html')
+
+    # Readiness checks run on a small thread pool; /ready serves their cached
+    # results and re-runs a check once its result is older than the freshness.
+    # The external API check is skipped when no URL is set and, unless marked
+    # critical, is reported without affecting readiness.
+    READINESS_CHECK_FRESHNESS = float(os.environ.get('READINESS_CHECK_FRESHNESS', 10.0))
+    READINESS_CHECK_TIMEOUT = float(os.environ.get('READINESS_CHECK_TIMEOUT', 2.0))
+    READINESS_MAX_WORKERS = int(os.environ.get('READINESS_MAX_WORKERS', 4))
+    READINESS_EXTERNAL_API_URL = os.environ.get('READINESS_EXTERNAL_API_URL', '')
+    READINESS_EXTERNAL_API_CRITICAL = os.environ.get(
+        'READINESS_EXTERNAL_API_CRITICAL', 'false'
+    ).lower() == 'true'
+
+    # Adaptive concurrency limit (admission control) for non-probe endpoints.
+    # The limit per process moves between MIN and MAX: it is cut by the
+    # backoff factor after each window whose mean latency exceeds the target
+    # (the latency SLO by default) and grows by one while it is being reached.
+    # The limit only takes effect in gevent mode (and the ASGI build): under
+    # gthread at most GUNICORN_THREADS requests per worker reach the app and
+    # the rest wait in gunicorn's queue. Requests are therefore also shed once
+    # they have queued longer than ADMISSION_MAX_QUEUE_TIME (0 = off), timed
+    # from X-Request-Start as set by a front-end proxy or by the gthread
+    # worker in app/gunicorn_worker.py (a proxy's clock must be in sync with the
+    # pod's). Shed requests get a 503 with Retry-After.
+    ADMISSION_CONTROL_ENABLED = os.environ.get('ADMISSION_CONTROL_ENABLED', 'true').lower() == 'true'
+    ADMISSION_INITIAL_LIMIT = int(os.environ.get('ADMISSION_INITIAL_LIMIT', 50))
+    ADMISSION_MIN_LIMIT = int(os.environ.get('ADMISSION_MIN_LIMIT', 4))
+    ADMISSION_MAX_LIMIT = int(os.environ.get('ADMISSION_MAX_LIMIT', 1000))
+    ADMISSION_TARGET_LATENCY = float(
+        os.environ.get('ADMISSION_TARGET_LATENCY', SLO_LATENCY_THRESHOLD)
+    )
+    ADMISSION_WINDOW = float(os.environ.get('ADMISSION_WINDOW', 1.0))
+    ADMISSION_BACKOFF = float(os.environ.get('ADMISSION_BACKOFF', 0.9))
+    ADMISSION_MAX_QUEUE_TIME = float(
+        os.environ.get('ADMISSION_MAX_QUEUE_TIME', SLO_LATENCY_THRESHOLD / 2)
+    )
+    ADMISSION_RETRY_AFTER = int(os.environ.get('ADMISSION_RETRY_AFTER', 1))
+
+    # Per-client token-bucket rate limiting, off unless enabled. Clients are
+    # told apart by RATE_LIMIT_KEY_HEADER when it is set and sent (use a header
+    # a trusted proxy sets) and by remote address otherwise. Limits per
+    # endpoint are '<requests per second>:<burst>' or 'off'; endpoints without
+    # their own limit share the default one. Buckets idle for
+    # RATE_LIMIT_IDLE_TTL seconds (or until refilled, if longer) are dropped,
+    # and at most RATE_LIMIT_MAX_CLIENTS are kept per process. Buckets are per
+    # process too: a client spread over N gunicorn workers (WEB_CONCURRENCY)
+    # may get up to N times the configured rate and burst.
+    RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'false').lower() == 'true'
+    RATE_LIMIT_KEY_HEADER = os.environ.get('RATE_LIMIT_KEY_HEADER', '')
+    RATE_LIMITS = {
+        'default': os.environ.get('RATE_LIMIT_DEFAULT', '20:40'),
+        'get_stores': os.environ.get('RATE_LIMIT_GET_STORES', '10:20'),
+        'health': os.environ.get('RATE_LIMIT_HEALTH', '10:20'),
+    }
+    RATE_LIMIT_SHARDS = int(os.environ.get('RATE_LIMIT_SHARDS', 64))
+    RATE_LIMIT_MAX_CLIENTS = int(os.environ.get('RATE_LIMIT_MAX_CLIENTS', 100000))
+    RATE_LIMIT_IDLE_TTL = float(os.environ.get('RATE_LIMIT_IDLE_TTL', 60.0))
+
+    # Graceful shutdown on SIGTERM: /ready fails at once, requests are still
+    # served for SHUTDOWN_GRACE_PERIOD seconds while endpoints are updated,
+    # then new ones are refused and in-flight ones get SHUTDOWN_DRAIN_TIMEOUT
+    # more seconds to finish. Keep the pod's terminationGracePeriodSeconds above the sum.
+    SHUTDOWN_GRACE_PERIOD = float(os.environ.get('SHUTDOWN_GRACE_PERIOD', 5.0))
+    SHUTDOWN_DRAIN_TIMEOUT = float(os.environ.get('SHUTDOWN_DRAIN_TIMEOUT', 20.0))
+
+    # On-demand request profiling; hooks and /debug/profiles exist only when enabled.
+    # A request is profiled when it sends X-Profile-Token, or at PROFILING_SAMPLE_RATE
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'false').lower() == 'true'
+    PROFILING_TOKEN = os.environ.get('PROFILING_TOKEN', '')
+    PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', 0.0))
+    PROFILING_MAX_PROFILES = int(os.environ.get('PROFILING_MAX_PROFILES', 20))
+
     @classmethod
     def get_config_dict(cls) -> Dict[str, Any]:
         """Return configuration as dictionary for logging."""
@@ -34,6 +217,7 @@ class Config:
             'app_version': cls.APP_VERSION,
             'flask_env': cls.FLASK_ENV,
             'log_level': cls.LOG_LEVEL,
+            'concurrency_mode': cls.CONCURRENCY_MODE,
             'deployment_method': cls.DEPLOYMENT_METHOD,
             'git_commit': cls.GIT_COMMIT,
             'deployment_id': cls.DEPLOYMENT_ID
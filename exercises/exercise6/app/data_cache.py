@@ -0,0 +1,250 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+# Stored for loads that found nothing, so not-found lookups are cached too
+_NOT_FOUND = object()
+
+
+class _Flight:
+    """A load in progress that concurrent callers for the same key wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class ReadThroughCache:
+    """Size-bounded LRU cache with per-entry TTL and single-flight loading.
+
+    ``get(key, load)`` returns the cached value or calls ``load()`` once,
+    however many threads miss on the same key at the same time; the others
+    wait for that result. A ``None`` result is cached for ``negative_ttl``
+    seconds. Errors are passed to every waiter and not cached.
+
+    Keys are tuples whose first element names the operation, used as the
+    ``operation`` label on the optional metrics: ``hits``/``misses``
+    counters (hit ratio = hits / (hits + misses)), ``coalesced`` for
+    callers that waited on another caller's load, ``load_duration``
+    histogram, ``evictions`` counter (labelled by reason as well) and
+    ``entries`` gauge.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 30.0, negative_ttl: float = 5.0,
+                 hits=None, misses=None, coalesced=None, load_duration=None,
+                 evictions=None, entries=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self._flights: Dict[Hashable, _Flight] = {}
+        # Bumped by invalidate() so loads that started before it are not stored
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._hits = hits
+        self._misses = misses
+        self._coalesced = coalesced
+        self._load_duration = load_duration
+        self._evictions = evictions
+        self._entries_gauge = entries
+
+    def get(self, key: Tuple, load: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """Return the value for key, loading and caching it on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self._count(self._hits, key)
+                    return None if entry[1] is _NOT_FOUND else entry[1]
+                del self._entries[key]
+                self._evicted(key, 'expired')
+
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                generation = self._generation
+
+        if not leader:
+            self._count(self._coalesced, key)
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        self._count(self._misses, key)
+        start = time.perf_counter()
+        try:
+            flight.value = load()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            if self._load_duration is not None:
+                self._load_duration.labels(operation=key[0]).observe(time.perf_counter() - start)
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                if flight.error is None and generation == self._generation:
+                    self._store(key, flight.value, ttl)
+            flight.done.set()
+        return flight.value
+
+    def get_many(self, keys: List[Tuple], load: Callable[[List[Tuple]], Dict[Tuple, Any]],
+                 ttl: Optional[float] = None) -> Dict[Tuple, Any]:
+        """Return the values for keys, loading all the missing ones with one call.
+
+        ``load(missing)`` returns the values it found, by key; keys it leaves
+        out are cached as not found. Unlike ``get()`` the load is not
+        single-flight: concurrent batches missing the same key each load it.
+        """
+        now = time.monotonic()
+        values: Dict[Tuple, Any] = {}
+        missing: List[Tuple] = []
+        with self._lock:
+            generation = self._generation
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    if entry[0] > now:
+                        self._entries.move_to_end(key)
+                        self._count(self._hits, key)
+                        values[key] = None if entry[1] is _NOT_FOUND else entry[1]
+                        continue
+                    del self._entries[key]
+                    self._evicted(key, 'expired')
+                missing.append(key)
+
+        if not missing:
+            return values
+        for key in missing:
+            self._count(self._misses, key)
+        start = time.perf_counter()
+        try:
+            loaded = load(missing)
+        finally:
+            if self._load_duration is not None:
+                self._load_duration.labels(operation=missing[0][0]).observe(
+                    time.perf_counter() - start
+                )
+        with self._lock:
+            for key in missing:
+                values[key] = loaded.get(key)
+                if generation == self._generation:
+                    self._store(key, values[key], ttl)
+        return values
+
+    def _store(self, key: Tuple, value: Any, ttl: Optional[float]) -> None:
+        if value is None:
+            value, ttl = _NOT_FOUND, self.negative_ttl
+        elif ttl is None:
+            ttl = self.ttl
+        if ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            evicted_key, _ = self._entries.popitem(last=False)
+            self._evicted(evicted_key, 'size')
+        if self._entries_gauge is not None:
+            self._entries_gauge.set(len(self._entries))
+
+    def _evicted(self, key: Tuple, reason: str) -> None:
+        if self._evictions is not None:
+            self._evictions.labels(operation=key[0], reason=reason).inc()
+
+    @staticmethod
+    def _count(counter, key: Tuple) -> None:
+        if counter is not None:
+            counter.labels(operation=key[0]).inc()
+
+    def invalidate(self, key: Optional[Tuple] = None) -> None:
+        """Drop one key, or every entry if key is None."""
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._entries.clear()
+                self._flights.clear()
+            else:
+                self._entries.pop(key, None)
+                self._flights.pop(key, None)
+            if self._entries_gauge is not None:
+                self._entries_gauge.set(len(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CachedStoreRepository:
+    """Store repository wrapper that serves reads through a ReadThroughCache.
+
+    Exposes the same interface as StoreCatalog and SQLiteStoreRepository.
+    Writes made through it clear the cache; writes made elsewhere (another
+    worker process, say) become visible once the cached entries expire.
+    """
+
+    def __init__(self, repository, cache: ReadThroughCache):
+        self.repository = repository
+        self.cache = cache
+
+    @property
+    def version(self) -> int:
+        return self.cache.get(('version',), lambda: self.repository.version)
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def count(self, location: Optional[str] = None) -> int:
+        return self.cache.get(('count', location), lambda: self.repository.count(location))
+
+    def all_stores(self) -> List[Dict[str, Any]]:
+        return self.cache.get(('list', None), self.repository.all_stores)
+
+    def stores_in_location(self, location: str) -> List[Dict[str, Any]]:
+        return self.cache.get(('list', location),
+                              lambda: self.repository.stores_in_location(location))
+
+    def get_store(self, store_id: int) -> Optional[Dict[str, Any]]:
+        return self.cache.get(('get_store', store_id), lambda: self.repository.get_store(store_id))
+
+    def get_many(self, store_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """Return the existing stores by id; cache misses are loaded in one query."""
+        def load(missing):
+            found = self.repository.get_many([key[1] for key in missing])
+            return {('get_store', store_id): store for store_id, store in found.items()}
+
+        values = self.cache.get_many([('get_store', i) for i in dict.fromkeys(store_ids)], load)
+        return {key[1]: store for key, store in values.items() if store is not None}
+
+    def get_item(self, store_id: int, item_id: int) -> Optional[Dict[str, Any]]:
+        return self.cache.get(('get_item', store_id, item_id),
+                              lambda: self.repository.get_item(store_id, item_id))
+
+    def page(self, after: Optional[int] = None, limit: int = 100,
+             location: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self.cache.get(('page', after, limit, location),
+                              lambda: self.repository.page(after, limit, location))
+
+    def iter_stores(self, location: Optional[str] = None,
+                    chunk_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """Yield stores in id order, one cached page per chunk."""
+        after = None
+        while True:
+            chunk = self.page(after, chunk_size, location)
+            yield from chunk
+            if len(chunk) < chunk_size:
+                return
+            after = chunk[-1]['id']
+
+    def add_store(self, store: Dict[str, Any]) -> None:
+        self.repository.add_store(store)
+        self.cache.invalidate()
+
+    def remove_store(self, store_id: int) -> bool:
+        removed = self.repository.remove_store(store_id)
+        self.cache.invalidate()
+        return removed
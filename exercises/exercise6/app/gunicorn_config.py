@@ -0,0 +1,143 @@
+"""
+Gunicorn configuration driven by app.config.Config.
+
+Usage:
+    gunicorn --config python:app.gunicorn_config app.main:app
+
+Every setting can be overridden through the environment variables read by
+Config, so the same image can be tuned per deployment.
+"""
+
+import math
+import os
+import shutil
+import signal
+import threading
+
+from app.config import Config
+
+if Config.METRICS_MULTIPROCESS:
+    # Set before the app (and prometheus_client) is imported by the master or
+    # workers, and start from an empty directory so a previous run's values
+    # don't leak in. This runs before preload_app imports the application.
+    os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', Config.METRICS_MULTIPROC_DIR)
+    shutil.rmtree(os.environ['PROMETHEUS_MULTIPROC_DIR'], ignore_errors=True)
+    os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+
+def cpu_quota() -> float:
+    """Return the number of CPUs this container may use.
+
+    Reads the cgroup v2 or v1 CFS quota so a pod limited to 500m is not
+    sized by the node's full core count. Falls back to the visible CPUs.
+    """
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()
+        if quota != 'max':
+            return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+
+    try:
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us') as f:
+            quota = int(f.read())
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us') as f:
+            period = int(f.read())
+        if quota > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+
+    if hasattr(os, 'sched_getaffinity'):
+        return float(len(os.sched_getaffinity(0)))
+    return float(os.cpu_count() or 1)
+
+
+def default_workers() -> int:
+    """Classic (2 x CPUs) + 1, using the container's CPU quota rather than the node's."""
+    return 2 * max(1, math.ceil(cpu_quota())) + 1
+
+
+bind = f"{Config.HOST}:{Config.PORT}"
+
+# gthread keeps a small thread pool per worker (stamping when each request
+# was queued, for admission control); gevent runs greenlets instead
+worker_class = (
+    'gevent' if Config.CONCURRENCY_MODE == 'gevent'
+    else 'app.gunicorn_worker.QueueTimedThreadWorker'
+)
+workers = Config.WORKERS or default_workers()
+threads = Config.THREADS
+worker_connections = Config.WORKER_CONNECTIONS
+
+# Keep idle connections open longer than the upstream proxy so it never
+# reuses a socket the worker is about to close
+keepalive = Config.KEEPALIVE
+
+# Recycle workers periodically; jitter stops them all restarting at once
+max_requests = Config.MAX_REQUESTS
+max_requests_jitter = Config.MAX_REQUESTS_JITTER
+
+# Import the app once in the master so workers fork with it already loaded
+preload_app = Config.PRELOAD_APP
+
+timeout = Config.WORKER_TIMEOUT
+# Workers keep serving through the shutdown grace period, then drain; the
+# master must not kill them before that is over
+graceful_timeout = max(
+    Config.GRACEFUL_TIMEOUT,
+    math.ceil(Config.SHUTDOWN_GRACE_PERIOD + Config.SHUTDOWN_DRAIN_TIMEOUT) + 1
+)
+
+# Heartbeat files on tmpfs: a slow overlay filesystem can otherwise trip the timeout
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+# Request logging is done by the application itself
+accesslog = None
+errorlog = '-'
+loglevel = Config.LOG_LEVEL.lower()
+
+
+def child_exit(server, worker):
+    """Drop a dead worker's live gauge files so livesum/liveall gauges stay accurate."""
+    if Config.METRICS_MULTIPROCESS:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def post_worker_init(worker):
+    """Start the readiness checks and install the application's SIGTERM drain.
+
+    The checks run once right away, so a new worker's /ready does not
+    report them pending until its first probe.
+
+    gunicorn's own handler stops accepting at once. Instead /ready fails
+    first, the worker keeps serving for the grace period, and only then
+    stops accepting and waits for in-flight requests. A worker still busy
+    at the drain deadline quits rather than waiting for the master's
+    SIGKILL, through gunicorn's normal exit path so worker_exit runs.
+    """
+    from app.probes import readiness_monitor, shutdown
+
+    readiness_monitor.refresh(force=True)
+
+    def stop_accepting():
+        worker.alive = False
+
+    def drain():
+        if shutdown.drain(stop_accepting):
+            # gunicorn's SIGQUIT handler raises SystemExit in the main thread
+            os.kill(os.getpid(), signal.SIGQUIT)
+
+    def handle_term(signum, frame):
+        if shutdown.begin():
+            threading.Thread(target=drain, name='shutdown-drain', daemon=True).start()
+
+    signal.signal(signal.SIGTERM, handle_term)
+
+
+def worker_exit(server, worker):
+    """Record the drain and flush logs when a worker stops for any reason."""
+    from app.probes import shutdown
+    shutdown.finish()
@@ -0,0 +1,26 @@
+import time
+
+from gunicorn.workers.gthread import ThreadWorker
+
+
+class QueueTimedThreadWorker(ThreadWorker):
+    """gthread worker that tells the application when a request was queued.
+
+    gthread hands each readable connection to a fixed thread pool; when
+    every thread is busy, requests wait in the pool's queue where the
+    application cannot see them. The time a request was queued is added
+    as an ``X-Request-Start: t=<epoch seconds>`` header, the convention
+    front-end proxies use, so admission control can shed requests that
+    have already waited too long. A header sent by the client or a proxy
+    is kept; the earliest time is used.
+    """
+
+    def enqueue_req(self, conn):
+        conn.queued_at = time.time()
+        super().enqueue_req(conn)
+
+    def handle_request(self, req, conn):
+        queued_at = getattr(conn, 'queued_at', None)
+        if queued_at is not None:
+            req.headers.append(('X-REQUEST-START', f't={queued_at:.6f}'))
+        return super().handle_request(req, conn)
@@ -0,0 +1,95 @@
+import threading
+from typing import Callable, Dict, Iterable, Tuple
+
+OVERFLOW_VALUE = 'other'
+
+
+class LabelGuard:
+    """Caps the number of distinct values a metric label may take.
+
+    Values seen before (or declared known up front) pass through. New
+    values are admitted until ``limit`` distinct values exist; after that
+    they are folded into ``other`` and counted on the overflow counter.
+    """
+
+    def __init__(self, metric: str, label: str, limit: int, known: Iterable[str] = (),
+                 overflow_counter=None):
+        self.metric = metric
+        self.label = label
+        self.limit = limit
+        self._values = set(known)
+        self._lock = threading.Lock()
+        self._overflow = (
+            overflow_counter.labels(metric=metric, label=label)
+            if overflow_counter is not None else None
+        )
+
+    def __call__(self, value: str) -> str:
+        if value in self._values:
+            return value
+        with self._lock:
+            if value in self._values:
+                return value
+            if len(self._values) < self.limit:
+                self._values.add(value)
+                return value
+        if self._overflow is not None:
+            self._overflow.inc()
+        return OVERFLOW_VALUE
+
+
+class RequestMetrics:
+    """Request count/duration recording with pre-resolved label children.
+
+    ``labels()`` takes a lock and does a dict lookup on every call; here the
+    children for each (method, endpoint, status) combination are resolved
+    once and reused. Label values pass through LabelGuards so unbounded
+    input (scanners, odd methods, unusual status codes) cannot create an
+    unbounded number of series. Combinations that had a value folded into
+    ``other`` are not cached, so the cache itself stays bounded too.
+    """
+
+    def __init__(self, request_count, request_duration, endpoint_group: Callable[[str], str],
+                 max_endpoints=64, max_methods=10, max_status_codes=20, overflow_counter=None):
+        self.request_count = request_count
+        self.request_duration = request_duration
+        self.endpoint_group = endpoint_group
+        self._children: Dict[Tuple[str, str, int], Tuple] = {}
+        self._guards = {
+            'method': LabelGuard('http_requests_total', 'method', max_methods,
+                                 overflow_counter=overflow_counter),
+            'endpoint': LabelGuard('http_requests_total', 'endpoint', max_endpoints,
+                                   overflow_counter=overflow_counter),
+            'status_code': LabelGuard('http_requests_total', 'status_code', max_status_codes,
+                                      overflow_counter=overflow_counter),
+        }
+
+    def prepare(self, series: Iterable[Tuple[str, str, int]]) -> None:
+        """Pre-create children for known (method, endpoint, status code) series."""
+        for method, endpoint, status_code in series:
+            self._resolve(method, endpoint, status_code)
+
+    def observe(self, method: str, endpoint: str, status_code: int, duration: float) -> None:
+        """Count a finished request and record its duration."""
+        children = self._children.get((method, endpoint, status_code))
+        if children is None:
+            children = self._resolve(method, endpoint, status_code)
+        children[0].inc()
+        children[1].observe(duration)
+
+    def _resolve(self, method: str, endpoint: str, status_code: int):
+        safe_method = self._guards['method'](method)
+        safe_endpoint = self._guards['endpoint'](endpoint)
+        safe_status = self._guards['status_code'](str(status_code))
+
+        children = (
+            self.request_count.labels(
+                method=safe_method, endpoint=safe_endpoint, status_code=safe_status
+            ),
+            self.request_duration.labels(
+                self.endpoint_group(safe_endpoint), method=safe_method, endpoint=safe_endpoint
+            ),
+        )
+        if OVERFLOW_VALUE not in (safe_method, safe_endpoint, safe_status):
+            self._children[(method, endpoint, status_code)] = children
+        return children
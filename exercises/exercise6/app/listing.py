@@ -0,0 +1,81 @@
+import base64
+
+from app.config import Config
+
+# Argument handling for the /stores listing and batch lookup, shared by the WSGI and ASGI builds
+
+# Fields a /stores?fields= projection may select; id is always included
+STORE_FIELDS = ('id', 'name', 'location', 'items')
+
+# Store ids are SQLite INTEGERs: 64-bit signed
+STORE_ID_MIN, STORE_ID_MAX = -2 ** 63, 2 ** 63 - 1
+
+def encode_cursor(store_id):
+    """Opaque cursor pointing after the given store id."""
+    return base64.urlsafe_b64encode(str(store_id).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """Return the store id a cursor points after. Raises ValueError if invalid."""
+    try:
+        store_id = int(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid cursor {cursor!r}") from None
+    if not STORE_ID_MIN <= store_id <= STORE_ID_MAX:
+        raise ValueError(f"Invalid cursor {cursor!r}")
+    return store_id
+
+def parse_fields(value):
+    """Return the projected store fields, or None for whole stores."""
+    if value is None:
+        return None
+    fields = {f.strip() for f in value.split(',') if f.strip()}
+    unknown = fields.difference(STORE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields {', '.join(sorted(unknown))}; "
+                         f"expected a subset of {', '.join(STORE_FIELDS)}")
+    fields.add('id')
+    return tuple(f for f in STORE_FIELDS if f in fields)
+
+def parse_limit(value):
+    """Return the page size, capped at STORES_PAGE_SIZE_MAX."""
+    if value is None:
+        return Config.STORES_PAGE_SIZE_DEFAULT
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError(f"Invalid limit {value!r}") from None
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    return min(limit, Config.STORES_PAGE_SIZE_MAX)
+
+def project(store, fields):
+    """Return a store reduced to the selected fields (all of them if None)."""
+    if fields is None:
+        return store
+    return {f: store[f] for f in fields if f in store}
+
+def parse_store_ids(value):
+    """Return the distinct store ids of a batch request, in request order.
+
+    Takes a comma-separated string (the ``ids`` query argument) or a list
+    (the ``ids`` member of a JSON body). Raises ValueError if an id is not
+    a 64-bit signed integer or more than STORES_BATCH_MAX_SIZE ids are given.
+    """
+    if isinstance(value, str):
+        value = [v for v in value.split(',') if v.strip()]
+    if not isinstance(value, list) or not value:
+        raise ValueError("ids must be a non-empty list of store ids")
+    if len(value) > Config.STORES_BATCH_MAX_SIZE:
+        raise ValueError(f"At most {Config.STORES_BATCH_MAX_SIZE} ids per batch, got {len(value)}")
+    ids = []
+    for v in value:
+        if isinstance(v, bool) or not isinstance(v, (int, str)):
+            raise ValueError(f"Invalid store id {v!r}")
+        try:
+            store_id = int(v)
+        except ValueError:
+            raise ValueError(f"Invalid store id {v!r}") from None
+        if not STORE_ID_MIN <= store_id <= STORE_ID_MAX:
+            raise ValueError(f"Store id {v!r} is out of range")
+        ids.append(store_id)
+    return list(dict.fromkeys(ids))
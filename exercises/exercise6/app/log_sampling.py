@@ -0,0 +1,29 @@
+import random
+
+
+class RequestLogSampler:
+    """Head-and-tail sampling decision for per-request log lines.
+
+    A request is sampled once when it starts. Its log lines are kept if it
+    was sampled, or if it turns out to be interesting: any 4xx/5xx status
+    or a duration at or above ``slow_threshold`` seconds. Lines that are
+    dropped are counted on ``suppressed_counter``.
+    """
+
+    def __init__(self, sample_rate=1.0, slow_threshold=0.5, suppressed_counter=None):
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+        self.suppressed_counter = suppressed_counter
+
+    def sample(self) -> bool:
+        """Make the up-front sampling decision for a new request."""
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def keep(self, sampled: bool, status_code: int, duration: float) -> bool:
+        """Decide whether a finished request's log lines are written."""
+        return sampled or status_code >= 400 or duration >= self.slow_threshold
+
+    def suppress(self, lines: int = 1) -> None:
+        """Record log lines dropped by sampling."""
+        if self.suppressed_counter is not None:
+            self.suppressed_counter.inc(lines)
@@ -0,0 +1,58 @@
+import logging
+
+import structlog
+
+from app.config import Config
+from app.metrics import LOG_RECORDS_DROPPED, LOG_RECORDS_QUEUED
+from sre_common.serialization import structlog_serializer
+from sre_common.async_logging import AsyncLogHandler
+
+# structlog and root handler configuration shared by the WSGI and ASGI
+# builds; importing this module applies it.
+
+# Final renderer for structured log events
+LOG_RENDERER = (
+    structlog.processors.JSONRenderer(serializer=structlog_serializer(Config.JSON_SERIALIZER))
+    if Config.LOG_FORMAT == 'json'
+    else structlog.dev.ConsoleRenderer()
+)
+
+# Configure structured logging
+structlog.configure(
+    processors=[
+        structlog.stdlib.filter_by_level,
+        structlog.stdlib.add_logger_name,
+        structlog.stdlib.add_log_level,
+        structlog.stdlib.PositionalArgumentsFormatter(),
+        structlog.processors.TimeStamper(fmt="iso"),
+        structlog.processors.StackInfoRenderer(),
+        structlog.processors.format_exc_info,
+        structlog.processors.UnicodeDecoder(),
+        # In async mode rendering is deferred to the log writer thread
+        structlog.stdlib.ProcessorFormatter.wrap_for_formatter if Config.LOG_ASYNC
+        else LOG_RENDERER
+    ],
+    context_class=dict,
+    logger_factory=structlog.stdlib.LoggerFactory(),
+    wrapper_class=structlog.stdlib.BoundLogger,
+    cache_logger_on_first_use=True,
+)
+
+if Config.LOG_ASYNC:
+    # Request threads only enqueue; a writer thread renders and writes in batches
+    log_handler = AsyncLogHandler(
+        max_queue=Config.LOG_QUEUE_SIZE,
+        policy=Config.LOG_QUEUE_POLICY,
+        batch_size=Config.LOG_BATCH_SIZE,
+        queued_counter=LOG_RECORDS_QUEUED,
+        dropped_counter=LOG_RECORDS_DROPPED
+    )
+    log_handler.setFormatter(structlog.stdlib.ProcessorFormatter(
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            LOG_RENDERER
+        ]
+    ))
+    root_logger = logging.getLogger()
+    root_logger.handlers = [log_handler]
+    root_logger.setLevel(Config.LOG_LEVEL)
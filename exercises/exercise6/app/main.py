@@ -1,362 +1,232 @@
-import time
-import random
-import structlog
-from flask import Flask, jsonify, request
-from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
 from app.config import Config
 
-# Configure structured logging
-structlog.configure(
-    processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer() if Config.LOG_FORMAT == 'json'
-        else structlog.dev.ConsoleRenderer()
-    ],
-    context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
-    cache_logger_on_first_use=True,
-)
+if Config.CONCURRENCY_MODE == 'gevent':
+    # Must run before anything else imports socket/threading/time
+    from gevent import monkey
+    monkey.patch_all()
+
+import functools
+import time
+import structlog
+from flask import Flask, abort, jsonify, request
+from app import log_setup  # noqa: F401 - configures structlog and the log handler
+from app import views
+from app.metrics import request_metrics
+from app.probes import readiness_monitor, shutdown
+from sre_common.serialization import json_provider_class
+from app.profiling import RequestProfiler, to_collapsed, to_pstats, to_text
 
 logger = structlog.get_logger()
 
 # Initialize Flask application
 app = Flask(__name__)
 app.config.from_object(Config)
+app.json = json_provider_class(Config.JSON_SERIALIZER)(app)
+
+# On-demand profiling. Registered ahead of the other hooks so the profile
+# spans them (after_request hooks run in reverse order); nothing is
+# installed when disabled.
+if Config.PROFILING_ENABLED:
+    profiler = RequestProfiler(
+        max_profiles=Config.PROFILING_MAX_PROFILES,
+        sample_rate=Config.PROFILING_SAMPLE_RATE,
+        token=Config.PROFILING_TOKEN
+    )
 
-# Prometheus metrics for SRE monitoring
-REQUEST_COUNT = Counter(
-    'http_requests_total',
-    'Total number of HTTP requests',
-    ['method', 'endpoint', 'status_code']
-)
-
-REQUEST_DURATION = Histogram(
-    'http_request_duration_seconds',
-    'HTTP request duration in seconds',
-    ['method', 'endpoint']
-)
-
-ACTIVE_CONNECTIONS = Gauge(
-    'active_connections_current',
-    'Current number of active connections'
-)
-
-BUSINESS_METRICS = Counter(
-    'business_operations_total',
-    'Total business operations',
-    ['operation_type', 'status']
-)
-
-APPLICATION_INFO = Gauge(
-    'application_info',
-    'Application information',
-    ['app_name', 'version', 'environment', 'deployment_method']
-)
-
-# Deployment-specific metrics for GitOps monitoring
-DEPLOYMENT_INFO = Gauge(
-    'deployment_info',
-    'Deployment information',
-    ['deployment_id', 'git_commit', 'deployment_strategy']
-)
-
-# Set application info metric with GitOps information
-APPLICATION_INFO.labels(
-    app_name=Config.APP_NAME,
-    version=Config.APP_VERSION,
-    environment=Config.FLASK_ENV,
-    deployment_method='gitops'
-).set(1)
-
-# Set deployment info (would be populated by CI/CD pipeline)
-DEPLOYMENT_INFO.labels(
-    deployment_id='gitops-' + str(int(time.time())),
-    git_commit='latest',
-    deployment_strategy='rolling'
-).set(1)
-
-# Sample business data
-stores = [
-    {
-        "id": 1,
-        "name": "Cloud SRE Store",
-        "location": "us-central1",
-        "items": [
-            {"id": 1, "name": "Kubernetes Cluster", "price": 299.99, "stock": 5},
-            {"id": 2, "name": "Prometheus Monitoring", "price": 49.99, "stock": 15},
-            {"id": 3, "name": "GitOps Pipeline", "price": 199.99, "stock": 8}
-        ]
-    },
-    {
-        "id": 2,
-        "name": "DevOps Essentials",
-        "location": "europe-west1",
-        "items": [
-            {"id": 4, "name": "CI/CD Pipeline", "price": 199.99, "stock": 3},
-            {"id": 5, "name": "Infrastructure as Code", "price": 149.99, "stock": 7},
-            {"id": 6, "name": "ArgoCD Deployment", "price": 99.99, "stock": 12}
-        ]
-    }
-]
+    @app.before_request
+    def start_profile():
+        """Start profiling requests that ask for it or are sampled."""
+        if request.path.startswith('/debug/profiles'):
+            return
+        if profiler.wanted(request.headers.get('X-Profile-Token')):
+            request.profile = profiler.start()
+            request.profile_start = time.time()
+
+    @app.after_request
+    def finish_profile(response):
+        """Store the request's profile and point to it in a response header."""
+        profile = getattr(request, 'profile', None)
+        if profile is not None:
+            request.profile = None
+            profile_id = profiler.finish(
+                profile,
+                method=request.method,
+                path=request.full_path.rstrip('?'),
+                endpoint=request.endpoint or 'unknown',
+                status_code=response.status_code,
+                duration_seconds=round(time.time() - request.profile_start, 6)
+            )
+            response.headers['X-Profile-Id'] = str(profile_id)
+            logger.info("Request profiled", profile_id=profile_id, path=request.path,
+                        deployment_method="gitops")
+        return response
+
+    @app.teardown_request
+    def abandon_profile(error=None):
+        """Stop a profile whose request failed before after_request ran."""
+        profile = getattr(request, 'profile', None)
+        if profile is not None:
+            profile.disable()
+
+    def require_profile_token():
+        token = request.headers.get('X-Profile-Token') or request.args.get('token')
+        if not profiler.authorized(token):
+            abort(404)
+
+    @app.route('/debug/profiles')
+    def list_profiles():
+        """List captured request profiles, newest first."""
+        require_profile_token()
+        return jsonify({"profiles": profiler.list()})
+
+    @app.route('/debug/profiles/<int:profile_id>')
+    def download_profile(profile_id):
+        """Download a profile as pstats (default), collapsed stacks or text."""
+        require_profile_token()
+        stored = profiler.get(profile_id)
+        if stored is None:
+            abort(404)
+
+        fmt = request.args.get('format', 'pstats')
+        if fmt == 'pstats':
+            return app.response_class(
+                to_pstats(stored['stats']), mimetype='application/octet-stream',
+                headers={'Content-Disposition': f'attachment; filename=profile-{profile_id}.pstats'}
+            )
+        if fmt == 'collapsed':
+            return app.response_class(to_collapsed(stored['stats']), mimetype='text/plain')
+        if fmt == 'text':
+            return app.response_class(to_text(stored['stats']), mimetype='text/plain')
+        return jsonify({"error": f"Unknown format {fmt!r}; expected pstats, collapsed or text"}), 400
+
+def respond(response):
+    """Flask response for a shared view's Response."""
+    body = response.body if response.chunks is None else response.chunks
+    return app.response_class(body, status=response.status, headers=response.headers)
 
 @app.before_request
 def before_request():
     """Log request start and update connection metrics."""
-    ACTIVE_CONNECTIONS.inc()
-    request.start_time = time.time()
+    views.start_request(request)
 
-    logger.info(
-        "Request started",
-        method=request.method,
-        path=request.path,
-        remote_addr=request.remote_addr,
-        user_agent=request.user_agent.string[:100] if request.user_agent else None,
-        deployment_method="gitops"
-    )
+    # Past the shutdown grace period new work is turned away while in-flight requests finish
+    if not shutdown.accepting():
+        return respond(views.refuse_request(request))
 
-@app.after_request
-def after_request(response):
-    """Log request completion and update metrics."""
-    ACTIVE_CONNECTIONS.dec()
-
-    duration = time.time() - request.start_time
-    endpoint = request.endpoint or 'unknown'
-
-    # Update Prometheus metrics
-    REQUEST_COUNT.labels(
-        method=request.method,
-        endpoint=endpoint,
-        status_code=response.status_code
-    ).inc()
+    # Unrouted requests go straight to the 404 handler
+    if request.endpoint is not None:
+        rejection = views.admit(request)
+        if rejection is not None:
+            return respond(rejection)
 
-    REQUEST_DURATION.labels(
-        method=request.method,
-        endpoint=endpoint
-    ).observe(duration)
+@app.teardown_request
+def release_unclosed_request(error=None):
+    """Release a request whose response never reached after_request.
 
-    # Log request completion
-    logger.info(
-        "Request completed",
-        method=request.method,
-        endpoint=endpoint,
-        status_code=response.status_code,
-        duration_seconds=round(duration, 3),
-        deployment_method="gitops"
-    )
+    Views return before a streamed body is sent, so normally the release
+    waits for the server to close the response (see after_request).
+    """
+    if not getattr(request, 'release_on_close', False):
+        views.release_request(getattr(request, 'admitted', False),
+                              getattr(request, 'queued_at', request.start_time))
 
+@app.after_request
+def after_request(response):
+    """Log request completion and update metrics."""
+    # Held until the server closes the response, after any streamed body
+    response.call_on_close(functools.partial(
+        views.release_request, getattr(request, 'admitted', False),
+        getattr(request, 'queued_at', request.start_time)
+    ))
+    request.release_on_close = True
+
+    views.finish_request(request, response.status_code)
     return response
 
+# Registered after after_request so it runs first and the request duration
+# metric includes compression time
+if Config.COMPRESSION_ENABLED:
+    @app.after_request
+    def compress_response(response):
+        """Compress eligible responses that were not served precompressed."""
+        if (response.direct_passthrough or response.is_streamed
+                or not views.compressible(response.status_code, response.mimetype, response.headers)):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        data, encoding = views.compress_body(request, response.get_data())
+        if encoding is not None:
+            response.set_data(data)
+            response.headers['Content-Encoding'] = encoding
+        return response
+
 @app.route('/')
 def home():
-    """Home endpoint with GitOps deployment info."""
-    BUSINESS_METRICS.labels(operation_type='health_check', status='success').inc()
-
-    return jsonify({
-        "message": f"Welcome to {Config.APP_NAME}!",
-        "status": "healthy",
-        "version": Config.APP_VERSION,
-        "environment": Config.FLASK_ENV,
-        "deployment_method": "GitOps with ArgoCD",
-        "timestamp": time.time(),
-        "features": [
-            "Automated deployments",
-            "SLO-based rollbacks",
-            "Blue-green deployment ready",
-            "Continuous monitoring"
-        ]
-    })
+    return respond(views.home())
 
 @app.route('/stores')
 def get_stores():
-    """Get all stores with simulated processing time and error rate."""
+    """Get stores; see views.list_stores for the arguments."""
+    try:
+        listing = views.listing_arguments(request)
+    except ValueError as exc:
+        return respond(views.invalid_request('store_fetch', "Invalid store listing request", exc))
 
     # Simulate processing time
-    processing_time = random.uniform(0.1, 0.8)
-    time.sleep(processing_time)
-
-    # Simulate occasional errors for SRE testing (5% error rate)
-    if random.random() < 0.05:
-        BUSINESS_METRICS.labels(operation_type='store_fetch', status='error').inc()
-        logger.error(
-            "Store service temporarily unavailable",
-            processing_time=processing_time,
-            error_type='service_unavailable',
-            deployment_method="gitops"
-        )
-        return jsonify({
-            "error": "Store service temporarily unavailable",
-            "retry_after": 30,
-            "deployment_info": {
-                "method": "gitops",
-                "version": Config.APP_VERSION
-            }
-        }), 503
-
-    # Successful response
-    BUSINESS_METRICS.labels(operation_type='store_fetch', status='success').inc()
-    logger.info(
-        "Stores retrieved successfully",
-        store_count=len(stores),
-        processing_time=processing_time,
-        deployment_method="gitops"
-    )
+    processing_time = views.simulated_latency()
+    if processing_time:
+        time.sleep(processing_time)
 
-    return jsonify({
-        "stores": stores,
-        "total_stores": len(stores),
-        "processing_time": round(processing_time, 3),
-        "deployment_info": {
-            "method": "gitops",
-            "version": Config.APP_VERSION,
-            "environment": Config.FLASK_ENV
-        }
-    })
+    return respond(views.list_stores(request, *listing, processing_time))
 
 @app.route('/stores/<int:store_id>')
 def get_store(store_id):
-    """Get specific store by ID."""
-
-    store = next((s for s in stores if s['id'] == store_id), None)
-
-    if not store:
-        BUSINESS_METRICS.labels(operation_type='store_lookup', status='not_found').inc()
-        logger.warning("Store not found", store_id=store_id, deployment_method="gitops")
-        return jsonify({
-            "error": f"Store {store_id} not found",
-            "deployment_info": {
-                "method": "gitops",
-                "version": Config.APP_VERSION
-            }
-        }), 404
-
-    BUSINESS_METRICS.labels(operation_type='store_lookup', status='success').inc()
-    logger.info("Store retrieved", store_id=store_id, store_name=store['name'], deployment_method="gitops")
-
-    return jsonify({
-        **store,
-        "deployment_info": {
-            "method": "gitops",
-            "version": Config.APP_VERSION,
-            "environment": Config.FLASK_ENV
-        }
-    })
+    return respond(views.get_store(request, store_id))
+
+@app.route('/stores/batch', methods=['GET', 'POST'])
+def get_stores_batch():
+    body = request.get_json(silent=True) if request.method == 'POST' else None
+    return respond(views.get_stores_batch(request, body))
+
+@app.route('/stores/<int:store_id>/items/<int:item_id>')
+def get_store_item(store_id, item_id):
+    return respond(views.get_store_item(store_id, item_id))
 
 @app.route('/health')
 def health():
-    """Kubernetes liveness probe endpoint with deployment info."""
-
-    # Perform basic health checks
-    health_status = {
-        "status": "healthy",
-        "timestamp": time.time(),
-        "version": Config.APP_VERSION,
-        "deployment_method": "gitops",
-        "checks": {
-            "application": "ok",
-            "memory": "ok",
-            "disk": "ok",
-            "gitops_sync": "ok"
-        }
-    }
-
-    logger.info("Health check performed", **health_status)
-    return jsonify(health_status)
+    return respond(views.health())
 
 @app.route('/ready')
 def ready():
-    """Kubernetes readiness probe endpoint with GitOps awareness."""
-
-    # Simulate readiness checks (database connections, external services, etc.)
-    is_ready = random.random() > 0.05  # 95% ready rate
-
-    readiness_status = {
-        "status": "ready" if is_ready else "not ready",
-        "timestamp": time.time(),
-        "deployment_method": "gitops",
-        "checks": {
-            "database": "ok" if is_ready else "connecting",
-            "cache": "ok",
-            "external_api": "ok" if is_ready else "timeout",
-            "argocd_sync": "ok"
-        }
-    }
-
-    status_code = 200 if is_ready else 503
-
-    logger.info(
-        "Readiness check performed",
-        ready=is_ready,
-        deployment_method="gitops",
-        **readiness_status
-    )
-
-    return jsonify(readiness_status), status_code
+    return respond(views.ready())
 
 @app.route('/metrics')
 def metrics():
-    """Prometheus metrics endpoint with GitOps deployment metrics."""
-    logger.debug("Metrics endpoint accessed", deployment_method="gitops")
-    return generate_latest(), 200, {'Content-Type': CONTENT_TYPE_LATEST}
+    return respond(views.metrics())
+
+@app.route('/slo')
+def slo_status():
+    return respond(views.slo_status())
 
 @app.route('/deployment')
 def deployment_info():
-    """Deployment information endpoint for GitOps visibility."""
-    BUSINESS_METRICS.labels(operation_type='deployment_info', status='success').inc()
-
-    deployment_data = {
-        "deployment_method": "gitops",
-        "version": Config.APP_VERSION,
-        "environment": Config.FLASK_ENV,
-        "app_name": Config.APP_NAME,
-        "deployment_timestamp": time.time(),
-        "features": {
-            "automated_rollback": True,
-            "slo_validation": True,
-            "blue_green_ready": True,
-            "monitoring_integration": True
-        },
-        "health": {
-            "status": "healthy",
-            "uptime_seconds": time.time() - (time.time() % 86400)  # Simplified uptime
-        }
-    }
-
-    logger.info("Deployment info requested", **deployment_data)
-    return jsonify(deployment_data)
+    return respond(views.deployment_info())
 
 @app.errorhandler(404)
 def not_found(error):
-    """Handle 404 errors."""
-    BUSINESS_METRICS.labels(operation_type='request', status='not_found').inc()
-    logger.warning("Resource not found", path=request.path, deployment_method="gitops")
-    return jsonify({
-        "error": "Resource not found",
-        "deployment_info": {
-            "method": "gitops",
-            "version": Config.APP_VERSION
-        }
-    }), 404
+    return respond(views.not_found(request))
 
 @app.errorhandler(500)
 def internal_error(error):
-    """Handle 500 errors."""
-    BUSINESS_METRICS.labels(operation_type='request', status='server_error').inc()
-    logger.error("Internal server error", error=str(error), deployment_method="gitops")
-    return jsonify({
-        "error": "Internal server error",
-        "deployment_info": {
-            "method": "gitops",
-            "version": Config.APP_VERSION
-        }
-    }), 500
+    return respond(views.internal_error(error))
+
+# Resolve metric children for every route's status codes up front so the hot
+# path rarely calls labels()
+request_metrics.prepare(views.metric_series(
+    (method, rule.endpoint)
+    for rule in app.url_map.iter_rules()
+    for method in rule.methods - {'HEAD', 'OPTIONS'}
+))
 
 if __name__ == '__main__':
 
@@ -365,13 +235,40 @@ if __name__ == '__main__':
         "Starting GitOps-deployed application",
         **Config.get_config_dict(),
         host=Config.HOST,
-        port=Config.PORT,
-        deployment_method="gitops"
-    )
-
-    # Run the Flask development server
-    app.run(
-        host=Config.HOST,
-        port=Config.PORT,
-        debug=Config.DEBUG
+        port=Config.PORT
     )
+    # Run the checks now so /ready does not report them pending at first
+    readiness_monitor.refresh(force=True)
+
+    if Config.CONCURRENCY_MODE == 'gevent':
+        # Cooperative server: each request is a greenlet, not an OS thread
+        import signal
+
+        import gevent
+        from gevent.pool import Pool
+        from gevent.pywsgi import WSGIServer
+
+        server = WSGIServer(
+            (Config.HOST, Config.PORT),
+            app,
+            spawn=Pool(Config.WORKER_CONNECTIONS),
+            log=None
+        )
+        # Drain on SIGTERM, then stop the server. Signal callbacks run in the
+        # gevent hub, which must not block, so the drain gets its own greenlet
+        def handle_term():
+            if shutdown.begin():
+                gevent.spawn(shutdown.drain_and_stop, server.stop)
+
+        gevent.signal_handler(signal.SIGTERM, handle_term)
+        server.serve_forever()
+    else:
+        import _thread
+
+        # Drain on SIGTERM, then stop the development server as Ctrl-C would
+        shutdown.install(_thread.interrupt_main)
+        app.run(
+            host=Config.HOST,
+            port=Config.PORT,
+            debug=Config.DEBUG
+        )
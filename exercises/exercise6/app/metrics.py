@@ -0,0 +1,308 @@
+import os
+import time
+
+from app.config import Config
+
+if Config.METRICS_MULTIPROCESS:
+    # prometheus_client picks its value backend from this variable at import time
+    os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', Config.METRICS_MULTIPROC_DIR)
+    os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+from prometheus_client import (
+    Counter, Histogram, Gauge, CollectorRegistry, REGISTRY, multiprocess
+)
+
+from app.buckets import GroupedHistogram, resolve_buckets
+from app.instrumentation import RequestMetrics
+from app.slo import SLOCollector, SLOEngine
+
+# Metric definitions shared by the WSGI (app.main) and ASGI (app.asgi) builds,
+# so both export the same series under the same names.
+
+# Prometheus metrics for SRE monitoring
+REQUEST_COUNT = Counter(
+    'http_requests_total',
+    'Total number of HTTP requests',
+    ['method', 'endpoint', 'status_code']
+)
+
+# Bucket layout depends on the endpoint group; all layouts share the SLO boundary
+REQUEST_DURATION = GroupedHistogram(
+    'http_request_duration_seconds',
+    'HTTP request duration in seconds',
+    ['method', 'endpoint'],
+    {
+        group: resolve_buckets(spec, Config.SLO_LATENCY_THRESHOLD)
+        for group, spec in Config.REQUEST_DURATION_BUCKETS.items()
+    }
+)
+
+METRIC_LABEL_OVERFLOW = Counter(
+    'metric_label_overflow_total',
+    'Label values folded into "other" after a metric hit its cardinality limit',
+    ['metric', 'label']
+)
+
+ACTIVE_CONNECTIONS = Gauge(
+    'active_connections_current',
+    'Current number of active connections',
+    multiprocess_mode='livesum'
+)
+
+BUSINESS_METRICS = Counter(
+    'business_operations_total',
+    'Total business operations',
+    ['operation_type', 'status']
+)
+
+# Response cache metrics for pre-encoded catalog views
+RESPONSE_CACHE_HITS = Counter(
+    'response_cache_hits_total',
+    'Catalog responses served from pre-encoded cache',
+    ['view']
+)
+
+RESPONSE_CACHE_MISSES = Counter(
+    'response_cache_misses_total',
+    'Catalog responses that had to be serialized',
+    ['view']
+)
+
+RESPONSE_CACHE_EVICTIONS = Counter(
+    'response_cache_evictions_total',
+    'Pre-encoded catalog responses evicted to stay under the memory cap',
+    ['view']
+)
+
+RESPONSE_CACHE_BYTES = Gauge(
+    'response_cache_size_bytes',
+    'Approximate memory held by pre-encoded catalog responses, keys included',
+    multiprocess_mode='livesum'
+)
+
+# Store repository query latency (SQLite backend only)
+DB_QUERY_DURATION = Histogram(
+    'db_query_duration_seconds',
+    'Store repository query duration in seconds',
+    ['operation'],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+)
+
+# Read-through data cache metrics
+DATA_CACHE_HITS = Counter(
+    'data_cache_hits_total',
+    'Store data reads answered from the read-through cache',
+    ['operation']
+)
+
+DATA_CACHE_MISSES = Counter(
+    'data_cache_misses_total',
+    'Store data reads that loaded from the repository',
+    ['operation']
+)
+
+DATA_CACHE_COALESCED = Counter(
+    'data_cache_coalesced_total',
+    'Store data reads that waited for a concurrent load of the same key',
+    ['operation']
+)
+
+DATA_CACHE_LOAD_DURATION = Histogram(
+    'data_cache_load_duration_seconds',
+    'Time to load a missing entry from the store repository',
+    ['operation'],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+)
+
+DATA_CACHE_EVICTIONS = Counter(
+    'data_cache_evictions_total',
+    'Read-through cache entries evicted for size or expiry',
+    ['operation', 'reason']
+)
+
+DATA_CACHE_ENTRIES = Gauge(
+    'data_cache_entries',
+    'Entries held in the read-through data cache',
+    multiprocess_mode='livesum'
+)
+
+# Response compression metrics
+RESPONSE_COMPRESSION_CPU = Counter(
+    'response_compression_cpu_seconds_total',
+    'Thread CPU time spent compressing response bodies',
+    ['encoding']
+)
+
+RESPONSE_COMPRESSION_INPUT = Counter(
+    'response_compression_input_bytes_total',
+    'Response bytes fed to the compressor',
+    ['encoding']
+)
+
+RESPONSE_COMPRESSION_OUTPUT = Counter(
+    'response_compression_output_bytes_total',
+    'Compressed response bytes produced',
+    ['encoding']
+)
+
+# Readiness check metrics
+READINESS_CHECK_DURATION = Histogram(
+    'readiness_check_duration_seconds',
+    'Readiness dependency check duration in seconds',
+    ['check'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+READINESS_CHECK_FAILURES = Counter(
+    'readiness_check_failures_total',
+    'Readiness dependency checks that failed or timed out',
+    ['check', 'reason']
+)
+
+READINESS_CHECK_UP = Gauge(
+    'readiness_check_up',
+    'Whether the last run of a readiness dependency check passed',
+    ['check'],
+    multiprocess_mode='livemin'
+)
+
+# Admission control (adaptive concurrency limit) metrics
+ADMISSION_CONCURRENCY_LIMIT = Gauge(
+    'admission_concurrency_limit',
+    'Current adaptive limit on concurrently admitted requests',
+    multiprocess_mode='livesum'
+)
+
+ADMISSION_IN_FLIGHT = Gauge(
+    'admission_in_flight_requests',
+    'Requests admitted by the concurrency limiter and still running',
+    multiprocess_mode='livesum'
+)
+
+ADMISSION_SHED = Counter(
+    'admission_shed_requests_total',
+    'Requests rejected with 503 by admission control, by reason (concurrency or queue_time)',
+    ['endpoint', 'reason']
+)
+
+ADMISSION_QUEUE_TIME = Histogram(
+    'admission_queue_time_seconds',
+    'Time requests waited between X-Request-Start and reaching the application',
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+# Per-client rate limiting metrics
+RATE_LIMITED_REQUESTS = Counter(
+    'rate_limited_requests_total',
+    'Total requests rejected with 429 by the per-client rate limit',
+    ['endpoint']
+)
+
+RATE_LIMIT_CLIENTS = Gauge(
+    'rate_limit_tracked_clients',
+    'Per-client token buckets currently held by the rate limiter',
+    multiprocess_mode='livesum'
+)
+
+# Graceful shutdown metrics
+SHUTDOWN_DRAIN_DURATION = Histogram(
+    'shutdown_drain_duration_seconds',
+    'Time from SIGTERM until in-flight requests finished or the drain deadline passed',
+    buckets=(0.5, 1.0, 2.5, 5.0, 7.5, 10.0, 15.0, 20.0, 30.0, 45.0, 60.0)
+)
+
+SHUTDOWN_DROPPED_REQUESTS = Counter(
+    'shutdown_dropped_requests_total',
+    'Requests refused after the shutdown grace period or cut off at the drain deadline',
+    ['reason']
+)
+
+APPLICATION_INFO = Gauge(
+    'application_info',
+    'Application information',
+    ['app_name', 'version', 'environment', 'deployment_method'],
+    multiprocess_mode='max'
+)
+
+# Deployment-specific metrics for GitOps monitoring
+DEPLOYMENT_INFO = Gauge(
+    'deployment_info',
+    'Deployment information',
+    ['deployment_id', 'git_commit', 'deployment_strategy'],
+    multiprocess_mode='max'
+)
+
+# Asynchronous logging pipeline metrics
+LOG_RECORDS_QUEUED = Counter(
+    'log_records_queued_total',
+    'Log records handed to the asynchronous log writer'
+)
+
+LOG_RECORDS_DROPPED = Counter(
+    'log_records_dropped_total',
+    'Log records discarded because the log queue was full'
+)
+
+LOG_LINES_SUPPRESSED = Counter(
+    'log_lines_suppressed_total',
+    'Request log lines dropped by request log sampling'
+)
+
+# Registry served by /metrics: in multiprocess mode, a merged view of every worker's files
+if Config.METRICS_MULTIPROCESS:
+    METRICS_REGISTRY = CollectorRegistry()
+    multiprocess.MultiProcessCollector(METRICS_REGISTRY)
+else:
+    METRICS_REGISTRY = REGISTRY
+
+# Set application info metric with GitOps information
+APPLICATION_INFO.labels(
+    app_name=Config.APP_NAME,
+    version=Config.APP_VERSION,
+    environment=Config.FLASK_ENV,
+    deployment_method='gitops'
+).set(1)
+
+# Set deployment info (would be populated by CI/CD pipeline)
+DEPLOYMENT_INFO.labels(
+    deployment_id='gitops-' + str(int(time.time())),
+    git_commit='latest',
+    deployment_strategy='rolling'
+).set(1)
+
+def endpoint_group(endpoint):
+    """Return the latency-bucket group of an endpoint."""
+    return 'probe' if endpoint in Config.PROBE_ENDPOINTS else 'api'
+
+# Request count/duration with cached label children and bounded cardinality
+request_metrics = RequestMetrics(
+    REQUEST_COUNT,
+    REQUEST_DURATION,
+    endpoint_group,
+    max_endpoints=Config.METRICS_MAX_ENDPOINTS,
+    max_methods=Config.METRICS_MAX_METHODS,
+    max_status_codes=Config.METRICS_MAX_STATUS_CODES,
+    overflow_counter=METRIC_LABEL_OVERFLOW
+)
+
+# In-process SLO evaluation (exercise5/slo-config.yaml targets), exported at /slo
+slo_engine = SLOEngine(
+    availability_target=Config.SLO_AVAILABILITY_TARGET,
+    latency_target=Config.SLO_LATENCY_TARGET,
+    quality_target=Config.SLO_QUALITY_TARGET,
+    latency_threshold=Config.SLO_LATENCY_THRESHOLD,
+    availability_period=Config.SLO_AVAILABILITY_PERIOD,
+    latency_period=Config.SLO_LATENCY_PERIOD,
+    quality_period=Config.SLO_QUALITY_PERIOD
+)
+# The burn-rate gauges only describe this process's requests. In multiprocess
+# mode whichever worker answers the scrape would report them for the whole pod,
+# so they are not exported; compute burn rates from the merged
+# http_requests_total in Prometheus instead (/slo still reports per worker).
+if not Config.METRICS_MULTIPROCESS:
+    METRICS_REGISTRY.register(SLOCollector(slo_engine))
+
+def record_business(operation_type, status, count=1):
+    """Count business operations and feed them to the quality SLO."""
+    BUSINESS_METRICS.labels(operation_type=operation_type, status=status).inc(count)
+    slo_engine.record_business(status == 'success', count)
@@ -0,0 +1,85 @@
+import logging
+import time
+
+from app.config import Config
+from app.data_cache import CachedStoreRepository
+from app.metrics import (
+    READINESS_CHECK_DURATION, READINESS_CHECK_FAILURES, READINESS_CHECK_UP,
+    SHUTDOWN_DRAIN_DURATION, SHUTDOWN_DROPPED_REQUESTS
+)
+from app.shutdown import GracefulShutdown
+from app.store_data import catalog
+from sre_common.checks import CheckMonitor, check_url
+
+# Readiness checks and shutdown draining, shared by the WSGI and ASGI builds
+
+
+def check_database():
+    """Query the store repository directly, bypassing the data cache."""
+    getattr(catalog, 'repository', catalog).count()
+    return 'ok'
+
+
+def check_cache():
+    """Read the catalog version through the read-through cache."""
+    if not isinstance(catalog, CachedStoreRepository):
+        return 'disabled'
+    catalog.version  # loaded from the repository on a cache miss
+    return 'ok'
+
+
+def check_external_api():
+    """Any answer below 500 from READINESS_EXTERNAL_API_URL counts as reachable."""
+    return check_url(Config.READINESS_EXTERNAL_API_URL, Config.READINESS_CHECK_TIMEOUT)
+
+
+readiness_monitor = CheckMonitor(
+    freshness=Config.READINESS_CHECK_FRESHNESS,
+    max_workers=Config.READINESS_MAX_WORKERS,
+    duration=READINESS_CHECK_DURATION,
+    failures=READINESS_CHECK_FAILURES,
+    up=READINESS_CHECK_UP
+)
+readiness_monitor.register('database', check_database, timeout=Config.READINESS_CHECK_TIMEOUT)
+readiness_monitor.register('cache', check_cache, timeout=Config.READINESS_CHECK_TIMEOUT)
+readiness_monitor.register(
+    'external_api', check_external_api, timeout=Config.READINESS_CHECK_TIMEOUT,
+    critical=Config.READINESS_EXTERNAL_API_CRITICAL
+)
+
+
+# Drains in-flight requests on SIGTERM; the servers install the signal handling
+shutdown = GracefulShutdown(
+    grace_period=Config.SHUTDOWN_GRACE_PERIOD,
+    drain_timeout=Config.SHUTDOWN_DRAIN_TIMEOUT,
+    drain_duration=SHUTDOWN_DRAIN_DURATION,
+    dropped=SHUTDOWN_DROPPED_REQUESTS
+)
+shutdown.on_finish(readiness_monitor.shutdown)
+
+
+def flush_logs():
+    """Write out log records still queued by the asynchronous log handler."""
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+
+shutdown.on_finish(flush_logs)
+
+
+def readiness_status():
+    """Return the /ready body and status code from the cached check results."""
+    snapshot = readiness_monitor.snapshot()
+    checks = {**snapshot['checks'], "argocd_sync": "ok"}
+    # A draining process fails readiness at once so it stops receiving traffic
+    is_ready = snapshot['ready'] and not shutdown.draining
+    if shutdown.draining:
+        checks["shutdown"] = "draining"
+    status = {
+        "status": "ready" if is_ready else "not ready",
+        "timestamp": time.time(),
+        "deployment_method": "gitops",
+        "checks": checks,
+        "snapshot_age_seconds": snapshot['snapshot_age_seconds']
+    }
+    return status, 200 if is_ready else 503
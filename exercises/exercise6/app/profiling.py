@@ -0,0 +1,148 @@
+import cProfile
+import hmac
+import io
+import itertools
+import marshal
+import pstats
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+
+class RequestProfiler:
+    """Captures cProfile profiles of individual requests into a bounded ring.
+
+    A request is profiled when it carries the configured token, or with
+    probability ``sample_rate``. cProfile hooks the calling thread only, so
+    with threaded workers a profile covers exactly one request; under gevent
+    it also includes whatever other greenlets ran on the thread meanwhile.
+    Only the newest ``max_profiles`` profiles are kept, per process.
+    """
+
+    def __init__(self, max_profiles: int = 20, sample_rate: float = 0.0, token: str = ''):
+        self.sample_rate = sample_rate
+        self.token = token
+        self._profiles: deque = deque(maxlen=max_profiles)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def wanted(self, token: Optional[str]) -> bool:
+        """Whether a request presenting ``token`` (may be None) should be profiled."""
+        if token and self.authorized(token):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def authorized(self, token: Optional[str]) -> bool:
+        return bool(self.token) and token is not None and hmac.compare_digest(token, self.token)
+
+    def start(self) -> Optional[cProfile.Profile]:
+        """Start profiling the current thread; None if another profiler is active."""
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            return None
+        return profile
+
+    def finish(self, profile: cProfile.Profile, **meta: Any) -> int:
+        """Stop a profile and store it with its request metadata; returns its id."""
+        profile.disable()
+        profile.create_stats()
+        with self._lock:
+            profile_id = next(self._ids)
+            self._profiles.append({
+                'id': profile_id,
+                'timestamp': time.time(),
+                'meta': meta,
+                'stats': profile.stats,
+            })
+        return profile_id
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Stored profiles, newest first, without their stats."""
+        with self._lock:
+            profiles = list(self._profiles)
+        return [
+            {'id': p['id'], 'timestamp': p['timestamp'], **p['meta']}
+            for p in reversed(profiles)
+        ]
+
+    def get(self, profile_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            for p in self._profiles:
+                if p['id'] == profile_id:
+                    return p
+        return None
+
+
+def to_pstats(stats: dict) -> bytes:
+    """Serialize stats in the format pstats.Stats() and snakeviz load from a file."""
+    return marshal.dumps(stats)
+
+
+def to_text(stats: dict, limit: int = 50) -> str:
+    """Top functions by cumulative time, as printed by pstats."""
+    out = io.StringIO()
+    pstats.Stats(_StatsSource(stats), stream=out).sort_stats('cumulative').print_stats(limit)
+    return out.getvalue()
+
+
+def to_collapsed(stats: dict, max_depth: int = 64) -> str:
+    """Render stats as collapsed stacks (``a;b;c <microseconds>``) for flamegraph tools.
+
+    cProfile records caller/callee edges rather than full stacks, so stacks
+    are rebuilt by descending from the root functions and splitting each
+    function's time across its callees in proportion to the edge timings.
+    """
+    callees: Dict[tuple, List[tuple]] = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller in callers:
+            callees.setdefault(caller, []).append(func)
+
+    totals: Dict[str, float] = {}
+
+    def visit(func, path, scale):
+        _, _, tottime, cumtime, _ = stats[func]
+        frame = _frame_name(func)
+        stack = path + (frame,)
+        totals[';'.join(stack)] = totals.get(';'.join(stack), 0.0) + tottime * scale
+        if len(stack) >= max_depth:
+            return
+        for callee in callees.get(func, ()):
+            if _frame_name(callee) in stack:
+                continue  # recursion: its time is already counted higher up
+            edge_cumtime = stats[callee][4][func][3]
+            callee_cumtime = stats[callee][3]
+            # Paths under a microsecond are dropped, which also bounds the walk
+            if callee_cumtime > 0 and edge_cumtime * scale >= 1e-6:
+                share = edge_cumtime * scale / callee_cumtime
+                visit(callee, stack, share)
+
+    for func, (_, _, _, _, callers) in stats.items():
+        if not callers:
+            visit(func, (), 1.0)
+
+    lines = [
+        f"{stack} {round(seconds * 1e6)}"
+        for stack, seconds in totals.items() if round(seconds * 1e6) > 0
+    ]
+    return '\n'.join(sorted(lines)) + '\n'
+
+
+def _frame_name(func: tuple) -> str:
+    filename, line, name = func
+    if filename == '~':
+        return name  # built-in, e.g. <built-in method time.sleep>
+    return f"{name} ({filename.rsplit('/', 1)[-1]}:{line})"
+
+
+class _StatsSource:
+    """Adapter letting pstats.Stats load an already-built stats dict."""
+
+    def __init__(self, stats: dict):
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
@@ -0,0 +1,146 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Mapping, Optional, Tuple
+
+DEFAULT_RULE = 'default'
+
+
+def parse_rule(spec: str) -> Optional[Tuple[float, float]]:
+    """Turn ``'<rate>:<burst>'`` (requests per second, bucket size) into a rule.
+
+    An empty spec or ``'off'`` means no limit. The burst defaults to the
+    rate, or 1 if the rate is below one request per second.
+    """
+    spec = spec.strip()
+    if not spec or spec == 'off':
+        return None
+    rate, _, burst = spec.partition(':')
+    try:
+        rate = float(rate)
+        burst = float(burst) if burst else max(rate, 1.0)
+    except ValueError:
+        raise ValueError(f"Invalid rate limit {spec!r}: expected '<rate>:<burst>' or 'off'") from None
+    if rate <= 0 or burst < 1:
+        raise ValueError(f"Invalid rate limit {spec!r}: rate must be positive and burst at least 1")
+    return rate, burst
+
+
+class RateLimiter:
+    """Per-client token buckets, with a separate rule per endpoint.
+
+    ``rules`` maps endpoint names to ``(rate, burst)``; endpoints without a
+    rule of their own share the ``'default'`` rule's bucket, and those
+    without any rule are not limited. A bucket holds up to ``burst``
+    tokens, refills at ``rate`` tokens per second and each request takes
+    one.
+
+    Buckets live in ``shards`` shards, each behind its own lock, so
+    concurrent requests from different clients rarely contend. Within a
+    shard each rule keeps its buckets in least-recently-used order: buckets
+    idle for ``max(idle_ttl, burst / rate)`` seconds of their rule are
+    dropped as later requests touch the shard. All buckets of a rule share
+    that idle time, so the expired ones are always at the front of their
+    rule's order, whatever the other rules' idle times. A dropped bucket
+    comes back full, and by then it would have refilled to full anyway, so
+    expiry never grants extra requests. Past ``max_entries`` in total the
+    least recently used are evicted regardless, which keeps memory bounded
+    however many distinct clients show up.
+
+    Optional metrics: ``rejected`` counter labelled by endpoint and
+    ``entries`` gauge of buckets held.
+    """
+
+    def __init__(self, rules: Mapping[str, Optional[Tuple[float, float]]], shards: int = 64,
+                 max_entries: int = 100000, idle_ttl: float = 60.0, rejected=None, entries=None):
+        self.rules = {endpoint: rule for endpoint, rule in rules.items() if rule is not None}
+        self.idle_ttl = idle_ttl
+        # Idle time after which a rule's bucket is full again, and may be dropped
+        self._ttls = {endpoint: max(idle_ttl, burst / rate)
+                      for endpoint, (rate, burst) in self.rules.items()}
+        self.max_entries_per_shard = max(1, max_entries // shards)
+        # Per shard: rule name -> that rule's buckets, least recently used first
+        self._shards = [{} for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._rejected = rejected
+        self._entries = entries
+
+    def rule_for(self, endpoint: str) -> Tuple[str, Optional[Tuple[float, float]]]:
+        """Return the name of the rule that applies to endpoint, and the rule."""
+        if endpoint in self.rules:
+            return endpoint, self.rules[endpoint]
+        return DEFAULT_RULE, self.rules.get(DEFAULT_RULE)
+
+    def check(self, client: Hashable, endpoint: str) -> float:
+        """Take a token for client's request to endpoint.
+
+        Returns 0 if the request is allowed, otherwise the seconds until
+        the client's bucket holds a token again.
+        """
+        name, rule = self.rule_for(endpoint)
+        if rule is None:
+            return 0.0
+        rate, burst = rule
+        index = hash((name, client)) % len(self._shards)
+        shard = self._shards[index]
+        now = time.monotonic()
+        added = removed = 0
+
+        with self._locks[index]:
+            buckets = shard.get(name)
+            if buckets is None:
+                buckets = shard[name] = OrderedDict()
+            bucket = buckets.get(client)
+            if bucket is None:
+                bucket = buckets[client] = [burst, now]
+                added = 1
+            else:
+                buckets.move_to_end(client)
+                bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                wait = 0.0
+            else:
+                wait = (1 - bucket[0]) / rate
+            removed = self._expire(shard, now)
+
+        if self._entries is not None and added != removed:
+            self._entries.inc(added - removed)
+        if wait and self._rejected is not None:
+            self._rejected.labels(endpoint=endpoint).inc()
+        return wait
+
+    def _expire(self, shard: Dict[str, 'OrderedDict[Hashable, list]'], now: float) -> int:
+        """Drop idle buckets, then the least recently used over the shard's share of max_entries."""
+        removed = size = 0
+        for name, buckets in shard.items():
+            ttl = self._ttls[name]
+            while buckets and now - next(iter(buckets.values()))[1] >= ttl:
+                buckets.popitem(last=False)
+                removed += 1
+            size += len(buckets)
+        while size > self.max_entries_per_shard:
+            oldest = min((buckets for buckets in shard.values() if buckets),
+                         key=lambda buckets: next(iter(buckets.values()))[1])
+            oldest.popitem(last=False)
+            removed += 1
+            size -= 1
+        return removed
+
+    def __len__(self) -> int:
+        return sum(len(buckets) for shard in self._shards for buckets in shard.values())
+
+
+def client_key(headers: Mapping[str, str], remote_addr: Optional[str], header: str = '') -> str:
+    """Identify the client by ``header`` when configured and sent, else by address.
+
+    The header must be one a trusted proxy sets or overwrites; a client
+    choosing its own key can otherwise spread requests over many buckets.
+    """
+    if header:
+        value = headers.get(header)
+        if value:
+            return value.strip()
+    return remote_addr or 'unknown'
+
@@ -0,0 +1,22 @@
+from typing import Any, Dict, Iterable, Optional
+
+from app.catalog import StoreCatalog
+from sre_common.repository import MEMORY, SQLiteStoreRepository, parse_database_url
+
+__all__ = ['SQLiteStoreRepository', 'create_repository', 'parse_database_url']
+
+
+def create_repository(url: Optional[str], stores: Iterable[Dict[str, Any]] = (),
+                      query_duration=None, pool_size: int = 8):
+    """Build the store repository selected by DATABASE_URL, seeded with stores.
+
+    Both implementations expose the StoreCatalog interface used by the
+    request handlers. A SQLite database that already has stores is not
+    re-seeded. ``pool_size`` bounds each process's SQLite connections.
+    """
+    backend, target = parse_database_url(url)
+    if backend == MEMORY:
+        return StoreCatalog(stores)
+    repository = SQLiteStoreRepository(target, query_duration=query_duration, pool_size=pool_size)
+    repository.seed(stores)
+    return repository
@@ -0,0 +1,99 @@
+import sys
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+
+# Bytes an entry costs besides its key parts and body: the OrderedDict slot
+# and links and the (version, body, size) tuple, rounded up
+ENTRY_OVERHEAD = 200
+
+
+def entry_size(key: Tuple, body: bytes) -> int:
+    """Approximate memory held by a cache entry, key included."""
+    return (ENTRY_OVERHEAD + sys.getsizeof(body) + sys.getsizeof(key)
+            + sum(sys.getsizeof(part) for part in key))
+
+
+class ResponseCache:
+    """Versioned, size-bounded LRU cache of pre-encoded response bodies.
+
+    Entries are stored together with the data version they were encoded
+    from; a lookup with a newer version is treated as a miss and re-encodes.
+    Each entry counts its key and bookkeeping toward ``max_bytes`` as well as
+    its body, so many small entries under request-chosen keys (locations,
+    pagination cursors) stay bounded too; once the total exceeds
+    ``max_bytes`` the least recently used entries are evicted.
+
+    Keys are tuples whose first element names the view, which is used as the
+    ``view`` label on the optional hit/miss/eviction counters.
+    """
+
+    def __init__(self, max_bytes: int, hits=None, misses=None, evictions=None, size=None):
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[Hashable, Tuple[int, bytes, int]]' = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._hits = hits
+        self._misses = misses
+        self._evictions = evictions
+        self._size_gauge = size
+
+    def get(self, key: Tuple, version: int) -> Optional[bytes]:
+        """Return the cached body for key at version, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Tuple, version: int, body: bytes) -> None:
+        """Store a body, evicting least recently used entries if needed."""
+        size = entry_size(key, body)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[2]
+            self._entries[key] = (version, body, size)
+            self._size += size
+
+            while self._size > self.max_bytes:
+                evicted_key, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                if self._evictions is not None:
+                    self._evictions.labels(view=evicted_key[0]).inc()
+
+            if self._size_gauge is not None:
+                self._size_gauge.set(self._size)
+
+    def get_or_encode(self, key: Tuple, version: int, encode: Callable[[], bytes]) -> bytes:
+        """Return the cached body, calling encode() and caching it on a miss."""
+        body = self.get(key, version)
+        if body is not None:
+            if self._hits is not None:
+                self._hits.labels(view=key[0]).inc()
+            return body
+
+        if self._misses is not None:
+            self._misses.labels(view=key[0]).inc()
+        body = encode()
+        self.put(key, version, body)
+        return body
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            if self._size_gauge is not None:
+                self._size_gauge.set(0)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,157 @@
+import signal
+import threading
+import time
+from typing import Callable, List, Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class GracefulShutdown:
+    """Drains a process on SIGTERM instead of dropping its in-flight requests.
+
+    The drain runs in three phases, timed from ``begin()``:
+
+    1. For ``grace_period`` seconds the process keeps serving, but reports
+       itself as draining so /ready answers 503 and the endpoints
+       controller stops routing new traffic to it.
+    2. After that ``accepting()`` is False. Requests that still arrive are
+       refused and counted as dropped (reason ``refused``), and the server
+       is told to stop accepting connections.
+    3. In-flight requests get until ``grace_period + drain_timeout`` to
+       finish. Any still running at the deadline are counted as dropped
+       (reason ``deadline``).
+
+    ``finish()`` then records the drain duration and runs the registered
+    flush callbacks (log handlers and the like). It runs once, whichever
+    of the drain thread or the server's own exit path gets there first.
+    """
+
+    def __init__(self, grace_period: float = 5.0, drain_timeout: float = 20.0,
+                 drain_duration=None, dropped=None):
+        self.grace_period = grace_period
+        self.drain_timeout = drain_timeout
+        self._drain_duration = drain_duration
+        self._dropped = dropped
+        self._flush_callbacks: List[Callable[[], None]] = []
+        self._began_at: Optional[float] = None
+        self._finished = False
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+
+    def on_finish(self, callback: Callable[[], None]) -> None:
+        """Register a callback that flushes buffered output before exit."""
+        self._flush_callbacks.append(callback)
+
+    def begin(self) -> bool:
+        """Start draining. Returns False if a drain is already under way.
+
+        Safe to call from a signal handler: it takes no locks and does not log.
+        """
+        if self._began_at is not None:
+            return False
+        self._began_at = time.monotonic()
+        return True
+
+    @property
+    def draining(self) -> bool:
+        return self._began_at is not None
+
+    def accepting(self) -> bool:
+        """Whether new requests should still be served."""
+        began_at = self._began_at
+        return began_at is None or time.monotonic() - began_at < self.grace_period
+
+    def request_started(self) -> None:
+        with self._lock:
+            self._in_flight += 1
+
+    def request_finished(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if self._in_flight <= 0:
+                self._idle.notify_all()
+
+    def refused(self) -> None:
+        """Count a request turned away because the drain is past its grace period."""
+        if self._dropped is not None:
+            self._dropped.labels(reason='refused').inc()
+
+    def wait_for_grace(self) -> None:
+        """Block until the grace period since begin() is over."""
+        if self._began_at is not None:
+            time.sleep(max(0.0, self._began_at + self.grace_period - time.monotonic()))
+
+    def wait_for_drain(self) -> int:
+        """Block until no request is in flight or the deadline passes; return those left."""
+        deadline = self._began_at + self.grace_period + self.drain_timeout
+        with self._lock:
+            while self._in_flight > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._idle.wait(remaining)
+            return self._in_flight
+
+    def drain(self, stop_accepting: Optional[Callable[[], None]] = None) -> int:
+        """Run the whole drain after begin(); return the requests cut off at the deadline."""
+        logger.warning(
+            "Shutdown requested",
+            in_flight=self._in_flight,
+            grace_period_seconds=self.grace_period,
+            deployment_method="gitops"
+        )
+        self.wait_for_grace()
+        if stop_accepting is not None:
+            stop_accepting()
+        self.wait_for_drain()
+        return self.finish()
+
+    def finish(self) -> int:
+        """Record the drain and flush buffered output; return requests still in flight."""
+        with self._lock:
+            if self._finished:
+                return self._in_flight
+            self._finished = True
+            in_flight = self._in_flight
+            began_at = self._began_at
+
+        if began_at is not None:
+            duration = time.monotonic() - began_at
+            if self._drain_duration is not None:
+                self._drain_duration.observe(duration)
+            if self._dropped is not None and in_flight > 0:
+                self._dropped.labels(reason='deadline').inc(in_flight)
+            logger.warning(
+                "Shutdown drain finished",
+                duration_seconds=round(duration, 3),
+                in_flight=in_flight,
+                deployment_method="gitops"
+            )
+        for callback in self._flush_callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning("Shutdown flush callback failed", error=str(e),
+                               deployment_method="gitops")
+        return in_flight
+
+    def drain_and_stop(self, stop: Callable[[], None]) -> None:
+        """Run the drain, then call ``stop`` to end the server."""
+        self.drain()
+        stop()
+
+    def install(self, stop: Callable[[], None], signum: int = signal.SIGTERM) -> None:
+        """Drain on ``signum`` in a background thread, then call ``stop``.
+
+        Must be called from the main thread. A second signal during the
+        drain is ignored.
+        """
+        def handle(signum, frame):
+            if self.begin():
+                threading.Thread(target=self.drain_and_stop, args=(stop,),
+                                 name='shutdown-drain', daemon=True).start()
+
+        signal.signal(signum, handle)
@@ -0,0 +1,182 @@
+import math
+import threading
+import time
+from typing import Dict, Optional
+
+from prometheus_client.core import GaugeMetricFamily
+
+# (window name, seconds) evaluated for every SLO, as in multi-window burn-rate
+# alerting; each SLO also reports its own rolling period
+WINDOWS = (('5m', 300), ('1h', 3600), ('6h', 21600))
+
+DAY = 86400
+
+
+def window_name(seconds: int) -> str:
+    """Name a window the way WINDOWS does: '30d', '6h', '5m' or '90s'."""
+    for unit, size in (('d', DAY), ('h', 3600), ('m', 60)):
+        if seconds % size == 0:
+            return f'{seconds // size}{unit}'
+    return f'{seconds}s'
+
+
+class RingCounter:
+    """Fixed-size ring of time buckets holding good/total event counts.
+
+    Bucket ``i`` covers ``[i * width, (i + 1) * width)`` seconds; a slot is
+    reset lazily when time wraps around to it. Memory is constant
+    (``slots`` buckets) regardless of traffic, and summing a window costs
+    O(slots).
+    """
+
+    def __init__(self, width: float, slots: int):
+        self.width = width
+        self.slots = slots
+        self._epoch = [-1] * slots
+        self._good = [0] * slots
+        self._total = [0] * slots
+
+    def add(self, now: float, good: int, total: int) -> None:
+        index = int(now // self.width)
+        slot = index % self.slots
+        if self._epoch[slot] != index:
+            self._epoch[slot] = index
+            self._good[slot] = 0
+            self._total[slot] = 0
+        self._good[slot] += good
+        self._total[slot] += total
+
+    def window(self, now: float, seconds: float):
+        """Return (good, total) over the trailing window, at bucket granularity."""
+        current = int(now // self.width)
+        oldest = current - max(1, round(seconds / self.width)) + 1
+        good = total = 0
+        for epoch, slot_good, slot_total in zip(self._epoch, self._good, self._total):
+            if oldest <= epoch <= current:
+                good += slot_good
+                total += slot_total
+        return good, total
+
+
+class SLOTracker:
+    """Good/total event counts for one SLO across short and long windows.
+
+    A fine ring (10 s buckets covering 6 h) serves the 5m/1h/6h windows and
+    a coarse ring (1 h buckets covering ``period``) serves the SLO's rolling
+    period, over which its error budget is measured.
+    """
+
+    def __init__(self, name: str, target: float, period: int = 30 * DAY):
+        self.name = name
+        self.target = target
+        self.period = period
+        self._fine = RingCounter(10, 2160)
+        self._coarse = RingCounter(3600, max(1, math.ceil(period / 3600)))
+
+    def record(self, now: float, good: int, total: int) -> None:
+        self._fine.add(now, good, total)
+        self._coarse.add(now, good, total)
+
+    def window(self, now: float, seconds: float):
+        ring = self._fine if seconds <= self._fine.width * self._fine.slots else self._coarse
+        return ring.window(now, seconds)
+
+
+class SLOEngine:
+    """In-process evaluation of the availability, latency and quality SLOs.
+
+    Request handlers record outcomes; ``report()`` computes error-budget
+    burn rates per window: the observed error rate divided by the error
+    rate the SLO allows (1 - target). A burn rate of 1 spends the budget
+    exactly over the SLO's rolling period, which also bounds its remaining
+    error budget: 30 days by default, 7 days for quality as in
+    exercise5/slo-config.yaml.
+
+    Counts are per process. With several workers each one reports its own
+    share of traffic; PromQL over http_requests_total remains the fleet view.
+    """
+
+    def __init__(self, availability_target: float, latency_target: float,
+                 quality_target: float, latency_threshold: float,
+                 availability_period: int = 30 * DAY, latency_period: int = 30 * DAY,
+                 quality_period: int = 7 * DAY):
+        self.latency_threshold = latency_threshold
+        self.slos: Dict[str, SLOTracker] = {
+            'availability': SLOTracker('availability', availability_target, availability_period),
+            'latency': SLOTracker('latency', latency_target, latency_period),
+            'quality': SLOTracker('quality', quality_target, quality_period),
+        }
+        self._lock = threading.Lock()
+
+    def record_request(self, status_code: int, duration: float, now: Optional[float] = None) -> None:
+        """Record one HTTP request against the availability and latency SLOs."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self.slos['availability'].record(now, int(status_code < 500), 1)
+            self.slos['latency'].record(now, int(duration <= self.latency_threshold), 1)
+
+    def record_business(self, success: bool, count: int = 1, now: Optional[float] = None) -> None:
+        """Record business operations against the quality SLO."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self.slos['quality'].record(now, count if success else 0, count)
+
+    def report(self, now: Optional[float] = None) -> Dict[str, dict]:
+        """Return per-SLO, per-window SLI, burn rate and remaining error budget."""
+        now = time.time() if now is None else now
+        result = {}
+        # Read without the lock: a concurrent record() can at worst be half
+        # counted in this report, and scrapes must not stall request threads.
+        for name, tracker in self.slos.items():
+            allowed = 1.0 - tracker.target
+            period = window_name(tracker.period)
+            windows = {}
+            for window, seconds in WINDOWS + ((period, tracker.period),):
+                good, total = tracker.window(now, seconds)
+                error_rate = (total - good) / total if total else 0.0
+                windows[window] = {
+                    'good': good,
+                    'total': total,
+                    'sli': round(good / total, 6) if total else None,
+                    'burn_rate': round(error_rate / allowed, 4) if allowed > 0 else 0.0,
+                }
+            result[name] = {
+                'target': tracker.target,
+                'period': period,
+                'windows': windows,
+                'error_budget_remaining': round(1.0 - windows[period]['burn_rate'], 4),
+            }
+        return result
+
+
+class SLOCollector:
+    """Prometheus collector exposing the engine's burn rates at scrape time.
+
+    The engine only sees its own process's requests, so register this only
+    where one process serves the traffic being scraped (not under
+    prometheus_client's multiprocess mode).
+    """
+
+    def __init__(self, engine: SLOEngine):
+        self.engine = engine
+
+    def describe(self):
+        return []
+
+    def collect(self):
+        burn = GaugeMetricFamily(
+            'slo_burn_rate', 'In-process error budget burn rate per SLO and window',
+            labels=['slo', 'window']
+        )
+        remaining = GaugeMetricFamily(
+            'slo_error_budget_remaining_ratio',
+            "Fraction of the error budget over the SLO's rolling period left"
+            " according to this process",
+            labels=['slo']
+        )
+        for name, slo in self.engine.report().items():
+            for window, values in slo['windows'].items():
+                burn.add_metric([name, window], values['burn_rate'])
+            remaining.add_metric([name], slo['error_budget_remaining'])
+        yield burn
+        yield remaining
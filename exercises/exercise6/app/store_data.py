@@ -0,0 +1,48 @@
+from app.config import Config
+from app.data_cache import CachedStoreRepository, ReadThroughCache
+from app.metrics import (
+    DATA_CACHE_COALESCED, DATA_CACHE_ENTRIES, DATA_CACHE_EVICTIONS, DATA_CACHE_HITS,
+    DATA_CACHE_LOAD_DURATION, DATA_CACHE_MISSES, DB_QUERY_DURATION
+)
+from app.repository import create_repository
+
+# Sample business data
+stores = [
+    {
+        "id": 1,
+        "name": "Cloud SRE Store",
+        "location": "us-central1",
+        "items": [
+            {"id": 1, "name": "Kubernetes Cluster", "price": 299.99, "stock": 5},
+            {"id": 2, "name": "Prometheus Monitoring", "price": 49.99, "stock": 15},
+            {"id": 3, "name": "GitOps Pipeline", "price": 199.99, "stock": 8}
+        ]
+    },
+    {
+        "id": 2,
+        "name": "DevOps Essentials",
+        "location": "europe-west1",
+        "items": [
+            {"id": 4, "name": "CI/CD Pipeline", "price": 199.99, "stock": 3},
+            {"id": 5, "name": "Infrastructure as Code", "price": 149.99, "stock": 7},
+            {"id": 6, "name": "ArgoCD Deployment", "price": 99.99, "stock": 12}
+        ]
+    }
+]
+
+# Store data used by the request handlers: the indexed in-memory catalog,
+# or a SQLite repository with the same interface, chosen by DATABASE_URL
+catalog = create_repository(Config.DATABASE_URL, stores, query_duration=DB_QUERY_DURATION,
+                            pool_size=Config.DATABASE_POOL_SIZE)
+if Config.DATA_CACHE_ENABLED:
+    catalog = CachedStoreRepository(catalog, ReadThroughCache(
+        max_entries=Config.DATA_CACHE_MAX_ENTRIES,
+        ttl=Config.DATA_CACHE_TTL,
+        negative_ttl=Config.DATA_CACHE_NEGATIVE_TTL,
+        hits=DATA_CACHE_HITS,
+        misses=DATA_CACHE_MISSES,
+        coalesced=DATA_CACHE_COALESCED,
+        load_duration=DATA_CACHE_LOAD_DURATION,
+        evictions=DATA_CACHE_EVICTIONS,
+        entries=DATA_CACHE_ENTRIES
+    ))
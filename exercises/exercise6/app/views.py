@@ -0,0 +1,712 @@
+import math
+import random
+import time
+
+import structlog
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+
+from app.config import Config
+from app.metrics import (
+    ACTIVE_CONNECTIONS, ADMISSION_CONCURRENCY_LIMIT, ADMISSION_IN_FLIGHT, ADMISSION_QUEUE_TIME,
+    ADMISSION_SHED, LOG_LINES_SUPPRESSED, METRICS_REGISTRY, RATE_LIMIT_CLIENTS, RATE_LIMITED_REQUESTS,
+    RESPONSE_CACHE_BYTES, RESPONSE_CACHE_EVICTIONS, RESPONSE_CACHE_HITS, RESPONSE_CACHE_MISSES,
+    RESPONSE_COMPRESSION_CPU, RESPONSE_COMPRESSION_INPUT, RESPONSE_COMPRESSION_OUTPUT,
+    record_business, request_metrics, slo_engine
+)
+from app.store_data import catalog
+from app.probes import readiness_status, shutdown
+from app.listing import (
+    decode_cursor, encode_cursor, parse_fields, parse_limit, parse_store_ids, project
+)
+from app.response_cache import ResponseCache
+from app.admission import AdaptiveConcurrencyLimiter, parse_request_start
+from app.rate_limit import RateLimiter, client_key, parse_rule
+from app.log_sampling import RequestLogSampler
+from sre_common.serialization import json_encoder
+from app.compression import GZIP, Compressor
+
+# Views and response assembly shared by the WSGI (app.main) and ASGI (app.asgi)
+# builds. Views take the transport's request object (method, path, args,
+# headers, remote_addr) and return a Response the build turns into its own;
+# waiting (simulated latency, request bodies) and threading stay with the build.
+
+logger = structlog.get_logger()
+
+JSON = 'application/json'
+NDJSON = 'application/x-ndjson'
+
+# Same output as jsonify: indented in debug, compact otherwise
+_encode_compact = json_encoder(Config.JSON_SERIALIZER)
+_encode_indented = json_encoder(Config.JSON_SERIALIZER, 2)
+
+
+def encode_json(obj):
+    """Encode obj with the same formatting jsonify would use."""
+    if Config.DEBUG:
+        return _encode_indented(obj)
+    return _encode_compact(obj)
+
+
+# Pre-encoded catalog responses, invalidated by catalog.version
+response_cache = ResponseCache(
+    Config.RESPONSE_CACHE_MAX_BYTES,
+    hits=RESPONSE_CACHE_HITS,
+    misses=RESPONSE_CACHE_MISSES,
+    evictions=RESPONSE_CACHE_EVICTIONS,
+    size=RESPONSE_CACHE_BYTES
+)
+
+# Compresses responses; compressed catalog views are cached with the encoded ones
+compressor = Compressor(
+    min_size=Config.COMPRESSION_MIN_SIZE,
+    gzip_level=Config.COMPRESSION_LEVEL,
+    brotli_quality=Config.COMPRESSION_BROTLI_QUALITY,
+    cpu_seconds=RESPONSE_COMPRESSION_CPU,
+    bytes_in=RESPONSE_COMPRESSION_INPUT,
+    bytes_out=RESPONSE_COMPRESSION_OUTPUT
+)
+
+# Keeps a fraction of fast successful requests' logs, and every error or slow request
+log_sampler = RequestLogSampler(
+    sample_rate=Config.LOG_SAMPLE_RATE,
+    slow_threshold=Config.LOG_SLOW_REQUEST_THRESHOLD,
+    suppressed_counter=LOG_LINES_SUPPRESSED
+)
+
+# Sheds non-probe requests beyond an adaptive concurrency limit or queued too long;
+# None when disabled
+admission_limiter = AdaptiveConcurrencyLimiter(
+    initial_limit=Config.ADMISSION_INITIAL_LIMIT,
+    min_limit=Config.ADMISSION_MIN_LIMIT,
+    max_limit=Config.ADMISSION_MAX_LIMIT,
+    target_latency=Config.ADMISSION_TARGET_LATENCY,
+    window=Config.ADMISSION_WINDOW,
+    backoff=Config.ADMISSION_BACKOFF,
+    max_queue_time=Config.ADMISSION_MAX_QUEUE_TIME,
+    limit_gauge=ADMISSION_CONCURRENCY_LIMIT,
+    in_flight_gauge=ADMISSION_IN_FLIGHT,
+    shed_counter=ADMISSION_SHED,
+    queue_time=ADMISSION_QUEUE_TIME
+) if Config.ADMISSION_CONTROL_ENABLED else None
+
+# Per-client token buckets, limited per endpoint; None when disabled
+rate_limiter = RateLimiter(
+    rules={endpoint: parse_rule(spec) for endpoint, spec in Config.RATE_LIMITS.items()},
+    shards=Config.RATE_LIMIT_SHARDS,
+    max_entries=Config.RATE_LIMIT_MAX_CLIENTS,
+    idle_ttl=Config.RATE_LIMIT_IDLE_TTL,
+    rejected=RATE_LIMITED_REQUESTS,
+    entries=RATE_LIMIT_CLIENTS
+) if Config.RATE_LIMIT_ENABLED else None
+
+
+class Response:
+    """A status, headers and either a body or an iterator of body chunks."""
+
+    def __init__(self, body=b'', status=200, content_type=JSON, headers=None, chunks=None):
+        self.body = body
+        self.status = status
+        self.headers = {'Content-Type': content_type, **(headers or {})}
+        self.chunks = chunks
+
+    @property
+    def mimetype(self):
+        return self.headers['Content-Type'].split(';')[0].strip()
+
+
+def jsonify(obj, status=200):
+    return Response(encode_json(obj) + b'\n', status)
+
+
+def error_body(message, **extra):
+    return {
+        "error": message,
+        **extra,
+        "deployment_info": {
+            "method": "gitops",
+            "version": Config.APP_VERSION
+        }
+    }
+
+
+# Response assembly
+
+
+def encode_catalog_view(key, build):
+    """Return the JSON encoding of a catalog view, from cache when enabled."""
+    if not Config.RESPONSE_CACHE_ENABLED:
+        return encode_json(build())
+    return response_cache.get_or_encode(key, catalog.version, lambda: encode_json(build()))
+
+
+def negotiated_encoding(request):
+    """Content coding for the response, or None to send it uncompressed."""
+    if not Config.COMPRESSION_ENABLED:
+        return None
+    return compressor.negotiate(request.headers.get('accept-encoding'))
+
+
+def compressed_response(body, encoding, status=200):
+    """Response for an already-compressed JSON body."""
+    return Response(body, status, headers={'Content-Encoding': encoding, 'Vary': 'Accept-Encoding'})
+
+
+def json_response(request, fields, status=200, views=None):
+    """Build a JSON object response from already-encoded field values.
+
+    Keys are emitted sorted, matching jsonify's output for the same dict.
+    ``views`` maps fields holding cached catalog views to their cache keys;
+    for gzip clients the deflated form of those views is cached too, and
+    only the small per-request parts of the body are compressed.
+    """
+    views = views or {}
+    if Config.DEBUG:
+        # jsonify's indented layout; nested fragments move in by one level
+        fields = {key: value.replace(b'\n', b'\n  ') for key, value in fields.items()}
+        opening, separator, colon, closing = b'{\n  ', b',\n  ', b': ', b'\n}\n'
+    else:
+        opening, separator, colon, closing = b'{', b',', b':', b'}\n'
+    pieces = []  # (raw bytes, cache key of a view or None)
+    literal = opening
+    for index, key in enumerate(sorted(fields)):
+        literal += (separator if index else b'') + encode_json(key) + colon
+        if key in views:
+            pieces.append((literal, None))
+            pieces.append((fields[key], views[key]))
+            literal = b''
+        else:
+            literal += fields[key]
+    pieces.append((literal + closing, None))
+    body = b''.join(raw for raw, _ in pieces)
+
+    if views and Config.RESPONSE_CACHE_ENABLED and len(body) >= compressor.min_size \
+            and negotiated_encoding(request) == GZIP:
+        segments = [
+            (raw, compressor.deflate_segment(raw) if view is None else response_cache.get_or_encode(
+                view + (GZIP,), catalog.version, lambda raw=raw: compressor.deflate_segment(raw)
+            ))
+            for raw, view in pieces
+        ]
+        return compressed_response(compressor.gzip_join(segments), GZIP, status)
+    return Response(body, status)
+
+
+def cached_json_response(request, key, build):
+    """Response whose whole body is a cached catalog view, compressed variants included."""
+    body = encode_catalog_view(key, build) + b'\n'
+    encoding = negotiated_encoding(request)
+    if encoding is not None and Config.RESPONSE_CACHE_ENABLED and len(body) >= compressor.min_size:
+        compressed = response_cache.get_or_encode(
+            key + (encoding,), catalog.version, lambda: compressor.compress(body, encoding)
+        )
+        return compressed_response(compressed, encoding)
+    return Response(body)
+
+
+def compressible(status, mimetype, headers):
+    """Whether a fully buffered response may be compressed on the way out."""
+    return (200 <= status and status not in (204, 304)
+            and 'Content-Encoding' not in headers
+            and mimetype in Config.COMPRESSION_MIMETYPES)
+
+
+def compress_body(request, data):
+    """Return (body, content coding) for the client, or (data, None) to send it as is."""
+    if len(data) < compressor.min_size:
+        return data, None
+    encoding = negotiated_encoding(request)
+    if encoding is None:
+        return data, None
+    return compressor.compress(data, encoding), encoding
+
+
+# Request lifecycle
+
+
+def log_request_started(request, **extra):
+    """Write the "Request started" line for a request."""
+    user_agent = request.headers.get('user-agent')
+    logger.info(
+        "Request started",
+        method=request.method,
+        path=request.path,
+        remote_addr=request.remote_addr,
+        user_agent=user_agent[:100] if user_agent else None,
+        deployment_method="gitops",
+        **extra
+    )
+
+
+def start_request(request):
+    """Count the request in flight and decide whether its log lines are sampled."""
+    ACTIVE_CONNECTIONS.inc()
+    shutdown.request_started()
+    request.start_time = time.time()
+
+    # Decided once so both of a request's lines are kept or dropped together;
+    # unsampled requests defer their start line until the outcome is known
+    request.log_sampled = log_sampler.sample()
+    if request.log_sampled:
+        log_request_started(request)
+
+
+def admit(request):
+    """Apply the rate limit and admission control to a routed request.
+
+    Returns the response turning it away, or None to serve it. An admitted
+    request is marked so release_request gives its slot back.
+    """
+    # A client over its rate limit is rejected before it takes an admission slot
+    if rate_limiter is not None:
+        client = client_key(request.headers, request.remote_addr,
+                            Config.RATE_LIMIT_KEY_HEADER.lower())
+        wait = rate_limiter.check(client, request.endpoint)
+        if wait:
+            return rate_limited(wait)
+
+    # Over the concurrency limit or queued too long, fail fast rather than pile up
+    if admission_limiter is not None and request.endpoint not in Config.PROBE_ENDPOINTS:
+        # Time spent queued in the front-end proxy or server before this worker took it
+        queued_at = parse_request_start(request.headers.get('x-request-start'))
+        request.queued_at = min(queued_at or request.start_time, request.start_time)
+        if not admission_limiter.try_acquire(request.endpoint, request.start_time - request.queued_at):
+            return overloaded()
+        request.admitted = True
+    return None
+
+
+def release_request(admitted, queued_at):
+    """Mark a request finished for the shutdown drain and the admission limiter."""
+    shutdown.request_finished()
+    if admitted:
+        admission_limiter.release(time.time() - queued_at)
+
+
+# Status codes each view answers with; other routed endpoints only 200 or 500.
+# Unmatched requests count under 'unknown' (404, or 405 for a known path)
+VIEW_STATUS_CODES = {
+    'get_stores': (200, 400, 500, 503),
+    'get_store': (200, 404, 500),
+    'get_stores_batch': (200, 400, 500),
+    'get_store_item': (200, 404, 500),
+    'ready': (200, 500, 503),
+    'unknown': (404, 405),
+}
+
+
+def status_codes(endpoint):
+    """Return the status codes a request to endpoint can end with under this configuration.
+
+    Adds 429 where a rate limit rule applies and 503 where admission
+    control can shed. Refusals during shutdown are left out: their series
+    are created when the first one is counted.
+    """
+    codes = set(VIEW_STATUS_CODES.get(endpoint, (200, 500)))
+    if endpoint != 'unknown':
+        if rate_limiter is not None and rate_limiter.rule_for(endpoint)[1] is not None:
+            codes.add(429)
+        if admission_limiter is not None and endpoint not in Config.PROBE_ENDPOINTS:
+            codes.add(503)
+    return codes
+
+
+def metric_series(routes):
+    """Return the (method, endpoint, status code) request metric series to create at startup.
+
+    routes are the build's (method, endpoint) pairs; each gets the codes it
+    can return that are also in METRICS_STATUS_CODES, and unmatched
+    requests are added under 'unknown'.
+    """
+    wanted = set(Config.METRICS_STATUS_CODES)
+    return [
+        (method, endpoint, status_code)
+        for method, endpoint in [*routes, ('GET', 'unknown')]
+        for status_code in sorted(status_codes(endpoint) & wanted)
+    ]
+
+
+def finish_request(request, status_code):
+    """Record metrics and log completion once the response is ready."""
+    ACTIVE_CONNECTIONS.dec()
+
+    duration = time.time() - request.start_time
+    endpoint = request.endpoint or 'unknown'
+
+    request_metrics.observe(request.method, endpoint, status_code, duration)
+    slo_engine.record_request(status_code, duration)
+
+    # Log request completion, subject to sampling
+    if not log_sampler.keep(request.log_sampled, status_code, duration):
+        log_sampler.suppress(2)
+        return
+
+    if not request.log_sampled:
+        log_request_started(request, started_at=request.start_time)
+
+    logger.info(
+        "Request completed",
+        method=request.method,
+        endpoint=endpoint,
+        status_code=status_code,
+        duration_seconds=round(duration, 3),
+        deployment_method="gitops"
+    )
+
+
+# Views
+
+
+def home():
+    """Home endpoint with GitOps deployment info."""
+    record_business('health_check', 'success')
+
+    return jsonify({
+        "message": f"Welcome to {Config.APP_NAME}!",
+        "status": "healthy",
+        "version": Config.APP_VERSION,
+        "environment": Config.FLASK_ENV,
+        "deployment_method": "GitOps with ArgoCD",
+        "timestamp": time.time(),
+        "features": [
+            "Automated deployments",
+            "SLO-based rollbacks",
+            "Blue-green deployment ready",
+            "Continuous monitoring"
+        ]
+    })
+
+
+def invalid_request(operation, message, error):
+    """Answer 400 for request arguments that failed to parse."""
+    record_business(operation, 'invalid_request')
+    logger.warning(message, error=str(error), deployment_method="gitops")
+    return jsonify(error_body(str(error)), 400)
+
+
+def listing_arguments(request):
+    """Return (location, fields, after, limit) for /stores. Raises ValueError if invalid.
+
+    ``limit`` is None when neither ``limit`` nor ``cursor`` asks for a page.
+    """
+    location = request.args.get('location')
+    paginated = 'limit' in request.args or 'cursor' in request.args
+    fields = parse_fields(request.args.get('fields'))
+    limit = parse_limit(request.args.get('limit')) if paginated else None
+    cursor = request.args.get('cursor')
+    after = decode_cursor(cursor) if cursor else None
+    return location, fields, after, limit
+
+
+def simulated_latency():
+    """Seconds the next /stores request should take to process, when simulated."""
+    if not Config.SIMULATE_LATENCY:
+        return 0.0
+    return random.uniform(0.1, 0.8)
+
+
+def stream_stores(location, fields, after, limit):
+    """Yield compact JSON lines, one catalog page of stores per chunk."""
+    chunk_size = Config.STORES_STREAM_CHUNK_SIZE
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = chunk_size if remaining is None else min(chunk_size, remaining)
+        page = catalog.page(after, size, location)
+        if page:
+            # NDJSON needs one record per line, so never indent even in debug
+            yield b''.join(_encode_compact(project(store, fields)) + b'\n' for store in page)
+        if len(page) < size:
+            return
+        after = page[-1]['id']
+        if remaining is not None:
+            remaining -= len(page)
+
+
+def list_stores(request, location, fields, after, limit, processing_time):
+    """Get stores, optionally filtered by location, after the simulated latency.
+
+    Without paging arguments the whole list is returned. ``limit`` and/or
+    ``cursor`` return one page in store id order with a ``next_cursor``;
+    ``fields`` selects store fields (e.g. ``id,name`` to drop items);
+    ``format=ndjson`` streams one store per line.
+    """
+    # Simulate occasional errors for SRE testing (5% error rate)
+    if random.random() < 0.05:
+        record_business('store_fetch', 'error')
+        logger.error(
+            "Store service temporarily unavailable",
+            processing_time=processing_time,
+            error_type='service_unavailable',
+            deployment_method="gitops"
+        )
+        return jsonify(error_body("Store service temporarily unavailable", retry_after=30), 503)
+
+    total_stores = catalog.count(location)
+
+    if request.args.get('format') == 'ndjson':
+        record_business('store_fetch', 'success')
+        logger.info(
+            "Streaming stores",
+            total_stores=total_stores,
+            location=location,
+            processing_time=processing_time,
+            deployment_method="gitops"
+        )
+        return Response(
+            content_type=NDJSON,
+            headers={'X-Total-Stores': str(total_stores)},
+            chunks=stream_stores(location, fields, after, limit)
+        )
+
+    if limit is not None:
+        # One extra store tells whether another page follows
+        page = catalog.page(after, limit + 1, location)
+        next_cursor = encode_cursor(page[limit - 1]['id']) if len(page) > limit else None
+        page = page[:limit]
+        store_count = len(page)
+        view = ('stores_page', location, after, limit, fields)
+
+        def load():
+            return page
+    else:
+        store_count = total_stores
+        next_cursor = None
+        view = ('stores', location, fields)
+
+        # Only queried when the encoded list is not cached for the current version
+        def load():
+            return catalog.all_stores() if location is None else catalog.stores_in_location(location)
+
+    # Successful response
+    record_business('store_fetch', 'success')
+    logger.info(
+        "Stores retrieved successfully",
+        store_count=store_count,
+        total_stores=total_stores,
+        location=location,
+        processing_time=processing_time,
+        deployment_method="gitops"
+    )
+
+    # The store list is served pre-encoded; only the per-request fields are serialized
+    response_views = {"stores": view, "deployment_info": ('deployment_info',)}
+    response_fields = {
+        "stores": encode_catalog_view(view, lambda: [project(store, fields) for store in load()]),
+        "total_stores": str(total_stores).encode(),
+        "processing_time": encode_json(round(processing_time, 3)),
+        "deployment_info": encode_catalog_view(('deployment_info',), lambda: {
+            "method": "gitops",
+            "version": Config.APP_VERSION,
+            "environment": Config.FLASK_ENV
+        })
+    }
+    if limit is not None:
+        response_fields["next_cursor"] = encode_json(next_cursor)
+        response_fields["limit"] = str(limit).encode()
+    return json_response(request, response_fields, views=response_views)
+
+
+def get_store(request, store_id):
+    """Get specific store by ID."""
+    store = catalog.get_store(store_id)
+
+    if not store:
+        record_business('store_lookup', 'not_found')
+        logger.warning("Store not found", store_id=store_id, deployment_method="gitops")
+        return jsonify(error_body(f"Store {store_id} not found"), 404)
+
+    record_business('store_lookup', 'success')
+    logger.info("Store retrieved", store_id=store_id, store_name=store['name'], deployment_method="gitops")
+
+    return cached_json_response(request, ('store', store_id), lambda: {
+        **store,
+        "deployment_info": {
+            "method": "gitops",
+            "version": Config.APP_VERSION,
+            "environment": Config.FLASK_ENV
+        }
+    })
+
+
+def get_stores_batch(request, body):
+    """Get several stores by ID in one request.
+
+    The ids come from the ``ids`` query argument (``?ids=1,2,3``) or, for
+    POST, the ``ids`` list of the JSON ``body`` (None if not JSON). Stores
+    that exist are returned in request order and the rest are listed under
+    ``not_found``; ``fields`` selects store fields as on /stores.
+    """
+    try:
+        if request.method == 'POST':
+            store_ids = parse_store_ids(body.get('ids') if isinstance(body, dict) else None)
+        else:
+            store_ids = parse_store_ids(request.args.get('ids'))
+        fields = parse_fields(request.args.get('fields'))
+    except ValueError as exc:
+        return invalid_request('store_lookup', "Invalid store batch request", exc)
+
+    found = catalog.get_many(store_ids)
+    not_found = [store_id for store_id in store_ids if store_id not in found]
+
+    # One count per looked-up store, as if each had been fetched on its own
+    if found:
+        record_business('store_lookup', 'success', count=len(found))
+    if not_found:
+        record_business('store_lookup', 'not_found', count=len(not_found))
+    logger.info(
+        "Stores retrieved in batch",
+        requested=len(store_ids),
+        found=len(found),
+        not_found=len(not_found),
+        deployment_method="gitops"
+    )
+
+    return jsonify({
+        "stores": [project(found[store_id], fields) for store_id in store_ids if store_id in found],
+        "not_found": not_found,
+        "deployment_info": {
+            "method": "gitops",
+            "version": Config.APP_VERSION,
+            "environment": Config.FLASK_ENV
+        }
+    })
+
+
+def get_store_item(store_id, item_id):
+    """Get a single item of a store by ID."""
+    item = catalog.get_item(store_id, item_id)
+
+    if not item:
+        record_business('item_lookup', 'not_found')
+        logger.warning("Item not found", store_id=store_id, item_id=item_id, deployment_method="gitops")
+        return jsonify(error_body(f"Item {item_id} not found in store {store_id}"), 404)
+
+    record_business('item_lookup', 'success')
+    logger.info("Item retrieved", store_id=store_id, item_id=item_id, item_name=item['name'], deployment_method="gitops")
+
+    return jsonify({
+        **item,
+        "store_id": store_id,
+        "deployment_info": {
+            "method": "gitops",
+            "version": Config.APP_VERSION,
+            "environment": Config.FLASK_ENV
+        }
+    })
+
+
+def health():
+    """Kubernetes liveness probe endpoint with deployment info."""
+
+    # Perform basic health checks
+    health_status = {
+        "status": "healthy",
+        "timestamp": time.time(),
+        "version": Config.APP_VERSION,
+        "deployment_method": "gitops",
+        "checks": {
+            "application": "ok",
+            "memory": "ok",
+            "disk": "ok",
+            "gitops_sync": "ok"
+        }
+    }
+
+    logger.info("Health check performed", **health_status)
+    return jsonify(health_status)
+
+
+def ready():
+    """Kubernetes readiness probe endpoint with GitOps awareness.
+
+    Answers from the cached dependency check results without waiting on
+    the checks; stale results are refreshed in the background.
+    """
+    readiness, status_code = readiness_status()
+    logger.info("Readiness check performed", ready=status_code == 200, **readiness)
+    return jsonify(readiness, status_code)
+
+
+def metrics():
+    """Prometheus metrics endpoint with GitOps deployment metrics."""
+    logger.debug("Metrics endpoint accessed", deployment_method="gitops")
+    return Response(generate_latest(METRICS_REGISTRY), content_type=CONTENT_TYPE_LATEST)
+
+
+def slo_status():
+    """Multi-window error budget burn rates computed in-process."""
+    return jsonify({
+        "slos": slo_engine.report(),
+        "latency_threshold_seconds": Config.SLO_LATENCY_THRESHOLD,
+        "timestamp": time.time()
+    })
+
+
+def deployment_info():
+    """Deployment information endpoint for GitOps visibility."""
+    record_business('deployment_info', 'success')
+
+    deployment_data = {
+        "deployment_method": "gitops",
+        "version": Config.APP_VERSION,
+        "environment": Config.FLASK_ENV,
+        "app_name": Config.APP_NAME,
+        "deployment_timestamp": time.time(),
+        "features": {
+            "automated_rollback": True,
+            "slo_validation": True,
+            "blue_green_ready": True,
+            "monitoring_integration": True
+        },
+        "health": {
+            "status": "healthy",
+            "uptime_seconds": time.time() - (time.time() % 86400)  # Simplified uptime
+        }
+    }
+
+    logger.info("Deployment info requested", **deployment_data)
+    return jsonify(deployment_data)
+
+
+# Errors and rejections
+
+
+def not_found(request):
+    """Handle 404 errors."""
+    record_business('request', 'not_found')
+    logger.warning("Resource not found", path=request.path, deployment_method="gitops")
+    return jsonify(error_body("Resource not found"), 404)
+
+
+def method_not_allowed():
+    """Handle requests with a method the route does not serve."""
+    return jsonify(error_body("Method not allowed"), 405)
+
+
+def internal_error(error):
+    """Handle unexpected exceptions."""
+    record_business('request', 'server_error')
+    logger.error("Internal server error", error=str(error), deployment_method="gitops")
+    return jsonify(error_body("Internal server error"), 500)
+
+
+def refuse_request(request):
+    """Turn away new work once the shutdown grace period is over."""
+    shutdown.refused()
+    logger.warning("Request refused during shutdown", path=request.path, deployment_method="gitops")
+    return jsonify(error_body("Service is shutting down"), 503)
+
+
+def rate_limited(wait):
+    """Turn away a request from a client over its rate limit."""
+    retry_after = math.ceil(wait)
+    response = jsonify(error_body("Rate limit exceeded", retry_after=retry_after), 429)
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+
+def overloaded():
+    """Turn away a request over the admission concurrency limit."""
+    response = jsonify(error_body("Service overloaded, please retry",
+                                  retry_after=Config.ADMISSION_RETRY_AFTER), 503)
+    response.headers['Retry-After'] = str(Config.ADMISSION_RETRY_AFTER)
+    return response
@@ -0,0 +1,101 @@
+"""
+WSGI vs. ASGI build: throughput and tail latency under the same load.
+
+Starts the Flask app under gunicorn (app.gunicorn_config, so threaded or
+gevent workers per CONCURRENCY_MODE) and the ASGI app (app.asgi) under
+uvicorn with the same number of worker processes, then drives each with
+the open-loop generator from scripts.loadgen at every --rates value and
+reports completed requests/sec, error rate and latency percentiles over
+all endpoints. Latencies are measured from each request's scheduled send
+time, so a build that falls behind shows it in p99 rather than by quietly
+receiving fewer requests.
+
+Usage (from exercises/exercise6; needs gunicorn and uvicorn installed):
+    python -m benchmarks.bench_asgi
+    python -m benchmarks.bench_asgi --rates 100 400 800 --duration 20 --workers 2
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import os
+import subprocess
+import sys
+
+from scripts.loadgen import (
+    DEFAULT_MIX, QUANTILES, is_error, parse_mix, quantile, run_load, wait_until_up
+)
+
+SERVERS = {
+    'wsgi': ('gunicorn', ['-m', 'gunicorn', '--config', 'python:app.gunicorn_config', 'app.main:app']),
+    'asgi': ('uvicorn', ['-m', 'uvicorn', 'app.asgi:app', '--no-access-log']),
+}
+
+
+def start_server(name, port, workers):
+    _, argv = SERVERS[name]
+    env = dict(os.environ, FLASK_ENV='production', LOG_LEVEL='WARNING',
+               HOST='127.0.0.1', PORT=str(port), WEB_CONCURRENCY=str(workers))
+    if name == 'asgi':
+        argv = argv + ['--host', '127.0.0.1', '--port', str(port), '--workers', str(workers),
+                       '--log-level', 'warning']
+    return subprocess.Popen([sys.executable] + argv, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def summarize(results, elapsed):
+    samples = [sample for label in results for sample in results[label]]
+    latencies = sorted(latency for latency, _ in samples if latency is not None)
+    errors = sum(1 for _, status in samples if is_error(status))
+    completed = sum(1 for _, status in samples if status is not None)
+    return (completed / elapsed, errors / len(samples) if samples else 0.0,
+            [quantile(latencies, q) for _, q in QUANTILES])
+
+
+def run_server(name, args, mix):
+    module = SERVERS[name][0]
+    if importlib.util.find_spec(module) is None:
+        print(f"{name:<6} skipped: {module} is not installed")
+        return
+
+    server = start_server(name, args.port, args.workers)
+    try:
+        url = f'http://127.0.0.1:{args.port}'
+        wait_until_up(url)
+        for rate in args.rates:
+            load = argparse.Namespace(
+                url=url, rate=rate, duration=args.duration, warmup=args.warmup,
+                connections=args.connections, timeout=args.timeout, poisson=True, seed=1
+            )
+            results, elapsed = asyncio.run(run_load(load, mix))
+            rps, error_rate, latencies = summarize(results, elapsed)
+            print(f"{name:<6} {rate:>8g} {rps:>9.1f} {error_rate:>7.2%} "
+                  + ' '.join(f"{latency * 1000:>9.1f}" for latency in latencies))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--servers', nargs='+', choices=list(SERVERS), default=list(SERVERS))
+    parser.add_argument('--rates', type=float, nargs='+', default=[50.0, 200.0])
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--warmup', type=float, default=2.0)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--connections', type=int, default=256)
+    parser.add_argument('--timeout', type=float, default=10.0)
+    parser.add_argument('--mix', nargs='+', default=list(DEFAULT_MIX))
+    parser.add_argument('--port', type=int, default=18090)
+    args = parser.parse_args()
+    mix = parse_mix(args.mix, [1, 2])
+
+    print(f"{args.workers} worker(s), {args.duration:g}s per rate, Poisson arrivals")
+    print(f"{'server':<6} {'offered':>8} {'rps':>9} {'errors':>7} "
+          + ' '.join(f"{name + '(ms)':>9}" for name, _ in QUANTILES))
+    for name in args.servers:
+        run_server(name, args, mix)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Batch lookup benchmark: N single-store requests vs. one /stores/batch request.
+
+Drives the Flask app in-process through its test client against a
+synthetic catalog and, for each batch size, times fetching the same N
+random store ids as N GET /stores/<id> calls and as one
+GET /stores/batch?ids=... call, for the in-memory catalog and the SQLite
+repository. Request logs are written to /dev/null with --logs, so their
+per-request cost is included; otherwise logging is disabled.
+
+Usage (from exercises/exercise6):
+    python -m benchmarks.bench_batch
+    python -m benchmarks.bench_batch --stores 50000 --sizes 10,100 --logs
+"""
+
+import argparse
+import logging
+import os
+import random
+import tempfile
+import time
+
+import app.main as main
+from app import views
+from app.config import Config
+from app.repository import create_repository
+from benchmarks.bench_catalog import build_stores
+
+
+def measure(client, paths, rounds):
+    """Return the mean seconds to fetch every path in turn."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for path in paths:
+            response = client.get(path)
+            assert response.status_code == 200, response.status_code
+    return (time.perf_counter() - start) / rounds
+
+
+def run(store_count, sizes, rounds, logs):
+    if logs:
+        logging.basicConfig(stream=open(os.devnull, 'w'), level=logging.INFO, force=True)
+    else:
+        logging.disable(logging.CRITICAL)
+    main.app.debug = False
+    views.admission_limiter = views.rate_limiter = None
+    Config.STORES_BATCH_MAX_SIZE = max(Config.STORES_BATCH_MAX_SIZE, *sizes)
+
+    stores = build_stores(store_count)
+    database = os.path.join(tempfile.mkdtemp(), 'stores.db')
+    backends = {
+        'memory': create_repository('memory://', stores),
+        'sqlite': create_repository(f'sqlite:///{database}', stores),
+    }
+    client = main.app.test_client()
+    rng = random.Random(7)
+
+    print(f"catalog: {store_count} stores, {rounds} rounds, logs {'on' if logs else 'off'}")
+    print(f"{'backend':<8} {'ids':>5} {'single ms':>10} {'batch ms':>10} {'speedup':>8}")
+    for backend, repository in backends.items():
+        views.catalog = repository
+        for size in sizes:
+            ids = rng.sample(range(1, store_count + 1), size)
+            singles = [f'/stores/{store_id}' for store_id in ids]
+            batch = [f"/stores/batch?ids={','.join(map(str, ids))}"]
+
+            views.response_cache.clear()
+            measure(client, singles + batch, 1)  # warm up
+            single = measure(client, singles, rounds)
+            batched = measure(client, batch, rounds)
+            print(f"{backend:<8} {size:>5} {single * 1e3:>10.2f} {batched * 1e3:>10.2f} "
+                  f"{single / batched:>7.1f}x")
+    backends['sqlite'].close()
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--stores', type=int, default=10000)
+    parser.add_argument('--sizes', default='1,10,50,100',
+                        help="comma-separated numbers of store ids per batch")
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--logs', action='store_true',
+                        help="write request logs to /dev/null instead of disabling logging")
+    args = parser.parse_args()
+    run(args.stores, [int(s) for s in args.sizes.split(',')], args.rounds, args.logs)
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,76 @@
+"""
+Store lookup benchmark: linear scan vs. indexed catalog.
+
+Builds synthetic catalogs of increasing size and times a store lookup done
+the old way (scanning the store list) against StoreCatalog's hash indexes.
+The indexed columns should stay flat as the catalog grows.
+
+Usage (from exercises/exercise6):
+    python -m benchmarks.bench_catalog
+    python -m benchmarks.bench_catalog --sizes 1000 10000 100000 --lookups 2000
+"""
+
+import argparse
+import random
+import timeit
+
+from app.catalog import StoreCatalog
+
+LOCATIONS = ['us-central1', 'us-east1', 'europe-west1', 'asia-east1']
+
+
+def build_stores(count, items_per_store=3):
+    """Generate a synthetic store list shaped like the sample data."""
+    stores = []
+    item_id = 1
+    for store_id in range(1, count + 1):
+        items = []
+        for _ in range(items_per_store):
+            items.append({"id": item_id, "name": f"Item {item_id}", "price": 9.99, "stock": 10})
+            item_id += 1
+        stores.append({
+            "id": store_id,
+            "name": f"Store {store_id}",
+            "location": LOCATIONS[store_id % len(LOCATIONS)],
+            "items": items
+        })
+    return stores
+
+
+def run(sizes, lookups):
+    print(f"{'stores':>10} {'scan us/op':>12} {'index us/op':>12} {'item us/op':>12}")
+    for size in sizes:
+        stores = build_stores(size)
+        catalog = StoreCatalog(stores)
+        targets = [random.randint(1, size) for _ in range(lookups)]
+        item_targets = [(sid, sid * 3) for sid in targets]
+
+        scan = timeit.timeit(
+            lambda: [next((s for s in stores if s['id'] == sid), None) for sid in targets],
+            number=1
+        )
+        indexed = min(timeit.repeat(
+            lambda: [catalog.get_store(sid) for sid in targets],
+            number=1, repeat=5
+        ))
+        item = min(timeit.repeat(
+            lambda: [catalog.get_item(sid, iid) for sid, iid in item_targets],
+            number=1, repeat=5
+        ))
+
+        print(
+            f"{size:>10} {scan / lookups * 1e6:>12.2f} "
+            f"{indexed / lookups * 1e6:>12.3f} {item / lookups * 1e6:>12.3f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 50000])
+    parser.add_argument('--lookups', type=int, default=1000)
+    args = parser.parse_args()
+    run(args.sizes, args.lookups)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Response compression benchmark: /stores with and without gzip.
+
+Drives the Flask app in-process against a synthetic catalog, with the
+simulated latency and error injection patched out, and reports body size
+and requests/sec for uncompressed responses and for gzip built from
+cached pre-deflated catalog segments. It also times compressing the
+whole body on every request (what a generic compression middleware
+does) against joining the cached segments, and checks both decompress to
+the uncompressed body.
+
+Usage (from exercises/exercise6):
+    python -m benchmarks.bench_compression
+    python -m benchmarks.bench_compression --stores 20000 --levels 1 6 9
+"""
+
+import argparse
+import gzip
+import logging
+import time
+import timeit
+from unittest import mock
+
+import app.main as main
+from app import views
+from app.catalog import StoreCatalog
+from app.compression import GZIP, Compressor
+from app.config import Config
+from benchmarks.bench_catalog import build_stores
+
+
+def measure(client, path, requests, headers):
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = client.get(path, headers=headers)
+        assert response.status_code == 200, response.status_code
+    return requests / (time.perf_counter() - start), response
+
+
+def run(store_count, requests, levels):
+    logging.disable(logging.CRITICAL)
+    main.app.debug = False
+    views.catalog = StoreCatalog(build_stores(store_count))
+    Config.RESPONSE_CACHE_ENABLED = True
+    client = main.app.test_client()
+    path = '/stores'
+
+    print(f"catalog: {store_count} stores, {requests} requests")
+    print(f"{'mode':<28} {'bytes':>10} {'rps':>9} {'whole-body us':>14} {'cached us':>10}")
+
+    with mock.patch.object(views.random, 'uniform', return_value=0.0), \
+            mock.patch.object(views.random, 'random', return_value=1.0):
+        rps, response = measure(client, path, requests, {})
+        plain = response.get_data()
+        print(f"{'identity':<28} {len(plain):>10} {rps:>9.1f} {'-':>14} {'-':>10}")
+
+        for level in levels:
+            views.compressor.gzip_level = level
+            views.response_cache.clear()
+            client.get(path, headers={'Accept-Encoding': GZIP})  # warm the cache
+            rps, response = measure(client, path, requests, {'Accept-Encoding': GZIP})
+            body = response.get_data()
+            assert gzip.decompress(body) == plain
+
+            # Per-request cost of the two ways of producing the gzip body
+            compressor = Compressor(gzip_level=level)
+            whole = min(timeit.repeat(
+                lambda: compressor.compress(plain, GZIP), number=20, repeat=3
+            )) / 20
+            segments = [(plain, compressor.deflate_segment(plain))]
+            assert gzip.decompress(compressor.gzip_join(segments)) == plain
+            joined = min(timeit.repeat(
+                lambda: compressor.gzip_join(segments), number=20, repeat=3
+            )) / 20
+            print(f"{'gzip level ' + str(level):<28} {len(body):>10} {rps:>9.1f} "
+                  f"{whole * 1e6:>14.0f} {joined * 1e6:>10.0f}")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--stores', type=int, default=5000)
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--levels', type=int, nargs='+', default=[1, 6])
+    args = parser.parse_args()
+    run(args.stores, args.requests, args.levels)
+
+
+if __name__ == '__main__':
+    main_cli()
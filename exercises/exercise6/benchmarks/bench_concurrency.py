@@ -0,0 +1,102 @@
+"""
+Concurrency ceiling load test for the simulated-latency /stores endpoint.
+
+Starts the application once per CONCURRENCY_MODE, fires a burst of
+concurrent GET /stores requests at it and reports how many completed
+within the timeout, the wall time and the effective throughput. With
+blocking waits every in-flight request pins an OS thread; in gevent mode
+the same waits yield, so one process can hold thousands of them.
+
+Usage (from exercises/exercise6):
+    python -m benchmarks.bench_concurrency
+    python -m benchmarks.bench_concurrency --concurrency 200 1000 2000 --modes gevent
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+
+def wait_until_up(port, timeout=15.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/health', timeout=1).read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"application did not start on port {port}")
+
+
+async def fetch(port, path, timeout):
+    """Issue one HTTP/1.1 request on a fresh connection and return the status code."""
+    reader, writer = await asyncio.wait_for(asyncio.open_connection('127.0.0.1', port), timeout)
+    try:
+        writer.write(f'GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n'.encode())
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+        await asyncio.wait_for(reader.read(), timeout)
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+async def burst(port, concurrency, timeout):
+    async def one():
+        try:
+            return await fetch(port, '/stores', timeout)
+        except (asyncio.TimeoutError, OSError):
+            return None
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    completed = sum(1 for status in results if status is not None)
+    return completed, elapsed
+
+
+def run_mode(mode, port, levels, timeout):
+    env = dict(
+        os.environ,
+        CONCURRENCY_MODE=mode,
+        FLASK_ENV='production',
+        LOG_LEVEL='WARNING',
+        PORT=str(port),
+        WORKER_CONNECTIONS=str(max(levels) * 2)
+    )
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'app.main'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_until_up(port)
+        for level in levels:
+            completed, elapsed = asyncio.run(burst(port, level, timeout))
+            print(
+                f"{mode:<10} {level:>12} {completed:>10} {elapsed:>9.2f}s "
+                f"{completed / elapsed:>10.1f}"
+            )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--modes', nargs='+', default=['threaded', 'gevent'])
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[50, 200, 1000])
+    parser.add_argument('--timeout', type=float, default=10.0)
+    parser.add_argument('--port', type=int, default=18080)
+    args = parser.parse_args()
+
+    print(f"{'mode':<10} {'concurrency':>12} {'completed':>10} {'wall':>10} {'req/s':>10}")
+    for offset, mode in enumerate(args.modes):
+        run_mode(mode, args.port + offset, args.concurrency, args.timeout)
+
+
+if __name__ == '__main__':
+    main()
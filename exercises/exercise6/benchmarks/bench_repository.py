@@ -0,0 +1,70 @@
+"""
+Store repository benchmark: in-memory catalog vs. SQLite.
+
+Times the repository calls behind the store routes (store lookup, item
+lookup, a page of stores, counting) for each backend on a synthetic
+catalog, so the SQLite I/O path can be compared with the in-memory
+indexes when planning capacity.
+
+Usage (from exercises/exercise6):
+    python -m benchmarks.bench_repository
+    python -m benchmarks.bench_repository --stores 50000 --database /tmp/bench.db
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import timeit
+
+from app.repository import create_repository
+from benchmarks.bench_catalog import build_stores
+
+
+def operations(repository, store_count):
+    rng = random.Random(7)
+    ids = [rng.randint(1, store_count) for _ in range(1000)]
+    return {
+        'get_store': lambda: [repository.get_store(i) for i in ids[:100]],
+        'get_item': lambda: [repository.get_item(i, i * 3) for i in ids[:100]],
+        'page(100)': lambda: repository.page(store_count // 2, 100),
+        'page(100, location)': lambda: repository.page(None, 100, 'us-east1'),
+        'count': lambda: repository.count(),
+    }
+
+
+def run(store_count, database):
+    stores = build_stores(store_count)
+    if database is None:
+        database = os.path.join(tempfile.mkdtemp(), 'stores.db')
+    if os.path.exists(database):
+        os.remove(database)
+
+    backends = {
+        'memory': create_repository('memory://', stores),
+        'sqlite': create_repository(f'sqlite:///{database}', stores),
+    }
+    names = list(operations(backends['memory'], store_count))
+
+    print(f"catalog: {store_count} stores (sqlite file {database})")
+    print(f"{'operation':<22} {'memory us':>10} {'sqlite us':>10}")
+    for name in names:
+        timings = {}
+        for backend, repository in backends.items():
+            op = operations(repository, store_count)[name]
+            per_call = 100 if name.startswith('get_') else 1
+            timings[backend] = min(timeit.repeat(op, number=20, repeat=3)) / 20 / per_call
+        print(f"{name:<22} {timings['memory'] * 1e6:>10.1f} {timings['sqlite'] * 1e6:>10.1f}")
+    backends['sqlite'].close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--stores', type=int, default=10000)
+    parser.add_argument('--database', default=None, help="SQLite file (default: a temp file)")
+    args = parser.parse_args()
+    run(args.stores, args.database)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Response cache benchmark: requests/sec for catalog views with the
+serialize-once cache enabled and disabled.
+
+Drives the Flask app in-process through its test client against a
+synthetic catalog. The simulated latency and error injection in
+get_stores are patched out so the numbers reflect serialization cost.
+
+Usage (from exercises/exercise6):
+    python -m benchmarks.bench_response_cache
+    python -m benchmarks.bench_response_cache --stores 20000 --requests 200
+"""
+
+import argparse
+import logging
+import time
+from unittest import mock
+
+import app.main as main
+from app import views
+from app.catalog import StoreCatalog
+from app.config import Config
+from benchmarks.bench_catalog import build_stores
+
+
+def measure(client, path, requests):
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = client.get(path)
+        assert response.status_code == 200, response.status_code
+    return requests / (time.perf_counter() - start)
+
+
+def run(store_count, requests):
+    logging.disable(logging.CRITICAL)
+    main.app.debug = False
+    views.catalog = StoreCatalog(build_stores(store_count))
+    client = main.app.test_client()
+
+    paths = ['/stores', '/stores?location=us-east1', f'/stores/{store_count // 2}']
+    print(f"catalog: {store_count} stores, {requests} requests per path")
+    print(f"{'path':<32} {'cache off rps':>14} {'cache on rps':>14} {'speedup':>8}")
+
+    with mock.patch.object(views.random, 'uniform', return_value=0.0), \
+            mock.patch.object(views.random, 'random', return_value=1.0):
+        for path in paths:
+            Config.RESPONSE_CACHE_ENABLED = False
+            off = measure(client, path, requests)
+
+            Config.RESPONSE_CACHE_ENABLED = True
+            views.response_cache.clear()
+            client.get(path)  # warm the cache
+            on = measure(client, path, requests)
+
+            print(f"{path:<32} {off:>14.1f} {on:>14.1f} {on / off:>7.1f}x")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--stores', type=int, default=5000)
+    parser.add_argument('--requests', type=int, default=100)
+    args = parser.parse_args()
+    run(args.stores, args.requests)
+
+
+if __name__ == '__main__':
+    main_cli()
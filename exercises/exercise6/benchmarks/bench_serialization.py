@@ -0,0 +1,99 @@
+"""
+JSON serialization micro-benchmark: stdlib vs. orjson.
+
+Measures the per-request cost of encoding the /stores and /stores/<id>
+payloads through the Flask JSON provider, and of rendering a request log
+event through structlog's JSONRenderer, for each serializer. Also checks
+that both providers produce byte-identical catalog responses.
+
+Usage (from exercises/exercise6):
+    python -m benchmarks.bench_serialization
+    python -m benchmarks.bench_serialization --stores 1000 --iterations 500
+"""
+
+import argparse
+import timeit
+
+import structlog
+from flask import Flask
+
+from benchmarks.bench_catalog import build_stores  # imports app, which puts sre_common on sys.path
+from sre_common.serialization import (
+    ORJSON, STDLIB, json_provider_class, resolve_serializer, structlog_serializer
+)
+
+
+def payloads(store_count):
+    stores = build_stores(store_count)
+    deployment_info = {"method": "gitops", "version": "1.2.0", "environment": "production"}
+    return {
+        '/stores': {
+            "stores": stores,
+            "total_stores": len(stores),
+            "processing_time": 0.123,
+            "deployment_info": deployment_info
+        },
+        '/stores/<id>': {**stores[0], "deployment_info": deployment_info}
+    }
+
+
+def log_event():
+    return {
+        "event": "Request completed", "method": "GET", "endpoint": "get_store",
+        "status_code": 200, "duration_seconds": 0.004, "deployment_method": "gitops",
+        "logger": "app.main", "level": "info", "timestamp": "2026-01-01T00:00:00.000000Z"
+    }
+
+
+def make_app(serializer):
+    app = Flask(__name__)
+    app.json = json_provider_class(serializer)(app)
+    return app
+
+
+def run(store_count, iterations):
+    if resolve_serializer(ORJSON) != ORJSON:
+        print("orjson is not installed; only the stdlib serializer is available")
+        return
+
+    apps = {name: make_app(name) for name in (STDLIB, ORJSON)}
+    docs = payloads(store_count)
+
+    print(f"{'payload':<16} {'stdlib us':>10} {'orjson us':>10} {'speedup':>8} {'identical':>10}")
+    for label, doc in docs.items():
+        timings = {}
+        bodies = {}
+        for name, app in apps.items():
+            with app.app_context():
+                bodies[name] = app.json.response(doc).get_data()
+                timings[name] = min(timeit.repeat(
+                    lambda: app.json.response(doc).get_data(), number=iterations, repeat=3
+                )) / iterations
+        print(
+            f"{label:<16} {timings[STDLIB] * 1e6:>10.1f} {timings[ORJSON] * 1e6:>10.1f} "
+            f"{timings[STDLIB] / timings[ORJSON]:>7.1f}x {str(bodies[STDLIB] == bodies[ORJSON]):>10}"
+        )
+
+    event = log_event()
+    renders = {}
+    for name in (STDLIB, ORJSON):
+        renderer = structlog.processors.JSONRenderer(serializer=structlog_serializer(name))
+        renders[name] = min(timeit.repeat(
+            lambda: renderer(None, 'info', dict(event)), number=iterations * 10, repeat=3
+        )) / (iterations * 10)
+    print(
+        f"{'log event':<16} {renders[STDLIB] * 1e6:>10.1f} {renders[ORJSON] * 1e6:>10.1f} "
+        f"{renders[STDLIB] / renders[ORJSON]:>7.1f}x {'n/a':>10}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--stores', type=int, default=200)
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+    run(args.stores, args.iterations)
+
+
+if __name__ == '__main__':
+    main()
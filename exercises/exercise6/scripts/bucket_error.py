@@ -0,0 +1,115 @@
+"""
+Quantile-estimation error of histogram bucket layouts.
+
+Feeds recorded latencies into each bucket layout and compares the
+quantiles Prometheus would estimate with histogram_quantile() (linear
+interpolation inside a bucket) against the exact quantiles of the data.
+Also reports the number of series each layout costs per label set.
+
+Latencies are read one per line, in seconds, from a file or stdin (for
+example durations pulled from request logs). Without input, a synthetic
+sample shaped like /stores traffic is used.
+
+Usage (from exercises/exercise6):
+    python -m scripts.bucket_error
+    python -m scripts.bucket_error latencies.txt --layouts slo default 0.1,0.25,0.5,1
+    python -m scripts.bucket_error --quantiles 0.5 0.95 0.99 0.999
+"""
+
+import argparse
+import bisect
+import math
+import random
+import sys
+
+from app.buckets import presets, resolve_buckets
+from app.config import Config
+
+
+def synthetic_latencies(count, seed=42):
+    """Mix of fast routes and simulated /stores latency with a slow tail."""
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.5:
+            samples.append(rng.lognormvariate(math.log(0.004), 0.6))
+        elif roll < 0.98:
+            samples.append(rng.uniform(0.1, 0.8))
+        else:
+            samples.append(rng.uniform(0.8, 3.0))
+    return samples
+
+
+def exact_quantile(sorted_values, q):
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def cumulative_counts(sorted_values, bounds):
+    return [bisect.bisect_right(sorted_values, b) for b in bounds] + [len(sorted_values)]
+
+
+def histogram_quantile(q, bounds, counts):
+    """Prometheus' histogram_quantile() over cumulative bucket counts."""
+    total = counts[-1]
+    if total == 0:
+        return float('nan')
+    rank = q * total
+    index = next(i for i, c in enumerate(counts) if c >= rank)
+    if index == len(bounds):
+        # Falls in +Inf: Prometheus returns the highest finite bound
+        return bounds[-1]
+    upper = bounds[index]
+    lower = bounds[index - 1] if index > 0 else 0.0
+    below = counts[index - 1] if index > 0 else 0
+    in_bucket = counts[index] - below
+    if in_bucket == 0:
+        return upper
+    return lower + (upper - lower) * (rank - below) / in_bucket
+
+
+def read_latencies(path):
+    stream = sys.stdin if path == '-' else open(path)
+    with stream:
+        return [float(line) for line in stream if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('input', nargs='?', help="file with one latency (seconds) per line, or '-'")
+    parser.add_argument('--layouts', nargs='+', default=None,
+                        help="preset names or comma-separated bounds (default: all presets)")
+    parser.add_argument('--quantiles', type=float, nargs='+', default=[0.5, 0.95, 0.99])
+    parser.add_argument('--threshold', type=float, default=Config.SLO_LATENCY_THRESHOLD)
+    parser.add_argument('--samples', type=int, default=100000)
+    args = parser.parse_args()
+
+    values = read_latencies(args.input) if args.input else synthetic_latencies(args.samples)
+    values.sort()
+    layouts = args.layouts or list(presets(args.threshold))
+
+    print(f"{len(values)} latencies, SLO threshold {args.threshold}s")
+    within = bisect.bisect_right(values, args.threshold) / len(values)
+    print(f"fraction within SLO threshold: {within:.4%} (exact for every layout)\n")
+
+    header = f"{'layout':<24} {'series':>6}"
+    for q in args.quantiles:
+        header += f" {'p' + format(q * 100, 'g'):>8} {'est':>8} {'err%':>7}"
+    print(header)
+
+    for spec in layouts:
+        bounds = resolve_buckets(spec, args.threshold)
+        counts = cumulative_counts(values, bounds)
+        # one series per bucket, plus +Inf, _sum and _count
+        row = f"{spec[:24]:<24} {len(bounds) + 3:>6}"
+        for q in args.quantiles:
+            exact = exact_quantile(values, q)
+            estimate = histogram_quantile(q, bounds, counts)
+            error = (estimate - exact) / exact * 100 if exact else float('nan')
+            row += f" {exact:>8.4f} {estimate:>8.4f} {error:>+7.1f}"
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,347 @@
+"""
+Open-loop HTTP load generator with an SLO report.
+
+Sends requests at a fixed arrival rate regardless of how fast the server
+answers (open loop). Each request's latency is measured from the time it
+was scheduled to be sent, not from when a connection became free, so a
+stalled server shows up in the percentiles instead of silently lowering
+the offered load (coordinated omission). Requests go over a pool of
+HTTP/1.1 keep-alive connections driven by asyncio.
+
+Reports throughput, p50/p95/p99/p99.9 latency and error rate per
+endpoint, then grades availability and latency (and quality, when the
+app exports business_operations_total) against exercise5/slo-config.yaml.
+
+Usage (from exercises/exercise6; --url may point at any exercise app):
+    python -m scripts.loadgen --start
+    python -m scripts.loadgen --url http://127.0.0.1:8080 --rate 100 --duration 60
+    python -m scripts.loadgen --start --mix /stores=1 /health=1 --rate 20
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+
+from app.config import Config
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover - optional dependency
+    yaml = None
+
+DEFAULT_MIX = ('/=1', '/stores=4', '/stores/{id}=3', '/health=1', '/ready=1')
+QUANTILES = (('p50', 0.5), ('p95', 0.95), ('p99', 0.99), ('p999', 0.999))
+SLO_CONFIG = os.path.join(os.path.dirname(__file__), '..', '..', 'exercise5', 'slo-config.yaml')
+
+
+def load_slos(path):
+    """Return {name: target} and the latency threshold from slo-config.yaml.
+
+    Falls back to the app's SLO settings when PyYAML or the file is missing.
+    """
+    fallback = ({
+        'availability': Config.SLO_AVAILABILITY_TARGET,
+        'latency': Config.SLO_LATENCY_TARGET,
+        'quality': Config.SLO_QUALITY_TARGET,
+    }, Config.SLO_LATENCY_THRESHOLD)
+    if yaml is None or not os.path.exists(path):
+        return fallback
+
+    targets, threshold = {}, fallback[1]
+    with open(path) as f:
+        for doc in yaml.safe_load_all(f):
+            slo = (doc or {}).get('serviceLevelObjective')
+            if not slo:
+                continue
+            name = slo['name'].replace('-slo', '')
+            targets[name] = float(slo['goal']['performanceGoal']['threshold'])
+            good = slo['serviceLevelIndicator']['requestBased']['good']['filter']
+            match = re.search(r'metric\.label\.le="([\d.]+)"', good)
+            if match:
+                threshold = float(match.group(1))
+    return targets or fallback[0], threshold
+
+
+class Connection:
+    """One HTTP/1.1 keep-alive connection."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def request(self, host, path):
+        """Send GET path and return (status, keep_alive) after reading the body."""
+        self.writer.write(f'GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n'.encode())
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed by server")
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif 'content-length' in headers:
+            await self.reader.readexactly(int(headers['content-length']))
+        else:
+            await self.reader.read()
+            return status, False
+        return status, headers.get('connection', '').lower() != 'close'
+
+    def close(self):
+        self.writer.close()
+
+
+class ConnectionPool:
+    """At most ``size`` connections; requests wait for a free one."""
+
+    def __init__(self, host, port, size):
+        self.host = host
+        self.port = port
+        self._idle = []
+        self._slots = asyncio.Semaphore(size)
+
+    async def request(self, path, timeout):
+        async with self._slots:
+            conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port), timeout
+                )
+                conn = Connection(reader, writer)
+            try:
+                status, keep_alive = await asyncio.wait_for(conn.request(self.host, path), timeout)
+            except BaseException:
+                conn.close()
+                raise
+            if keep_alive:
+                self._idle.append(conn)
+            else:
+                conn.close()
+            return status
+
+    def close(self):
+        for conn in self._idle:
+            conn.close()
+        self._idle.clear()
+
+
+def parse_mix(entries, store_ids):
+    """Turn 'path=weight' entries into (label, weight, path factory) tuples."""
+    mix = []
+    for entry in entries:
+        path, _, weight = entry.partition('=')
+        weight = float(weight or 1)
+        if '{id}' in path:
+            def make(path=path):
+                return path.replace('{id}', str(random.choice(store_ids)))
+        else:
+            def make(path=path):
+                return path
+        mix.append((path, weight, make))
+    return mix
+
+
+async def run_load(args, mix):
+    """Fire requests on a fixed schedule and return per-endpoint samples."""
+    parsed = urllib.parse.urlsplit(args.url)
+    pool = ConnectionPool(parsed.hostname, parsed.port or 80, args.connections)
+    labels = [label for label, _, _ in mix]
+    weights = [weight for _, weight, _ in mix]
+    factories = {label: make for label, _, make in mix}
+
+    results = defaultdict(list)  # label -> [(latency or None, status or None)]
+    total = int(args.rate * (args.duration + args.warmup))
+    rng = random.Random(args.seed)
+    loop = asyncio.get_running_loop()
+    start = loop.time() + 0.1
+    tasks = []
+
+    async def one(label, intended, measured):
+        try:
+            status = await pool.request(factories[label](), args.timeout)
+        except (asyncio.TimeoutError, OSError, ConnectionError, ValueError, IndexError,
+                asyncio.IncompleteReadError):
+            status = None
+        # Latency from the scheduled send time, including any wait for a connection
+        latency = loop.time() - intended
+        if measured:
+            results[label].append((latency if status is not None else None, status))
+
+    intended = start
+    for i in range(total):
+        if args.poisson:
+            intended += rng.expovariate(args.rate)
+        else:
+            intended = start + i / args.rate
+        delay = intended - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        label = rng.choices(labels, weights)[0]
+        measured = intended - start >= args.warmup
+        tasks.append(asyncio.ensure_future(one(label, intended, measured)))
+
+    await asyncio.gather(*tasks)
+    pool.close()
+    return results, loop.time() - start - args.warmup
+
+
+def quantile(sorted_values, q):
+    if not sorted_values:
+        return float('nan')
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def is_error(status):
+    # Availability counts server errors and transport failures, not 4xx
+    return status is None or status >= 500
+
+
+def scrape_business(url):
+    """Return {status: count} of business_operations_total, or None if not exported."""
+    try:
+        body = urllib.request.urlopen(url + '/metrics', timeout=5).read().decode()
+    except OSError:
+        return None
+    counts = defaultdict(float)
+    found = False
+    for line in body.splitlines():
+        if line.startswith('business_operations_total{'):
+            found = True
+            match = re.search(r'status="([^"]*)"', line)
+            counts[match.group(1) if match else ''] += float(line.rsplit(' ', 1)[1])
+    return counts if found else None
+
+
+def report(results, elapsed, slos, threshold, business):
+    print(f"{'endpoint':<16} {'count':>7} {'rps':>8} {'errors':>7} "
+          + ' '.join(f"{name + '(ms)':>9}" for name, _ in QUANTILES))
+    all_samples = []
+    for label in sorted(results):
+        samples = results[label]
+        all_samples.extend(samples)
+        latencies = sorted(latency for latency, _ in samples if latency is not None)
+        errors = sum(1 for _, status in samples if is_error(status))
+        print(f"{label:<16} {len(samples):>7} {len(samples) / elapsed:>8.1f} "
+              f"{errors / len(samples):>7.2%} "
+              + ' '.join(f"{quantile(latencies, q) * 1000:>9.1f}" for _, q in QUANTILES))
+
+    total = len(all_samples)
+    if not total:
+        print("no requests measured")
+        return True
+    good_availability = sum(1 for _, status in all_samples if not is_error(status))
+    good_latency = sum(1 for latency, _ in all_samples
+                       if latency is not None and latency <= threshold)
+
+    grades = [
+        ('availability', good_availability / total),
+        (f'latency<={threshold:g}s', good_latency / total),
+    ]
+    if business:
+        ops = sum(business.values())
+        if ops:
+            grades.append(('quality', business.get('success', 0.0) / ops))
+
+    print(f"\n{'slo':<20} {'target':>8} {'measured':>9}  result")
+    passed = True
+    for name, measured in grades:
+        target = slos.get(name.split('<')[0])
+        if target is None:
+            continue
+        ok = measured >= target
+        passed = passed and ok
+        print(f"{name:<20} {target:>8.2%} {measured:>9.3%}  {'PASS' if ok else 'FAIL'}")
+    return passed
+
+
+def wait_until_up(url, timeout=15.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url + '/health', timeout=1).read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"application did not start at {url}")
+
+
+def start_app(port):
+    """Start the app from the current exercise directory with the dev server."""
+    env = dict(os.environ, FLASK_ENV='production', LOG_LEVEL='WARNING', PORT=str(port))
+    return subprocess.Popen(
+        [sys.executable, '-m', 'app.main'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', default=None, help="target base URL (default: the started app)")
+    parser.add_argument('--start', action='store_true', help="start the app locally first")
+    parser.add_argument('--port', type=int, default=18080, help="port for --start")
+    parser.add_argument('--rate', type=float, default=50.0, help="requests per second")
+    parser.add_argument('--duration', type=float, default=30.0, help="measured seconds")
+    parser.add_argument('--warmup', type=float, default=2.0, help="unmeasured seconds first")
+    parser.add_argument('--connections', type=int, default=64, help="keep-alive pool size")
+    parser.add_argument('--timeout', type=float, default=10.0)
+    parser.add_argument('--poisson', action='store_true',
+                        help="exponential inter-arrival times instead of a fixed interval")
+    parser.add_argument('--mix', nargs='+', default=list(DEFAULT_MIX),
+                        help="path=weight entries; {id} is replaced by a store id")
+    parser.add_argument('--store-ids', default='1,2')
+    parser.add_argument('--slo-config', default=SLO_CONFIG)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    if not args.start and not args.url:
+        parser.error("give --url or --start")
+    url = (args.url or f'http://127.0.0.1:{args.port}').rstrip('/')
+    args.url = url
+
+    server = start_app(args.port) if args.start else None
+    try:
+        wait_until_up(url)
+        slos, threshold = load_slos(args.slo_config)
+        mix = parse_mix(args.mix, [int(i) for i in args.store_ids.split(',')])
+
+        print(f"{args.rate:g} req/s for {args.duration:g}s (+{args.warmup:g}s warmup) "
+              f"against {url}, {args.connections} connections")
+        before = scrape_business(url)
+        results, elapsed = asyncio.run(run_load(args, mix))
+        after = scrape_business(url)
+        business = None
+        if before is not None and after is not None:
+            business = {status: after[status] - before.get(status, 0.0) for status in after}
+        passed = report(results, elapsed, slos, threshold, business)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == '__main__':
+    main()
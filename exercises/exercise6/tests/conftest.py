@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Tests import the service as the servers do, from exercises/exercise6
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402,F401  (puts exercises/shared on sys.path, as the servers do)
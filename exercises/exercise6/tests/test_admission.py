@@ -0,0 +1,115 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+
+import app.main as main
+from app import views
+from app.admission import AdaptiveConcurrencyLimiter, parse_request_start
+from app.config import Config
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def client():
+    main.app.testing = True
+    with mock.patch.object(Config, 'SIMULATE_LATENCY', False), \
+            mock.patch.object(views.random, 'random', return_value=1.0):
+        yield main.app.test_client()
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('t=1700000000.25', 1700000000.25),
+    ('1700000000250', 1700000000.25),
+    ('t=1700000000250000', 1700000000.25),
+    ('t=1700000005, t=1700000000.25', 1700000000.25),
+    ('garbage', None),
+    (None, None),
+])
+def test_parse_request_start(value, expected):
+    assert parse_request_start(value) == expected
+
+
+def test_limiter_sheds_by_concurrency_and_queue_time():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, min_limit=1, max_queue_time=0.25)
+    assert not limiter.try_acquire('get_stores', queue_time=0.3)
+    assert limiter.try_acquire('get_stores', queue_time=0.1)
+    assert not limiter.try_acquire('get_stores')
+    limiter.release(0.1)
+    assert limiter.in_flight == 0
+
+
+def test_request_queued_too_long_gets_503(client):
+    queued = f't={time.time() - 2 * Config.ADMISSION_MAX_QUEUE_TIME:.6f}'
+    response = client.get('/stores/1', headers={'X-Request-Start': queued}, buffered=True)
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == str(Config.ADMISSION_RETRY_AFTER)
+    body = response.get_json()
+    assert body['error'] == "Service overloaded, please retry"
+    assert body['retry_after'] == Config.ADMISSION_RETRY_AFTER
+
+    fresh = f't={time.time():.6f}'
+    assert client.get('/stores/1', headers={'X-Request-Start': fresh},
+                      buffered=True).status_code == 200
+    # Probes are never shed
+    assert client.get('/health', headers={'X-Request-Start': queued},
+                      buffered=True).status_code == 200
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def fetch(url):
+    try:
+        with urllib.request.urlopen(url, timeout=30) as response:
+            return response.status, None, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers.get('Retry-After'), json.loads(e.read())
+
+
+def test_gunicorn_sheds_under_overload_with_default_settings():
+    """40 concurrent /stores requests against one default gthread worker (4 threads).
+
+    /stores sleeps 0.1-0.8 s, so most requests wait in gunicorn's queue
+    far longer than ADMISSION_MAX_QUEUE_TIME and must be shed with 503.
+    """
+    port = free_port()
+    env = dict(os.environ, PORT=str(port), HOST='127.0.0.1', WEB_CONCURRENCY='1',
+               LOG_LEVEL='WARNING', FLASK_ENV='production')
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--config', 'python:app.gunicorn_config', 'app.main:app'],
+        cwd=APP_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f'http://127.0.0.1:{port}'
+    try:
+        for _ in range(100):
+            try:
+                urllib.request.urlopen(url + '/health', timeout=1).close()
+                break
+            except OSError:
+                time.sleep(0.1)
+        else:
+            pytest.fail("gunicorn did not start")
+
+        with ThreadPoolExecutor(max_workers=40) as pool:
+            results = list(pool.map(fetch, [url + '/stores?fields=id'] * 40))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    shed = [r for r in results if r[0] == 503 and r[2]['error'] == "Service overloaded, please retry"]
+    assert shed, results
+    assert all(retry_after == str(Config.ADMISSION_RETRY_AFTER) for _, retry_after, _ in shed)
+    assert any(status == 200 for status, _, _ in results)
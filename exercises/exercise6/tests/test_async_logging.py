@@ -0,0 +1,24 @@
+import io
+import logging
+import threading
+
+from sre_common.async_logging import BLOCK, AsyncLogHandler
+
+
+def test_block_policy_writes_directly_after_close():
+    """With the writer stopped, a full queue must not block the caller forever."""
+    stream = io.StringIO()
+    handler = AsyncLogHandler(stream=stream, max_queue=1, policy=BLOCK)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger = logging.Logger('test_async_logging')
+    logger.addHandler(handler)
+    logger.info('before close')
+    handler.close()
+
+    emitter = threading.Thread(target=lambda: [logger.info('after close %d', i) for i in range(3)])
+    emitter.start()
+    emitter.join(5)
+    assert not emitter.is_alive()
+    assert stream.getvalue().splitlines() == [
+        'before close', 'after close 0', 'after close 1', 'after close 2'
+    ]
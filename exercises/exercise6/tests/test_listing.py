@@ -0,0 +1,43 @@
+import base64
+
+import pytest
+
+from app.listing import decode_cursor, encode_cursor, parse_store_ids
+from app.main import app
+from app.repository import create_repository
+from app.store_data import stores
+
+
+def test_parse_store_ids_accepts_the_64_bit_range():
+    assert parse_store_ids(f'{2 ** 63 - 1},1,1,{-2 ** 63}') == [2 ** 63 - 1, 1, -2 ** 63]
+
+
+@pytest.mark.parametrize('value', ['1,99999999999999999999999', [1, 2 ** 63], [-2 ** 63 - 1]])
+def test_parse_store_ids_rejects_ids_outside_64_bits(value):
+    with pytest.raises(ValueError, match='out of range'):
+        parse_store_ids(value)
+
+
+def test_cursor_outside_64_bits_is_invalid():
+    assert decode_cursor(encode_cursor(2 ** 63 - 1)) == 2 ** 63 - 1
+    cursor = base64.urlsafe_b64encode(str(2 ** 63).encode()).decode()
+    with pytest.raises(ValueError, match='Invalid cursor'):
+        decode_cursor(cursor)
+
+
+def test_batch_with_oversized_id_is_a_400_on_sqlite(monkeypatch):
+    from app import views
+    monkeypatch.setattr(views, 'catalog', create_repository('sqlite:///:memory:', stores))
+    monkeypatch.setattr(views, 'admission_limiter', None)
+    monkeypatch.setattr(views, 'rate_limiter', None)
+    response = app.test_client().get('/stores/batch?ids=1,99999999999999999999999', buffered=True)
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('path', ['/stores/99999999999999999999999',
+                                  '/stores/99999999999999999999999/items/1',
+                                  '/stores/1/items/99999999999999999999999'])
+def test_store_path_with_oversized_id_is_a_404_on_sqlite(monkeypatch, path):
+    from app import views
+    monkeypatch.setattr(views, 'catalog', create_repository('sqlite:///:memory:', stores))
+    assert app.test_client().get(path, buffered=True).status_code == 404
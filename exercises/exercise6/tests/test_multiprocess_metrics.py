@@ -0,0 +1,113 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from prometheus_client.parser import text_string_to_metric_families
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKERS = 3
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def worker_pids(master):
+    with open(f'/proc/{master}/task/{master}/children') as f:
+        return {int(pid) for pid in f.read().split()}
+
+
+def get(url):
+    with urllib.request.urlopen(url, timeout=30) as response:
+        return response.status, response.read()
+
+
+def samples(url):
+    """Return {(name, sorted labels): value} from a /metrics scrape."""
+    _, body = get(url + '/metrics')
+    return {
+        (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+        for family in text_string_to_metric_families(body.decode())
+        for sample in family.samples
+    }
+
+
+def drive(url, requests):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        statuses = [status for status, _ in pool.map(get, [url + '/stores/1'] * requests)]
+    assert statuses == [200] * requests
+
+
+@pytest.mark.skipif(not os.path.isdir('/proc/self/task'), reason="needs /proc to find worker pids")
+def test_merged_totals_survive_worker_recycling(tmp_path):
+    """Counters from every worker, dead ones included, add up; live gauges drop dead pids."""
+    port = free_port()
+    multiproc_dir = tmp_path / 'prometheus'
+    env = dict(os.environ, PORT=str(port), HOST='127.0.0.1', WEB_CONCURRENCY=str(WORKERS),
+               METRICS_MULTIPROCESS='true', PROMETHEUS_MULTIPROC_DIR=str(multiproc_dir),
+               SIMULATE_LATENCY='false', LOG_LEVEL='WARNING', FLASK_ENV='production')
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--config', 'python:app.gunicorn_config', 'app.main:app'],
+        cwd=APP_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f'http://127.0.0.1:{port}'
+    try:
+        for _ in range(100):
+            try:
+                get(url + '/health')
+                if len(worker_pids(server.pid)) == WORKERS:
+                    break
+            except OSError:
+                pass
+            time.sleep(0.1)
+        else:
+            pytest.fail("gunicorn did not start its workers")
+
+        drive(url, 60)
+
+        # Kill a worker that has served requests; the master forks a replacement
+        served = [pid for pid in worker_pids(server.pid)
+                  if (multiproc_dir / f'gauge_livesum_{pid}.db').exists()]
+        assert served
+        victim = served[0]
+        os.kill(victim, signal.SIGKILL)
+        for _ in range(100):
+            pids = worker_pids(server.pid)
+            if victim not in pids and len(pids) == WORKERS:
+                break
+            time.sleep(0.1)
+        else:
+            pytest.fail("killed worker was not replaced")
+
+        drive(url, 40)
+        metrics = samples(url)
+        # child_exit removed the dead worker's live gauge file
+        assert not (multiproc_dir / f'gauge_livesum_{victim}.db').exists()
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+
+    requests = metrics[('http_requests_total', (
+        ('endpoint', 'get_store'), ('method', 'GET'), ('status_code', '200')
+    ))]
+    lookups = metrics[('business_operations_total', (
+        ('operation_type', 'store_lookup'), ('status', 'success')
+    ))]
+    assert requests == 100
+    assert lookups == 100
+
+    # livesum sums one limit per live worker that has served since forking,
+    # never the killed worker's or the master's
+    limit = metrics[('admission_concurrency_limit', ())]
+    assert limit % 50 == 0 and 50 <= limit <= 50 * WORKERS
+    assert metrics[('active_connections_current', ())] == 1  # the /metrics scrape itself
+    # Per-worker burn rates would pass for the pod's; they are left out
+    assert not any(name.startswith('slo_') for name, _ in metrics)
@@ -0,0 +1,123 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from sre_common.checks import DEGRADED, HEALTHY, CheckMonitor
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def fetch(url):
+    try:
+        with urllib.request.urlopen(url, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+class SlowDependency(BaseHTTPRequestHandler):
+    """An external API that takes half a second to answer."""
+
+    def do_GET(self):
+        time.sleep(0.5)
+        self.send_response(200)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def slow_dependency():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowDependency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}/'
+    server.shutdown()
+
+
+@pytest.mark.parametrize('preload', ['true', 'false'])
+def test_new_worker_is_ready_on_first_probe(slow_dependency, preload):
+    """post_worker_init starts the checks, so the first /ready finds them done, not pending."""
+    port = free_port()
+    env = dict(os.environ, PORT=str(port), HOST='127.0.0.1', WEB_CONCURRENCY='1',
+               GUNICORN_PRELOAD_APP=preload, READINESS_EXTERNAL_API_URL=slow_dependency,
+               READINESS_EXTERNAL_API_CRITICAL='true', LOG_LEVEL='WARNING',
+               FLASK_ENV='production')
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--config', 'python:app.gunicorn_config', 'app.main:app'],
+        cwd=APP_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f'http://127.0.0.1:{port}'
+    try:
+        for _ in range(100):
+            try:
+                fetch(url + '/health')
+                break
+            except OSError:
+                time.sleep(0.1)
+        else:
+            pytest.fail("gunicorn did not start")
+        time.sleep(1.0)  # longer than the slow check, far shorter than its freshness
+        status, body = fetch(url + '/ready')
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    assert status == 200, body
+    assert body['checks']['external_api'] == 'ok'
+
+
+def wait_for_results(monitor):
+    for _ in range(100):
+        if all(check.completed_at is not None for check in monitor.checks.values()):
+            return
+        time.sleep(0.01)
+    pytest.fail("checks did not complete")
+
+
+def test_snapshot_reports_worst_status_and_critical_readiness():
+    monitor = CheckMonitor()
+    monitor.register('database', lambda: 'ok')
+    monitor.register('disk', lambda: (DEGRADED, 'high: 95%'))
+    monitor.register('external_api', lambda: 1 / 0, critical=False)
+    monitor.refresh(force=True)
+    wait_for_results(monitor)
+
+    snapshot = monitor.snapshot()
+    assert snapshot['status'] == 'unhealthy'
+    assert snapshot['ready'] is True
+    assert snapshot['checks'] == {
+        'database': 'ok', 'disk': 'high: 95%', 'external_api': 'error: division by zero'
+    }
+    monitor.shutdown()
+
+
+def test_no_checks_run_after_shutdown():
+    """A probe arriving after the drain finished must not start a new pool."""
+    runs = []
+    monitor = CheckMonitor(freshness=0.0)
+    monitor.register('database', lambda: runs.append(1) or 'ok')
+    monitor.refresh(force=True)
+    wait_for_results(monitor)
+
+    monitor.shutdown()
+    snapshot = monitor.snapshot()
+    monitor.refresh(force=True)
+    assert monitor._executor is None
+    assert len(runs) == 1
+    assert snapshot['status'] == HEALTHY and snapshot['ready'] is True
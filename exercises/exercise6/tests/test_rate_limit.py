@@ -0,0 +1,33 @@
+from unittest import mock
+
+from app.rate_limit import RateLimiter
+
+
+def test_slow_rule_bucket_is_kept_until_refilled():
+    """A bucket idle past idle_ttl but not yet refilled is not dropped back to full."""
+    limiter = RateLimiter({'default': (0.1, 2)}, shards=1, idle_ttl=1.0)  # refills in 20 s
+    with mock.patch('app.rate_limit.time.monotonic', return_value=100.0):
+        assert limiter.check('client', 'get_stores') == 0
+        assert limiter.check('client', 'get_stores') == 0
+        assert limiter.check('client', 'get_stores') > 0
+    with mock.patch('app.rate_limit.time.monotonic', return_value=105.0):
+        limiter.check('other', 'get_stores')  # expires idle buckets in the shard
+        assert len(limiter) == 2
+        # 5 s at 0.1/s refilled half a token: still limited
+        assert limiter.check('client', 'get_stores') > 0
+    with mock.patch('app.rate_limit.time.monotonic', return_value=130.0):
+        limiter.check('other', 'get_stores')
+        assert len(limiter) == 1  # 'client' idle 25 s, past its 20 s refill time
+
+
+def test_long_lived_bucket_does_not_hold_back_expiry_of_other_rules():
+    """A slow rule's bucket used longest ago must not keep fast rules' idle buckets around."""
+    limiter = RateLimiter({'get_stores': (0.01, 1), 'health': (10, 10)}, shards=1,
+                          idle_ttl=1.0)  # get_stores refills in 100 s, health in 1 s
+    with mock.patch('app.rate_limit.time.monotonic', return_value=100.0):
+        limiter.check('slow', 'get_stores')
+    for second in range(50):
+        with mock.patch('app.rate_limit.time.monotonic', return_value=101.0 + second):
+            limiter.check(f'client-{second}', 'health')
+    # Only the slow bucket and the latest health bucket are left
+    assert len(limiter) == 2
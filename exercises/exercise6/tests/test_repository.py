@@ -0,0 +1,63 @@
+import os
+import threading
+
+import pytest
+
+from app.repository import create_repository
+
+STORES = [
+    {'id': 1, 'name': 'One', 'location': 'us', 'items': [{'id': 1, 'name': 'A', 'price': 1.0}]},
+    {'id': 2, 'name': 'Two', 'location': 'eu', 'items': []},
+]
+
+
+def in_child(check):
+    """Run check in a forked child; return its exit status (0 if check passed)."""
+    pid = os.fork()
+    if pid == 0:
+        try:
+            check()
+            code = 0
+        except BaseException:
+            code = 1
+        os._exit(code)
+    return os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1])
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="needs fork")
+@pytest.mark.parametrize('url', ['sqlite:///{tmp}/stores.db', 'sqlite:///:memory:'])
+def test_repository_created_before_fork_holds_no_connection(tmp_path, url):
+    """A preloading master forks with no SQLite connection open; workers open their own."""
+    repository = create_repository(url.format(tmp=tmp_path), STORES)
+    assert not list(repository._connections)
+
+    def worker():
+        assert repository.get_store(1)['items'][0]['name'] == 'A'
+        repository.add_store({'id': 3, 'name': 'Three', 'location': 'us'})
+        assert repository.count('us') == 2
+
+    assert in_child(worker) == 0
+    assert in_child(worker) == 0
+    assert not list(repository._connections)
+
+    # The file is shared between processes; each process has its own in-memory database
+    assert repository.count() == (3 if 'stores.db' in url else 2)
+    repository.close()
+
+
+@pytest.mark.parametrize('url', ['sqlite:///{tmp}/stores.db', 'sqlite:///:memory:'])
+def test_threads_share_a_bounded_pool(tmp_path, url):
+    """A thread per request reuses pooled connections instead of opening its own."""
+    repository = create_repository(url.format(tmp=tmp_path), STORES, pool_size=2)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(repository.get_store(1)))
+               for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [store['name'] for store in results] == ['One'] * 20
+    assert 1 <= len(repository._connections) <= 2
+    repository.close()
+    assert not repository._connections
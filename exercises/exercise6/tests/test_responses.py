@@ -0,0 +1,58 @@
+import json
+from unittest import mock
+
+import pytest
+
+import app.main as main
+from app import views
+from app.config import Config
+from app.rate_limit import RateLimiter
+from app.response_cache import ResponseCache
+
+
+@pytest.fixture
+def client():
+    main.app.testing = True
+    views.response_cache.clear()
+    with mock.patch.object(Config, 'SIMULATE_LATENCY', False), \
+            mock.patch.object(views.random, 'random', return_value=1.0):
+        yield main.app.test_client()
+    views.response_cache.clear()
+
+
+@pytest.mark.parametrize('debug', [False, True])
+def test_assembled_response_matches_jsonify(client, debug):
+    """Pre-encoded fragments joined into one object read like a single jsonify call."""
+    # The shared views follow Config.DEBUG, as app.debug does in a real deployment
+    with mock.patch.object(Config, 'DEBUG', debug):
+        body = client.get('/stores?limit=1', buffered=True).get_data()
+    expected = main.app.json.dumps(json.loads(body), indent=2 if debug else None,
+                                   separators=None if debug else (',', ':'))
+    assert body == expected.encode() + b'\n'
+
+
+def test_cache_counts_keys_toward_its_budget():
+    """Request-chosen keys with tiny bodies cannot grow the cache past max_bytes."""
+    cache = ResponseCache(64 * 1024)
+    for after in range(10000):
+        cache.put(('stores', 'us-central1', after), 1, b'[]')
+    assert cache.size_bytes <= cache.max_bytes
+    assert len(cache) < 10000
+
+
+def test_metric_series_only_cover_codes_routes_can_return():
+    """429 and admission 503s are pre-created only where a limit applies."""
+    routes = [('GET', 'get_store'), ('GET', 'health')]
+    with mock.patch.object(views, 'rate_limiter', None), \
+            mock.patch.object(views, 'admission_limiter', None):
+        assert views.metric_series(routes) == [
+            ('GET', 'get_store', 200), ('GET', 'get_store', 404), ('GET', 'get_store', 500),
+            ('GET', 'health', 200), ('GET', 'health', 500),
+            ('GET', 'unknown', 404),
+        ]
+    with mock.patch.object(views, 'rate_limiter', RateLimiter({'get_store': (1, 1)})), \
+            mock.patch.object(views, 'admission_limiter', object()):
+        series = views.metric_series(routes)
+    assert ('GET', 'get_store', 429) in series and ('GET', 'get_store', 503) in series
+    assert ('GET', 'health', 429) not in series and ('GET', 'health', 503) not in series
+    assert ('GET', 'unknown', 429) not in series
@@ -0,0 +1,72 @@
+import json
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+import structlog
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.store_data import stores
+from sre_common.serialization import (
+    OrjsonProvider, json_encoder, orjson, structlog_serializer
+)
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+pytestmark = pytest.mark.skipif(orjson is None, reason="orjson not installed")
+
+
+def catalog_payloads():
+    rng = random.Random(7)
+    synthetic = [
+        {"id": store_id, "name": f"Store {store_id} café" if store_id % 7 == 0 else f"Store {store_id}",
+         "location": None if store_id % 5 == 0 else "us-central1",
+         "items": [{"id": store_id * 10 + n, "name": f"Item {n}",
+                    "price": round(rng.uniform(0.5, 5000), 2), "stock": rng.randrange(100)}
+                   for n in range(3)]}
+        for store_id in range(1, 200)
+    ]
+    deployment_info = {"method": "gitops", "version": "1.2.0", "environment": "production"}
+    return [
+        {"stores": stores, "total_stores": len(stores), "processing_time": 0.123,
+         "deployment_info": deployment_info},
+        {"stores": synthetic, "total_stores": len(synthetic), "next_cursor": "MTAw", "limit": 100},
+        stores[0],
+        stores[0]["items"][0],
+    ]
+
+
+@pytest.mark.parametrize('dump_args', [{'separators': (',', ':')}, {'indent': 2}])
+def test_orjson_matches_stdlib_for_catalog_payloads(dump_args):
+    app = Flask(__name__)
+    fast, standard = OrjsonProvider(app), DefaultJSONProvider(app)
+    indent = dump_args.get('indent')
+    for payload in catalog_payloads():
+        expected = standard.dumps(payload, **dump_args)
+        assert fast.dumps(payload, **dump_args) == expected
+        assert json_encoder('orjson', indent)(payload) == expected.encode()
+
+
+def test_log_serializer_falls_back_for_values_orjson_rejects():
+    render = structlog.processors.JSONRenderer(serializer=structlog_serializer('orjson'))
+    line = render(None, 'warning', {'event': 'Store not found', 'store_id': 10 ** 23})
+    assert json.loads(line) == {'event': 'Store not found', 'store_id': 10 ** 23}
+    assert json.loads(render(None, 'info', {'event': 'counts', 'by_id': {1: 2}})) == {
+        'event': 'counts', 'by_id': {'1': 2}
+    }
+
+
+def test_oversized_store_id_is_404_with_json_logs():
+    """The 'Store not found' log line for an id beyond 64 bits must not fail the request."""
+    env = dict(os.environ, FLASK_ENV='production', JSON_SERIALIZER='orjson', LOG_LEVEL='INFO')
+    script = (
+        "import app.main as main\n"
+        "main.app.testing = True\n"
+        "print(main.app.test_client().get('/stores/99999999999999999999999', buffered=True).status_code)"
+    )
+    result = subprocess.run([sys.executable, '-c', script], cwd=APP_DIR, env=env,
+                            capture_output=True, text=True, timeout=60)
+    assert result.stdout.strip().splitlines()[-1] == '404', result.stderr[-2000:]
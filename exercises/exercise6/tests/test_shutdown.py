@@ -0,0 +1,47 @@
+from unittest import mock
+
+import pytest
+
+import app.main as main
+from app import views
+from app.config import Config
+
+
+@pytest.fixture
+def client():
+    main.app.testing = True
+    with mock.patch.object(Config, 'SIMULATE_LATENCY', False), \
+            mock.patch.object(views.random, 'random', return_value=1.0):
+        yield main.app.test_client()
+
+
+def test_streamed_response_stays_in_flight_until_closed(client):
+    response = client.get('/stores?format=ndjson', buffered=False)
+    assert response.status_code == 200
+
+    body = iter(response.response)
+    first = next(body)
+    assert first.endswith(b'\n')
+    # The view has returned, but the body is still being sent
+    assert main.shutdown._in_flight == 1
+    assert views.admission_limiter.in_flight == 1
+
+    rest = b''.join(body)
+    response.close()
+    assert len((first + rest).splitlines()) == views.catalog.count()
+    assert main.shutdown._in_flight == 0
+    assert views.admission_limiter.in_flight == 0
+
+
+def test_plain_response_is_released(client):
+    assert client.get('/stores/1', buffered=True).status_code == 200
+    assert main.shutdown._in_flight == 0
+    assert views.admission_limiter.in_flight == 0
+
+
+def test_refused_request_is_released(client):
+    with mock.patch.object(main.shutdown, 'accepting', return_value=False):
+        response = client.get('/stores/1', buffered=True)
+    assert response.status_code == 503
+    assert response.get_json()['error'] == "Service is shutting down"
+    assert main.shutdown._in_flight == 0
@@ -0,0 +1,30 @@
+from app.slo import DAY, SLOEngine, window_name
+
+
+def test_window_names():
+    assert [window_name(s) for s in (300, 3600, 7 * DAY, 30 * DAY, 90)] == ['5m', '1h', '7d', '30d', '90s']
+
+
+def test_each_slo_spends_its_budget_over_its_own_period():
+    """Failures 10 days ago are outside the 7d quality budget but inside the 30d ones."""
+    engine = SLOEngine(0.995, 0.95, 0.99, 0.5)
+    now = 100 * DAY
+    then = now - 10 * DAY
+    for _ in range(99):
+        engine.record_request(200, 0.1, now=then)
+        engine.record_business(True, now=then)
+    engine.record_request(500, 0.1, now=then)
+    engine.record_business(False, now=then)
+    for _ in range(100):
+        engine.record_request(200, 0.1, now=now)
+        engine.record_business(True, now=now)
+
+    report = engine.report(now=now)
+    assert report['quality']['period'] == '7d'
+    assert report['quality']['windows']['7d'] == {'good': 100, 'total': 100, 'sli': 1.0, 'burn_rate': 0.0}
+    assert report['quality']['error_budget_remaining'] == 1.0
+
+    assert report['availability']['period'] == '30d'
+    assert report['availability']['windows']['30d']['total'] == 200
+    # 1 failure in 200 is 0.5% errors, the whole 0.5% budget
+    assert report['availability']['error_budget_remaining'] == 0.0
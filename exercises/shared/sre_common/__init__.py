@@ -0,0 +1,7 @@
+"""
+Modules shared by the exercise applications.
+
+Each exercise's ``app`` package puts ``exercises/shared`` on ``sys.path``
+when run from the repository; the container images copy ``sre_common``
+next to ``app`` instead.
+"""
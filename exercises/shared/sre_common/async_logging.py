@@ -0,0 +1,132 @@
+import atexit
+import logging
+import os
+import queue
+import sys
+import threading
+
+DROP = 'drop'
+BLOCK = 'block'
+
+_STOP = object()
+
+
+class _FlushMarker:
+    """Queue item acknowledged by the writer once everything before it is written."""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class AsyncLogHandler(logging.Handler):
+    """Logging handler that hands records to a dedicated writer thread.
+
+    emit() only enqueues the record; formatting (including lazy message
+    arguments, and structlog rendering when used with ProcessorFormatter)
+    and the write to the stream happen on the writer thread, in batches of
+    up to ``batch_size`` records per write. The queue is bounded: with the
+    ``drop`` policy a full queue discards the record, with ``block`` the
+    caller waits.
+
+    The writer is restarted in forked children (gunicorn workers) and the
+    queue is drained on interpreter exit. Records emitted after close()
+    are written directly by the caller, as nothing drains the queue then.
+    """
+
+    def __init__(self, stream=None, max_queue=10000, policy=DROP, batch_size=256,
+                 queued_counter=None, dropped_counter=None):
+        super().__init__()
+        if policy not in (DROP, BLOCK):
+            raise ValueError(f"Unknown log queue policy: {policy}")
+        self.stream = stream or sys.stdout
+        self.max_queue = max_queue
+        self.policy = policy
+        self.batch_size = batch_size
+        self.queued_counter = queued_counter
+        self.dropped_counter = dropped_counter
+        self._closed = False
+
+        self._start_writer()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._start_writer)
+        atexit.register(self.close)
+
+    def _start_writer(self):
+        self._queue = queue.Queue(self.max_queue)
+        self._writer = threading.Thread(target=self._run, name='async-log-writer', daemon=True)
+        self._writer.start()
+
+    def emit(self, record):
+        if self._closed:
+            # handle() holds the handler lock, so direct writes do not interleave
+            self._write([record])
+            return
+        if self.policy == BLOCK:
+            self._queue.put(record)
+        else:
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                if self.dropped_counter is not None:
+                    self.dropped_counter.inc()
+                return
+        if self.queued_counter is not None:
+            self.queued_counter.inc()
+
+    def _run(self):
+        pending = self._queue
+        while True:
+            batch = []
+            item = pending.get()
+            while True:
+                if item is _STOP:
+                    self._write(batch)
+                    return
+                if isinstance(item, _FlushMarker):
+                    self._write(batch)
+                    batch = []
+                    item.done.set()
+                else:
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                try:
+                    item = pending.get_nowait()
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch):
+        if not batch:
+            return
+        lines = []
+        for record in batch:
+            try:
+                lines.append(self.format(record))
+            except Exception:
+                self.handleError(record)
+        try:
+            self.stream.write('\n'.join(lines) + '\n')
+            self.stream.flush()
+        except Exception:
+            self.handleError(batch[-1])
+
+    def flush(self, timeout=5.0):
+        """Wait until everything queued so far has been written."""
+        if self._closed or not self._writer.is_alive():
+            return
+        marker = _FlushMarker()
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return
+        marker.done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Drain the queue, stop the writer and close the handler."""
+        if not self._closed:
+            self._closed = True
+            if self._writer.is_alive():
+                self._queue.put(_STOP)
+                self._writer.join(timeout)
+        super().close()
@@ -0,0 +1,191 @@
+import logging
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+HEALTHY = 'healthy'
+DEGRADED = 'degraded'
+UNHEALTHY = 'unhealthy'
+
+PENDING = 'pending'
+
+_SEVERITY = {HEALTHY: 0, DEGRADED: 1, UNHEALTHY: 2}
+
+CheckResult = Union[str, Tuple[str, str]]
+
+
+class Check:
+    """A registered check and its most recent result.
+
+    The check function returns a short detail string (``'ok'`` when there
+    is nothing more to say) for a healthy result, or a ``(status, detail)``
+    tuple where status is HEALTHY, DEGRADED or UNHEALTHY. A run that raises,
+    or takes longer than ``timeout`` even if it succeeds, gets
+    ``error_status``. The status is None until the first run completes.
+    Non-critical checks are reported but never make the service unready.
+    """
+
+    def __init__(self, name: str, func: Callable[[], CheckResult], timeout: float,
+                 interval: float, critical: bool = True, error_status: str = UNHEALTHY):
+        self.name = name
+        self.func = func
+        self.timeout = timeout
+        self.interval = interval
+        self.critical = critical
+        self.error_status = error_status
+        self.status: Optional[str] = None
+        self.detail = PENDING
+        self.completed_at: Optional[float] = None
+        self.started_at: Optional[float] = None
+
+    def run(self, duration=None, failures=None, up=None) -> None:
+        """Run the check once and record its result."""
+        start = time.monotonic()
+        try:
+            result = self.func()
+            if isinstance(result, tuple):
+                status, detail = result
+            else:
+                status, detail = HEALTHY, str(result)
+            reason = None
+        except Exception as e:
+            logger.warning(f"Check {self.name} failed: {e}")
+            status, detail, reason = self.error_status, f'error: {e}', 'error'
+        elapsed = time.monotonic() - start
+        if reason is None and elapsed > self.timeout:
+            status, detail, reason = self.error_status, f'timeout: took {elapsed:.2f}s', 'timeout'
+
+        self.status, self.detail = status, detail
+        self.completed_at = time.monotonic()
+        self.started_at = None
+        if duration is not None:
+            duration.labels(check=self.name).observe(elapsed)
+        if failures is not None and reason is not None:
+            failures.labels(check=self.name, reason=reason).inc()
+        if up is not None:
+            up.labels(check=self.name).set(1 if status == HEALTHY else 0)
+
+    def result(self, now: float):
+        """Return (status, detail) as of now, failing a run still going past its timeout."""
+        started_at = self.started_at
+        if started_at is not None and now - started_at > self.timeout:
+            return self.error_status, f'timeout: running for {now - started_at:.1f}s'
+        return self.status, self.detail
+
+
+class CheckMonitor:
+    """Runs health or readiness checks on a small thread pool and serves their cached results.
+
+    ``snapshot()`` never waits on a check: it aggregates the stored results
+    and, for every check whose result is older than its interval and which
+    is not already running, submits a new run to the pool. Until a check's
+    first run completes it is reported as pending, so servers call
+    ``refresh(force=True)`` when each process starts.
+    A check running past its timeout is reported as failed and is not
+    resubmitted until it returns, so a hung dependency ties up at most one
+    pool thread per check. After ``shutdown()`` no further runs are
+    submitted and snapshots serve the last results.
+
+    Optional metrics, labelled by check: ``duration`` histogram,
+    ``failures`` counter (also labelled by reason, ``error`` or
+    ``timeout``) and ``up`` gauge (1 when the last run was healthy).
+    """
+
+    def __init__(self, freshness: float = 10.0, max_workers: int = 4,
+                 duration=None, failures=None, up=None):
+        self.freshness = freshness
+        self.max_workers = max_workers
+        self.checks: Dict[str, Check] = {}
+        self._duration = duration
+        self._failures = failures
+        self._up = up
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pid: Optional[int] = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def register(self, name: str, func: Callable[[], CheckResult], timeout: float = 2.0,
+                 critical: bool = True, interval: Optional[float] = None,
+                 error_status: str = UNHEALTHY) -> None:
+        """Register a check; call once at startup. ``interval`` defaults to ``freshness``."""
+        self.checks[name] = Check(
+            name, func, timeout, self.freshness if interval is None else interval,
+            critical, error_status
+        )
+
+    def refresh(self, force: bool = False) -> None:
+        """Submit a run of every check that is stale (or all idle checks if force)."""
+        now = time.monotonic()
+        with self._lock:
+            if self._closed:
+                return
+            if self._pid != os.getpid():
+                # Pool threads do not survive a fork; start a new pool in this process
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='checks'
+                )
+                self._pid = os.getpid()
+                for check in self.checks.values():
+                    check.started_at = None
+            for check in self.checks.values():
+                if check.started_at is not None:
+                    continue
+                if force or check.completed_at is None or now - check.completed_at >= check.interval:
+                    check.started_at = now
+                    self._executor.submit(check.run, self._duration, self._failures, self._up)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the overall status, readiness, per-check details and the oldest result's age.
+
+        ``status`` is the worst status of any check, pending checks counting
+        as healthy; ``ready`` is false while a critical check is pending or
+        unhealthy.
+        """
+        self.refresh()
+        now = time.monotonic()
+        status = HEALTHY
+        ready = True
+        checks = {}
+        oldest = None
+        for name, check in self.checks.items():
+            check_status, detail = check.result(now)
+            checks[name] = detail
+            if check_status is not None and _SEVERITY[check_status] > _SEVERITY[status]:
+                status = check_status
+            if check.critical and check_status in (None, UNHEALTHY):
+                ready = False
+            if check.completed_at is not None and (oldest is None or check.completed_at < oldest):
+                oldest = check.completed_at
+
+        return {
+            'status': status,
+            'ready': ready,
+            'checks': checks,
+            'snapshot_age_seconds': round(now - oldest, 3) if oldest is not None else None,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the pool without waiting for running checks, and submit no more runs."""
+        with self._lock:
+            self._closed = True
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+def check_url(url: str, timeout: float) -> str:
+    """Check an HTTP dependency: any answer below 500 counts as reachable."""
+    if not url:
+        return 'not configured'
+    try:
+        urllib.request.urlopen(url, timeout=timeout).close()
+    except urllib.error.HTTPError as e:
+        if e.code >= 500:
+            raise
+    return 'ok'
@@ -0,0 +1,341 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+MEMORY = 'memory'
+SQLITE = 'sqlite'
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS stores ("
+    " id INTEGER PRIMARY KEY, name TEXT NOT NULL, location TEXT)",
+    "CREATE TABLE IF NOT EXISTS items ("
+    " store_id INTEGER NOT NULL REFERENCES stores(id) ON DELETE CASCADE,"
+    " id INTEGER NOT NULL, name TEXT NOT NULL, price REAL, stock INTEGER,"
+    " PRIMARY KEY (store_id, id))",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_stores_location ON stores (location, id)",
+    "CREATE INDEX IF NOT EXISTS idx_items_id ON items (id)",
+    "INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0)",
+)
+
+
+# Range of SQLite INTEGER values; ids outside it cannot be stored or bound
+INTEGER_MIN, INTEGER_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def parse_database_url(url: Optional[str]):
+    """Return (backend, sqlite target) for a DATABASE_URL.
+
+    ``memory://`` (or no URL) selects the in-memory catalog.
+    ``sqlite:///relative.db``, ``sqlite:////absolute.db`` and
+    ``sqlite:///:memory:`` select SQLite.
+    """
+    if not url or url.startswith('memory:'):
+        return MEMORY, None
+    if url.startswith('sqlite:///'):
+        return SQLITE, url[len('sqlite:///'):]
+    raise ValueError(f"Unsupported DATABASE_URL {url!r}: expected memory:// or sqlite:///<path>")
+
+
+class SQLiteStoreRepository:
+    """Store repository backed by SQLite, with a bounded pool of connections per process.
+
+    A query borrows a connection from the pool and returns it when done,
+    so at most ``pool_size`` connections are open per process however many
+    threads or greenlets the server runs; when all are in use, queries wait
+    for one to be returned. Each connection is opened and configured once
+    and reused. SQLite connections must not cross a fork: setup work uses
+    a connection that is closed again, so a preloading gunicorn master
+    holds none when it forks, and a process that finds a pool created by
+    another process starts its own. Statements are parameterized, which
+    also lets sqlite3 reuse its cached prepared statements.
+
+    ``sqlite:///:memory:`` gives each process a database of its own,
+    created and seeded on its first query and held open by a connection
+    outside the pool.
+
+    ``version`` is kept in the database and bumped in the same transaction
+    as every write, so response caches in other worker processes see
+    changes too. Query durations go to the optional ``query_duration``
+    histogram, labelled by operation.
+    """
+
+    def __init__(self, path: str, query_duration=None, pool_size: int = 8):
+        self._memory = path == ':memory:'
+        self._path = path
+        self._query_duration = query_duration
+        self._pool_size = pool_size
+        self._idle: 'queue.LifoQueue[sqlite3.Connection]' = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._connections: List[sqlite3.Connection] = []
+        self._process_lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._keepalive: Optional[sqlite3.Connection] = None
+        self._seed_stores: List[Dict[str, Any]] = []
+        if not self._memory:
+            with closing(self._open()) as conn, conn:
+                self._create_schema(conn)
+
+    def _open(self) -> sqlite3.Connection:
+        if self._memory:
+            # Shared cache, visible to every pooled connection in this process
+            target, uri = f'file:stores-{os.getpid()}?mode=memory&cache=shared', True
+        else:
+            target, uri = self._path, False
+        # Pooled connections move between threads, one at a time
+        conn = sqlite3.connect(target, uri=uri, timeout=5.0, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        if not uri:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    def _start_process(self, pid: int) -> None:
+        """Give this process an empty pool, and create and seed its in-memory database."""
+        with self._process_lock:
+            if self._pid == pid:
+                return
+            # Connections inherited from another process are dropped, never used
+            self._idle = queue.LifoQueue()
+            self._slots = threading.BoundedSemaphore(self._pool_size)
+            self._connections = []
+            if self._memory:
+                conn = self._open()
+                with conn:
+                    self._create_schema(conn)
+                with conn:
+                    self._seed(conn, self._seed_stores)
+                self._keepalive = conn
+            self._pid = pid
+
+    def _acquire(self) -> sqlite3.Connection:
+        """Borrow a connection, opening one if the pool has room and none is idle."""
+        pid = os.getpid()
+        if self._pid != pid:
+            self._start_process(pid)
+        slots, idle = self._slots, self._idle
+        slots.acquire()
+        try:
+            return idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            conn = self._open()
+        except BaseException:
+            slots.release()
+            raise
+        self._connections.append(conn)
+        return conn
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        if conn in self._connections:
+            self._idle.put(conn)
+            self._slots.release()
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection) -> None:
+        for statement in SCHEMA:
+            conn.execute(statement)
+
+    @contextmanager
+    def _query(self, operation: str):
+        start = time.perf_counter()
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+            if self._query_duration is not None:
+                self._query_duration.labels(operation=operation).observe(
+                    time.perf_counter() - start
+                )
+
+    def close(self) -> None:
+        """Close this process's idle pooled connections; call once queries have stopped."""
+        if self._pid != os.getpid():
+            return
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._connections.remove(conn)
+            conn.close()
+
+    # Writes
+
+    def seed(self, stores: Iterable[Dict[str, Any]]) -> None:
+        """Insert stores if the database holds none yet."""
+        stores = list(stores)
+        if self._memory:
+            self._seed_stores = stores
+            if self._pid == os.getpid():
+                with self._query('seed') as conn, conn:
+                    self._seed(conn, stores)
+            return
+        with closing(self._open()) as conn, conn:
+            self._seed(conn, stores)
+
+    @classmethod
+    def _seed(cls, conn: sqlite3.Connection, stores: List[Dict[str, Any]]) -> None:
+        conn.execute("BEGIN IMMEDIATE")
+        if conn.execute("SELECT 1 FROM stores LIMIT 1").fetchone() is None and stores:
+            for store in stores:
+                cls._write_store(conn, store)
+            cls._bump_version(conn)
+
+    def add_store(self, store: Dict[str, Any]) -> None:
+        """Add a store, replacing any existing store with the same id."""
+        with self._query('write') as conn, conn:
+            self._write_store(conn, store)
+            self._bump_version(conn)
+
+    def remove_store(self, store_id: int) -> bool:
+        """Remove a store by id. Returns False if it was not present."""
+        with self._query('write') as conn, conn:
+            removed = conn.execute("DELETE FROM stores WHERE id = ?", (store_id,)).rowcount
+            if removed:
+                self._bump_version(conn)
+        return bool(removed)
+
+    @staticmethod
+    def _write_store(conn: sqlite3.Connection, store: Dict[str, Any]) -> None:
+        conn.execute("DELETE FROM items WHERE store_id = ?", (store['id'],))
+        conn.execute(
+            "INSERT OR REPLACE INTO stores (id, name, location) VALUES (?, ?, ?)",
+            (store['id'], store['name'], store.get('location'))
+        )
+        conn.executemany(
+            "INSERT INTO items (store_id, id, name, price, stock) VALUES (?, ?, ?, ?, ?)",
+            [(store['id'], item['id'], item['name'], item.get('price'), item.get('stock'))
+             for item in store.get('items', ())]
+        )
+
+    @staticmethod
+    def _bump_version(conn: sqlite3.Connection) -> None:
+        conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+
+    # Reads
+
+    @property
+    def version(self) -> int:
+        with self._query('version') as conn:
+            return conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def count(self, location: Optional[str] = None) -> int:
+        """Return the number of stores, optionally in one location."""
+        with self._query('count') as conn:
+            if location is None:
+                row = conn.execute("SELECT COUNT(*) FROM stores").fetchone()
+            else:
+                row = conn.execute(
+                    "SELECT COUNT(*) FROM stores WHERE location = ?", (location,)
+                ).fetchone()
+        return row[0]
+
+    def all_stores(self) -> List[Dict[str, Any]]:
+        """Return every store in id order."""
+        with self._query('list') as conn:
+            rows = conn.execute("SELECT id, name, location FROM stores ORDER BY id").fetchall()
+            return self._with_items(conn, rows)
+
+    def stores_in_location(self, location: str) -> List[Dict[str, Any]]:
+        """Return the stores in a location, in id order."""
+        with self._query('list') as conn:
+            rows = conn.execute(
+                "SELECT id, name, location FROM stores WHERE location = ? ORDER BY id",
+                (location,)
+            ).fetchall()
+            return self._with_items(conn, rows)
+
+    def get_store(self, store_id: int) -> Optional[Dict[str, Any]]:
+        """Return the store with the given id, or None."""
+        if not INTEGER_MIN <= store_id <= INTEGER_MAX:
+            return None
+        with self._query('get_store') as conn:
+            row = conn.execute(
+                "SELECT id, name, location FROM stores WHERE id = ?", (store_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            return self._with_items(conn, [row])[0]
+
+    def get_many(self, store_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """Return the stores among the given ids that exist, keyed by id."""
+        ids = list(dict.fromkeys(store_ids))
+        rows = []
+        with self._query('get_many') as conn:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows.extend(conn.execute(
+                    f"SELECT id, name, location FROM stores WHERE id IN ({placeholders})", chunk
+                ).fetchall())
+            return {store['id']: store for store in self._with_items(conn, rows)}
+
+    def get_item(self, store_id: int, item_id: int) -> Optional[Dict[str, Any]]:
+        """Return an item of a store, or None if either does not exist."""
+        if not (INTEGER_MIN <= store_id <= INTEGER_MAX and INTEGER_MIN <= item_id <= INTEGER_MAX):
+            return None
+        with self._query('get_item') as conn:
+            row = conn.execute(
+                "SELECT id, name, price, stock FROM items WHERE store_id = ? AND id = ?",
+                (store_id, item_id)
+            ).fetchone()
+        return dict(row) if row is not None else None
+
+    def page(self, after: Optional[int] = None, limit: int = 100,
+             location: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return up to ``limit`` stores in id order with ids greater than ``after``."""
+        after = -1 if after is None else after
+        with self._query('page') as conn:
+            if location is None:
+                rows = conn.execute(
+                    "SELECT id, name, location FROM stores WHERE id > ? ORDER BY id LIMIT ?",
+                    (after, limit)
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT id, name, location FROM stores WHERE location = ? AND id > ?"
+                    " ORDER BY id LIMIT ?",
+                    (location, after, limit)
+                ).fetchall()
+            return self._with_items(conn, rows)
+
+    def iter_stores(self, location: Optional[str] = None,
+                    chunk_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """Yield stores in id order, one page query per chunk."""
+        after = None
+        while True:
+            chunk = self.page(after, chunk_size, location)
+            yield from chunk
+            if len(chunk) < chunk_size:
+                return
+            after = chunk[-1]['id']
+
+    @staticmethod
+    def _with_items(conn: sqlite3.Connection, rows) -> List[Dict[str, Any]]:
+        """Attach each store's items, fetched with one query per 500 stores."""
+        stores = [dict(row, items=[]) for row in rows]
+        by_id = {store['id']: store for store in stores}
+        ids = list(by_id)
+        # Older SQLite builds allow at most 999 bound parameters per statement
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            for item in conn.execute(
+                f"SELECT store_id, id, name, price, stock FROM items"
+                f" WHERE store_id IN ({placeholders}) ORDER BY store_id, id",
+                chunk
+            ):
+                item = dict(item)
+                by_id[item.pop('store_id')]['items'].append(item)
+        return stores
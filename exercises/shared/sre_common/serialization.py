@@ -0,0 +1,120 @@
+import json
+from typing import Any, Callable, Optional
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+STDLIB = 'stdlib'
+ORJSON = 'orjson'
+
+
+def resolve_serializer(name: str) -> str:
+    """Return the serializer to use, falling back to stdlib if orjson is missing."""
+    if name == ORJSON and orjson is not None:
+        return ORJSON
+    return STDLIB
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson.
+
+    Produces the same bytes as DefaultJSONProvider for strings, integers,
+    floats in plain notation, and containers of them: sorted keys, compact
+    or 2-space indented output, and Flask's ``default`` for dates, UUIDs,
+    dataclasses and the like. orjson writes non-ASCII characters as UTF-8
+    where the stdlib escapes them, so such documents are re-encoded with
+    the stdlib to keep the output identical.
+
+    Floats are where the output differs. Floats the stdlib writes in
+    exponent form come out differently but parse to the same value
+    (``1e16`` for ``1e+16``, ``0.00001`` for ``1e-05``). NaN and the
+    infinities become ``null``, where the stdlib writes non-standard
+    ``NaN`` and ``Infinity``.
+    """
+
+    _options = 0
+    if orjson is not None:
+        _options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        indent = kwargs.get('indent')
+        if indent not in (None, 2) or (indent is None and kwargs.get('separators') != (',', ':')):
+            # orjson only writes compact or 2-space indented output
+            return super().dumps(obj, **kwargs)
+
+        option = self._options
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+
+        try:
+            body = orjson.dumps(obj, default=self.default, option=option)
+        except TypeError:
+            # Non-string keys, integers beyond 64 bits, etc.
+            return super().dumps(obj, **kwargs)
+        if self.ensure_ascii and not body.isascii():
+            return super().dumps(obj, **kwargs)
+        return body.decode()
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+
+def structlog_serializer(name: str):
+    """Return a ``serializer`` callable for structlog's JSONRenderer.
+
+    orjson log lines are compact, with no space after ``,`` and ``:``
+    unlike the stdlib's default. Events orjson cannot encode, such as
+    integers beyond 64 bits or non-string keys, go through the stdlib with
+    the same compact separators.
+    """
+    if resolve_serializer(name) == ORJSON:
+        def dumps(obj, **kwargs):
+            try:
+                return orjson.dumps(obj, default=kwargs.get('default')).decode()
+            except TypeError:
+                return json.dumps(obj, **{'separators': (',', ':'), **kwargs})
+        return dumps
+    return json.dumps
+
+
+def json_provider_class(name: str):
+    """Return the Flask JSON provider class for the configured serializer."""
+    if resolve_serializer(name) == ORJSON:
+        return OrjsonProvider
+    return DefaultJSONProvider
+
+
+def json_encoder(name: str, indent: Optional[int] = None) -> Callable[[Any], bytes]:
+    """Return an encoder producing the same bytes as the Flask JSON provider.
+
+    For code that serves JSON without a Flask app (the ASGI build): keys
+    are sorted and non-ASCII characters escaped, compact or indented by 2.
+    Floats differ from the stdlib as described for OrjsonProvider.
+    """
+    kwargs = {'indent': indent} if indent else {'separators': (',', ':')}
+
+    def stdlib_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, default=DefaultJSONProvider.default, ensure_ascii=True,
+                          sort_keys=True, **kwargs).encode()
+
+    if resolve_serializer(name) != ORJSON or indent not in (None, 2):
+        return stdlib_dumps
+
+    option = OrjsonProvider._options | orjson.OPT_SORT_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+
+    def orjson_dumps(obj: Any) -> bytes:
+        try:
+            body = orjson.dumps(obj, default=DefaultJSONProvider.default, option=option)
+        except TypeError:
+            return stdlib_dumps(obj)
+        return body if body.isascii() else stdlib_dumps(obj)
+
+    return orjson_dumps